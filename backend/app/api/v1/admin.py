@@ -0,0 +1,109 @@
+"""
+管理员运维接口
+"""
+import logging
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, engine, get_db, read_engine
+from app.core.pool import pool_stats
+from app.core.simple_auth import (
+    get_current_admin_user, get_user_by_username, principal_cache, revoke_user_tokens, token_cache
+)
+from app.models.user import User
+from app.schemas.user import UserCreate, UserResponse
+from app.core.cache import cache_backend
+from app.services.char_index import character_index
+from app.services.relation_graph import RELATION_MODELS, relation_graph
+from app.services.relation_sync import SYNC_MODES, SyncInProgressError, sync_relations, sync_status
+from app.services.users import create_users
+from app.utils.response_cache import detail_cache, list_cache
+from app.utils.totals import count_cache
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+@router.get("/metrics/pool")
+async def get_pool_metrics(current_user = Depends(get_current_admin_user)):
+    """数据库连接池指标：借出连接数、溢出连接数、等待时间分布"""
+    metrics = {"primary": pool_stats(engine)}
+    if read_engine is not engine:
+        metrics["replica"] = pool_stats(read_engine)
+    return metrics
+
+
+@router.get("/metrics/cache")
+async def get_cache_metrics(current_user = Depends(get_current_admin_user)):
+    """缓存后端状态、各命名空间和令牌缓存在本进程内的命中率，以及汉字倒排索引和关系图的规模"""
+    return {
+        "backend": cache_backend.stats(),
+        "detail": detail_cache.stats(),
+        "list": list_cache.stats(),
+        "count": count_cache.stats(),
+        "auth": token_cache.stats(),
+        "principal": principal_cache.stats(),
+        "character_index": character_index.stats(),
+        "relation_graph": relation_graph.stats(),
+    }
+
+
+@router.post("/users", response_model=UserResponse, status_code=201)
+def create_user(user: UserCreate, db: Session = Depends(get_db), current_user = Depends(get_current_admin_user)):
+    """创建用户（同步接口，bcrypt 哈希在线程池中计算）"""
+    try:
+        result = create_users(db, [user.model_dump()])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not result["created"]:
+        raise HTTPException(status_code=409, detail="用户名已存在")
+    logger.info(f"管理员 {current_user.username} 创建了用户: {user.username}（{user.role}）")
+    return db.query(User).filter(User.username == result["created"][0]).first()
+
+
+@router.post("/users/{username}/revoke-tokens")
+def revoke_tokens(username: str, current_user = Depends(get_current_admin_user)):
+    """吊销用户此前签发的全部令牌，用户需重新登录"""
+    if get_user_by_username(username) is None:
+        raise HTTPException(status_code=404, detail="用户不存在")
+    revoke_user_tokens(username)
+    logger.info(f"管理员 {current_user.username} 吊销了 {username} 的令牌")
+    return {"message": f"已吊销 {username} 的令牌"}
+
+
+def run_relation_sync(resources, mode, restart):
+    """后台任务：依次同步各资源的关系表"""
+    for resource in resources:
+        try:
+            report = sync_relations(SessionLocal, resource, mode, restart=restart, publish=cache_backend.publish)
+            logger.info(f"关系同步完成: {report}")
+        except SyncInProgressError as e:
+            logger.warning(str(e))
+        except Exception as e:
+            logger.error(f"{resource} 关系同步失败: {e}")
+
+
+@router.post("/relations/sync", status_code=202)
+def trigger_relation_sync(
+    background_tasks: BackgroundTasks,
+    resource: str = "all",
+    mode: str = "incremental",
+    restart: bool = False,
+    current_user = Depends(get_current_admin_user)
+):
+    """在后台同步关系表（resource 为 chengyu、ciyu 或 all），进度通过 GET 同一路径查看"""
+    if resource != "all" and resource not in RELATION_MODELS:
+        raise HTTPException(status_code=400, detail="resource 只能是 chengyu、ciyu 或 all")
+    if mode not in SYNC_MODES:
+        raise HTTPException(status_code=400, detail=f"mode 只能是 {', '.join(SYNC_MODES)}")
+    resources = list(RELATION_MODELS) if resource == "all" else [resource]
+    background_tasks.add_task(run_relation_sync, resources, mode, restart)
+    return {"message": "关系同步已开始", "resources": resources, "mode": mode}
+
+
+@router.get("/relations/sync")
+def get_relation_sync_status(db: Session = Depends(get_db), current_user = Depends(get_current_admin_user)):
+    """各资源关系同步的进度与上次运行的统计"""
+    return sync_status(db)
@@ -0,0 +1,84 @@
+"""
+汉字查询接口（只读，无需登录）
+JSON 信息列默认不返回，通过 sections=basic,evolution（或 all）按需加载
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.core.database import get_read_db
+from app.models.hanzi import Hanzi
+from app.schemas.hanzi import HanziListResponse, HanziLookupResponse, HanziResponse
+from app.services.hanzi import hanzi_query, hanzi_to_item, lookup_hanzi, parse_lookup, parse_sections
+from app.utils.http_cache import DETAIL_CACHE_CONTROL, conditional_response, to_timestamp
+from app.utils.pagination import paginate_keyset, resolve_after_id
+from app.utils.serialization import ORJSONResponse, encode_json
+
+router = APIRouter(prefix="/api/v1/hanzi", tags=["hanzi"])
+
+# 列表每页最多条数
+MAX_PAGE_SIZE = 100
+
+
+def _sections(sections: Optional[str]):
+    try:
+        return parse_sections(sections)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("", response_class=ORJSONResponse, responses={200: {"model": HanziListResponse}})
+def list_hanzi(
+    request: Request,
+    size: int = 20,
+    cursor: Optional[str] = None,
+    after_id: Optional[int] = None,
+    sections: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """汉字列表（按ID降序的游标分页），传入上一页返回的 next_cursor 翻页"""
+    section_names = _sections(sections)
+    if not 1 <= size <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"size 必须在 1 到 {MAX_PAGE_SIZE} 之间")
+    try:
+        after_id = resolve_after_id(cursor, after_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    rows, next_cursor = paginate_keyset(hanzi_query(db, section_names), Hanzi.id, size, after_id)
+    body = encode_json({
+        "items": [hanzi_to_item(hanzi, section_names) for hanzi in rows],
+        "size": size,
+        "next_cursor": next_cursor,
+    })
+    return conditional_response(request, body, DETAIL_CACHE_CONTROL)
+
+
+@router.get("/lookup", response_class=ORJSONResponse, responses={200: {"model": HanziLookupResponse}})
+def lookup(
+    request: Request,
+    chars: Optional[str] = None,
+    unicode: Optional[str] = None,
+    sections: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """按字（chars=你好）或十进制码位（unicode=20320,22909）批量查找，结果按请求顺序返回"""
+    section_names = _sections(sections)
+    try:
+        characters, codes = parse_lookup(chars, unicode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    body = encode_json(lookup_hanzi(db, characters, codes, section_names))
+    return conditional_response(request, body, DETAIL_CACHE_CONTROL)
+
+
+@router.get("/{hanzi_id}", response_class=ORJSONResponse, responses={200: {"model": HanziResponse}})
+def get_hanzi(hanzi_id: int, request: Request, sections: Optional[str] = None, db: Session = Depends(get_read_db)):
+    """获取单个汉字"""
+    section_names = _sections(sections)
+    hanzi = hanzi_query(db, section_names).filter(Hanzi.id == hanzi_id).first()
+    if hanzi is None:
+        raise HTTPException(status_code=404, detail="汉字不存在")
+    body = encode_json(hanzi_to_item(hanzi, section_names))
+    return conditional_response(request, body, DETAIL_CACHE_CONTROL, to_timestamp(hanzi.updated_at or hanzi.created_at))
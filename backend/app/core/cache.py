@@ -0,0 +1,366 @@
+"""
+缓存
+- TTLCache: 进程内LRU缓存
+- CacheBackend: 可插拔的缓存后端（进程内 / Redis），供计数、详情和列表页缓存共用
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Union
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """带过期时间和容量上限的LRU内存缓存（线程安全），记录命中/未命中次数"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Hashable) -> Any:
+        """读取未过期的值，调用方需持有锁"""
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取缓存，不存在或已过期时返回 default；命中的条目移到最近使用的位置"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """读取缓存但不计入命中统计，也不调整LRU顺序"""
+        with self._lock:
+            value = self._lookup(key)
+            return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """删除单个缓存条目"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """删除所有键满足条件的条目，返回删除数量"""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        """缓存容量与命中统计"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend:
+    """
+    缓存后端接口
+    键为字符串，值为 bytes 或 int；另提供计数器和跨进程的消息发布/订阅
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._handlers: List[Callable[[Dict], None]] = []
+
+    def get(self, key: str) -> Optional[Union[bytes, int]]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Union[bytes, int], ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def get_counter(self, key: str) -> int:
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    def publish(self, message: Dict) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, handler: Callable[[Dict], None]) -> None:
+        """注册消息处理函数，所有进程（包括发布者自己）都会收到消息"""
+        self._handlers.append(handler)
+
+    def start(self) -> None:
+        """开始接收其他进程发布的消息"""
+
+    def close(self) -> None:
+        """停止接收消息并释放连接"""
+
+    def stats(self) -> Dict:
+        return {"backend": self.name}
+
+    def _dispatch(self, message: Dict) -> None:
+        for handler in self._handlers:
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f"处理缓存消息失败: {e}")
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内缓存后端，只在单进程部署或开发环境下保持一致"""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__()
+        self._cache = TTLCache(ttl=60, maxsize=maxsize)
+        # 版本计数器单独保存，不参与LRU淘汰，否则版本号回退会让旧缓存重新生效
+        self._counters: Dict[str, int] = {}
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Union[bytes, int]]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Union[bytes, int], ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._counter_lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def publish(self, message: Dict) -> None:
+        self._dispatch(message)
+
+    def stats(self) -> Dict:
+        return {"backend": self.name, **self._cache.stats()}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis 协议的共享缓存后端，多个 worker 共用同一份缓存
+    Redis 不可用时读写降级为未命中，不影响接口可用性
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "knma:", channel: str = "invalidate", client=None):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis 需要安装 redis 包: uv sync --extra redis")
+
+        self._errors = redis.RedisError
+        self._client = client or redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._channel = prefix + channel
+        self._pubsub = None
+        self._listener = None
+
+    def _encode(self, value: Union[bytes, int]) -> bytes:
+        if isinstance(value, int):
+            return b"i:" + str(value).encode("ascii")
+        return b"b:" + value
+
+    def _decode(self, raw: Optional[bytes]) -> Optional[Union[bytes, int]]:
+        if raw is None:
+            return None
+        if raw.startswith(b"i:"):
+            return int(raw[2:])
+        return raw[2:]
+
+    def get(self, key: str) -> Optional[Union[bytes, int]]:
+        try:
+            return self._decode(self._client.get(self._prefix + key))
+        except self._errors as e:
+            logger.warning(f"读取Redis缓存失败: {e}")
+            return None
+
+    def set(self, key: str, value: Union[bytes, int], ttl: float) -> None:
+        try:
+            self._client.set(self._prefix + key, self._encode(value), px=max(int(ttl * 1000), 1))
+        except self._errors as e:
+            logger.warning(f"写入Redis缓存失败: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._client.delete(self._prefix + key)
+        except self._errors as e:
+            logger.warning(f"删除Redis缓存失败: {e}")
+
+    def get_counter(self, key: str) -> int:
+        try:
+            return int(self._client.get(self._prefix + key) or 0)
+        except self._errors as e:
+            logger.warning(f"读取Redis计数器失败: {e}")
+            return 0
+
+    def incr(self, key: str) -> int:
+        try:
+            return int(self._client.incr(self._prefix + key))
+        except self._errors as e:
+            logger.warning(f"更新Redis计数器失败: {e}")
+            return 0
+
+    def publish(self, message: Dict) -> None:
+        try:
+            self._client.publish(self._channel, json.dumps(message))
+        except self._errors as e:
+            logger.warning(f"发布缓存消息失败，仅在本进程处理: {e}")
+            self._dispatch(message)
+
+    def _on_message(self, raw_message: Dict) -> None:
+        try:
+            message = json.loads(raw_message["data"])
+        except (TypeError, ValueError):
+            return
+        self._dispatch(message)
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self._channel: self._on_message})
+        self._listener = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def close(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def stats(self) -> Dict:
+        try:
+            info = self._client.info("memory")
+            return {"backend": self.name, "used_memory": info.get("used_memory")}
+        except self._errors as e:
+            return {"backend": self.name, "error": str(e)}
+
+
+class CacheNamespace:
+    """
+    缓存命名空间，键形如 "{name}:{group}:v{version}:{key}"
+    - invalidate(group): 版本号自增，该分组下的旧缓存全部失效并随TTL过期
+    - invalidate_key(group, key): 删除单个键
+    hold_seconds > 0 时，失效后的这段时间内拒绝回填（只读副本存在复制延迟时使用）
+    """
+
+    def __init__(self, backend: CacheBackend, name: str, ttl: float, hold_seconds: float = 0, versioned: bool = True):
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        self.hold_seconds = hold_seconds
+        self.versioned = versioned
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, group: str, key: str) -> str:
+        if not self.versioned:
+            return f"{self.name}:{group}:{key}"
+        version = self.backend.get_counter(f"{self.name}:ver:{group}")
+        return f"{self.name}:{group}:v{version}:{key}"
+
+    def get(self, group: str, key: str) -> Optional[Union[bytes, int]]:
+        value = self.backend.get(self._key(group, key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, group: str, key: str, value: Union[bytes, int]) -> None:
+        if self.hold_seconds and (
+            self.backend.get(f"{self.name}:hold:{group}") is not None
+            or self.backend.get(f"{self.name}:hold:{group}:{key}") is not None
+        ):
+            return
+        self.backend.set(self._key(group, key), value, self.ttl)
+
+    def invalidate(self, group: str) -> None:
+        if self.versioned:
+            self.backend.incr(f"{self.name}:ver:{group}")
+        if self.hold_seconds:
+            self.backend.set(f"{self.name}:hold:{group}", 1, self.hold_seconds)
+
+    def invalidate_key(self, group: str, key: str) -> None:
+        self.backend.delete(self._key(group, key))
+        if self.hold_seconds:
+            self.backend.set(f"{self.name}:hold:{group}:{key}", 1, self.hold_seconds)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+def create_cache_backend(settings) -> CacheBackend:
+    """根据配置创建缓存后端"""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.REDIS_URL, prefix=settings.CACHE_KEY_PREFIX)
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(maxsize=settings.CACHE_MEMORY_MAXSIZE)
+    raise ValueError(f"不支持的缓存后端: {settings.CACHE_BACKEND}")
+
+
+# 全局缓存后端，计数、详情和列表页缓存共用
+cache_backend = create_cache_backend(settings)
@@ -1,22 +1,63 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 
 class Settings(BaseSettings):
     # 数据库配置
     DATABASE_URL: str
+    # 可选的只读副本，列表与详情查询走该库
+    DATABASE_READ_URL: Optional[str] = None
+    # 用户写入后多少秒内，其读请求仍走主库（覆盖复制延迟）
+    READ_YOUR_WRITES_SECONDS: int = 5
+    
+    # 数据库连接池配置
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    # 借出连接前是否执行 SELECT 1 预检查；关闭后依赖 DB_POOL_RECYCLE 在服务端断开前回收连接
+    DB_POOL_PRE_PING: bool = True
     
     # JWT配置
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+    # 已验证令牌缓存：每个令牌最多缓存 AUTH_CACHE_TTL 秒（且不超过其过期时间）
+    AUTH_CACHE_TTL: int = 300
+    AUTH_CACHE_MAXSIZE: int = 10000
+    # 用户名 -> 用户信息的缓存秒数（修改角色后最多延迟这么久生效，吊销该用户的令牌可立即生效）
+    PRINCIPAL_CACHE_TTL: int = 60
     
     # 应用配置
     APP_NAME: str = "中文教育资源管理系统"
     VERSION: str = "1.0.0"
     DEBUG: bool = True
     
+    # 同步接口线程池大小（不宜远超 DB_POOL_SIZE + DB_MAX_OVERFLOW，否则多出的线程只能排队等连接）
+    THREADPOOL_SIZE: int = 40
+
+    # 汉字倒排索引每隔多少秒核对一次数据库中的条目数、最大ID和最后修改时间（0 表示不核对）；
+    # 进程内缓存无法收到其他 worker 和 SQL 脚本的写入，核对间隔即索引过期的上限
+    CHAR_INDEX_CHECK_SECONDS: int = 30
+
+    # 就绪检查（/health/ready）结果的缓存秒数，避免负载均衡频繁探测时每次都查询数据库
+    READY_CHECK_TTL: int = 5
+    
+    # 缓存配置：memory 为进程内缓存（单 worker），redis 为多 worker 共享缓存
+    CACHE_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "knma:"
+    CACHE_MEMORY_MAXSIZE: int = 20000
+    COUNT_CACHE_TTL: int = 60
+    DETAIL_CACHE_TTL: int = 300
+    LIST_CACHE_TTL: int = 30
+    
+    # 响应压缩：小于 COMPRESSION_MINIMUM_SIZE 字节的响应不压缩；安装 brotli 包后优先使用 br
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    
     # CORS配置
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -1,19 +1,45 @@
+import threading
+import time
+from typing import Dict, Optional
+
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .pool import InstrumentedQueuePool
+
+
+def engine_options(database_url):
+    """根据配置生成引擎参数，SQLite 保持 SQLAlchemy 默认的连接池"""
+    options = {
+        "echo": settings.DEBUG,                       # 在调试模式下打印SQL语句
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,   # 借出连接前执行 SELECT 1 预检查
+        "pool_recycle": settings.DB_POOL_RECYCLE,     # 连接回收时间（秒）
+    }
+    if make_url(database_url).get_backend_name() != "sqlite":
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
 
 # 创建数据库引擎，后续可以使用该引擎与数据库交互，sessionmaker(bind=engine)用于创建数据库会话
-engine = create_engine(
-    settings.DATABASE_URL, # 数据库连接URL
-    echo=settings.DEBUG,  # 在调试模式下打印SQL语句
-    pool_pre_ping=True,   # 连接池预检查
-    pool_recycle=3600,    # 连接回收时间（秒）
-)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
 # 创建会话工厂，用于生成数据库会话，绑定到引擎，不自动提交和刷新，确保数据一致性
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 只读副本：配置 DATABASE_READ_URL 后列表/详情查询走只读库，否则与主库相同
+if settings.DATABASE_READ_URL:
+    read_engine = create_engine(settings.DATABASE_READ_URL, **engine_options(settings.DATABASE_READ_URL))
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 # 创建基础模型类
 Base = declarative_base()
 
@@ -30,6 +56,67 @@ def get_db():
         db.close()
 
 
+class ReadWriteRouter:
+    """
+    读写分离路由
+    读请求默认使用只读副本；用户写入后的 window_seconds 秒内，
+    该用户的读请求改走主库，保证能读到自己刚写入的数据（复制延迟窗口）
+    写入记录保存在当前进程内
+    """
+
+    def __init__(self, primary_factory, replica_factory, window_seconds: float):
+        self.primary_factory = primary_factory
+        self.replica_factory = replica_factory
+        self.window_seconds = window_seconds
+        self._last_writes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark_write(self, username: Optional[str]) -> None:
+        """记录用户的写操作时间"""
+        if not username:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._last_writes[username] = now
+            # 顺便清理过期记录，避免字典无限增长
+            expired = [name for name, at in self._last_writes.items() if now - at > self.window_seconds]
+            for name in expired:
+                del self._last_writes[name]
+
+    def recently_wrote(self, username: Optional[str]) -> bool:
+        """用户是否在复制延迟窗口内写入过"""
+        if not username:
+            return False
+        with self._lock:
+            last_write = self._last_writes.get(username)
+        return last_write is not None and time.monotonic() - last_write <= self.window_seconds
+
+    def read_session(self, username: Optional[str] = None):
+        """为读请求创建会话"""
+        if self.replica_factory is self.primary_factory or self.recently_wrote(username):
+            return self.primary_factory()
+        return self.replica_factory()
+
+
+read_router = ReadWriteRouter(
+    SessionLocal,
+    ReadSessionLocal if read_engine is not engine else SessionLocal,
+    settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+def get_read_db():
+    """
+    获取只读数据库会话（匿名读请求）
+    可以在FastAPI的依赖注入中使用
+    """
+    db = read_router.read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def test_connection():
     """
     测试数据库连接
@@ -42,39 +129,3 @@ def test_connection():
     except Exception as e:
         print(f"数据库连接失败: {e}")
         return False
-
-
-def ensure_owner_columns():
-    """确保成语与词语表包含 created_by 字段"""
-    tables = [
-        ("hanyuguoxue_chengyu", "created_by", "VARCHAR(128)"),
-        ("hanyuguoxue_ciyu", "created_by", "VARCHAR(128)")
-    ]
-
-    try:
-        with engine.begin() as connection:
-            for table_name, column_name, definition in tables:
-                exists_query = text(
-                    """
-                    SELECT COUNT(*) FROM information_schema.COLUMNS
-                    WHERE TABLE_SCHEMA = DATABASE()
-                      AND TABLE_NAME = :table_name
-                      AND COLUMN_NAME = :column_name
-                    """
-                )
-                exists = connection.execute(
-                    exists_query,
-                    {"table_name": table_name, "column_name": column_name}
-                ).scalar()
-
-                if exists:
-                    continue
-
-                connection.execute(
-                    text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition}")
-                )
-
-        return True
-    except Exception as e:
-        print(f"创建 created_by 列失败: {e}")
-        return False
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+就绪检查
+启动时不连接数据库、不执行任何 DDL；首次请求 /health/ready 时才检查数据库连接并核对迁移版本，
+结果缓存 READY_CHECK_TTL 秒。迁移版本不是最新时需先执行 alembic upgrade head。
+用户表为空（如从内置账号的旧版本升级后尚未创建用户）时仍视为就绪，但返回 warning 并记录一次警告日志
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+EMPTY_USERS_WARNING = "用户表为空，无法登录：请运行 scripts/create_users.py 创建用户（--legacy 导入旧版本的内置账号）"
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic.ini")
+
+_lock = threading.Lock()
+_cached: Optional[Dict] = None
+_checked_at = 0.0
+_head_revision: Optional[str] = None
+_warned_empty_users = False
+
+
+def head_revision() -> str:
+    """迁移脚本的最新版本（只在首次检查时读取迁移目录，alembic 也在此时才导入）"""
+    global _head_revision
+    if _head_revision is None:
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+
+        _head_revision = ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+    return _head_revision
+
+
+def check_readiness() -> Dict:
+    """
+    连接数据库并读取当前迁移版本，返回 {"ready", "database", "revision", "head"[, "users", "warning", "error"]}
+    迁移为最新版本时另外统计用户数
+    """
+    global _warned_empty_users
+    from alembic.migration import MigrationContext
+
+    head = head_revision()
+    users = None
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            revision = MigrationContext.configure(connection).get_current_revision()
+            if revision == head:
+                users = connection.execute(text("SELECT COUNT(*) FROM users_knma")).scalar()
+    except Exception as e:
+        return {"ready": False, "database": False, "revision": None, "head": head, "error": str(e)}
+    result = {"ready": revision == head, "database": True, "revision": revision, "head": head}
+    if revision != head:
+        result["error"] = "数据库迁移不是最新版本，请执行 alembic upgrade head"
+        return result
+    result["users"] = users
+    if users == 0:
+        result["warning"] = EMPTY_USERS_WARNING
+        if not _warned_empty_users:
+            logger.warning(EMPTY_USERS_WARNING)
+            _warned_empty_users = True
+    return result
+
+
+def readiness() -> Dict:
+    """带缓存的就绪检查，会查询数据库，异步代码中需在线程池中调用"""
+    global _cached, _checked_at
+    with _lock:
+        if _cached is None or time.monotonic() - _checked_at > settings.READY_CHECK_TTL:
+            _cached = check_readiness()
+            _checked_at = time.monotonic()
+        return _cached
+
+
+def reset_readiness() -> None:
+    """清除缓存的检查结果（执行迁移后或测试中使用）"""
+    global _cached
+    with _lock:
+        _cached = None
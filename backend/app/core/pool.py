@@ -0,0 +1,68 @@
+"""
+带指标采集的数据库连接池
+"""
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from .metrics import Histogram
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    记录取连接等待时间、超时次数和借出连接数峰值的 QueuePool
+    等待时间通过包装 _do_get 测量（SQLAlchemy 连接池事件不提供等待开始时间）
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+        with self._stats_lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+            self.peak_overflow = max(self.peak_overflow, self.overflow())
+        return connection
+
+    def stats(self) -> Dict:
+        """当前连接池状态及累计指标"""
+        return {
+            "pool_size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeout": self._timeout,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "peak_checked_out": self.peak_checked_out,
+            "peak_overflow": max(self.peak_overflow, 0),
+            "wait_time_seconds": self.wait_time.snapshot(),
+        }
+
+
+def pool_stats(engine) -> Dict:
+    """返回引擎连接池指标，未使用带指标的连接池时只返回连接池状态描述"""
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"pool_class": type(pool).__name__, "status": pool.status()}
@@ -0,0 +1,35 @@
+"""
+密码哈希（bcrypt）
+哈希和校验都是耗时数百毫秒的CPU密集操作，异步接口中需放到线程池执行
+"""
+from typing import Optional
+
+from passlib.context import CryptContext
+from passlib.exc import UnknownHashError
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# 用户不存在时用于校验的哈希，使耗时与密码错误时一致，避免通过响应时间探测用户名
+_dummy_hash: Optional[str] = None
+
+
+def hash_password(password: str) -> str:
+    """生成密码哈希"""
+    return pwd_context.hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """校验密码，哈希格式无法识别时视为不匹配"""
+    try:
+        return pwd_context.verify(password, hashed_password)
+    except (UnknownHashError, ValueError):
+        return False
+
+
+def dummy_verify(password: str) -> bool:
+    """用户不存在时调用，消耗与一次真实校验相同的时间，总是返回 False"""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password("dummy-password")
+    pwd_context.verify(password, _dummy_hash)
+    return False
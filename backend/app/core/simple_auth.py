@@ -1,48 +1,76 @@
 """
-简单的本地认证模块（硬编码用户）
+认证模块
+用户保存在 users_knma 表中，密码使用 bcrypt 哈希；登录时的哈希校验和缓存未命中时的用户查询都在线程池中执行。
+已验证的令牌按摘要缓存到其过期为止（不超过 AUTH_CACHE_TTL），同一令牌的后续请求不再解码 JWT；
+用户名到用户信息另有 PRINCIPAL_CACHE_TTL 秒的缓存，新令牌也不必每次查询用户表。
+吊销令牌或用户时通过缓存后端记录并广播 auth 事件，各 worker 从本地缓存中移除
 """
+import hashlib
 import sys
 import os
+import time
 from typing import Optional, Dict
 from datetime import datetime, timedelta, timezone
+
+import anyio
 from jose import jwt
 from pydantic import BaseModel
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from app.core.cache import TTLCache, cache_backend
 from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import dummy_verify, verify_password
+from app.models.user import User
 
 
-class SimpleUser(BaseModel):
-    """简单用户模型"""
+class Principal(BaseModel):
+    """已认证的用户（不含密码哈希）"""
     id: int
     username: str
-    password: str  # 注意：实际应用中应该存储哈希值
     role: str
 
+    class Config:
+        from_attributes = True
 
-# 硬编码用户列表
-LOCAL_USERS = {
-    "admin": SimpleUser(id=1, username="admin", password="123456", role="admin"),
-    "teacher1": SimpleUser(id=2, username="teacher1", password="123456", role="teacher"),
-    "teacher2": SimpleUser(id=3, username="teacher2", password="123456", role="teacher")
-}
 
+# 用户名 -> 用户信息
+principal_cache = TTLCache(ttl=settings.PRINCIPAL_CACHE_TTL, maxsize=settings.AUTH_CACHE_MAXSIZE)
 
-def authenticate_user(username: str, password: str) -> Optional[SimpleUser]:
-    """验证用户"""
-    user = LOCAL_USERS.get(username)
-    if user and user.password == password:
-        return user
-    return None
 
+def authenticate_user(db: Session, username: str, password: str) -> Optional[Principal]:
+    """
+    校验用户名和密码，失败时返回 None
+    bcrypt 校验耗时数百毫秒，异步接口中需在线程池中调用；用户不存在时同样执行一次校验，耗时一致
+    """
+    user = db.query(User).filter(User.username == username).first()
+    if user is None:
+        return dummy_verify(password) or None
+    if not verify_password(password, user.hashed_password):
+        return None
+    return Principal.model_validate(user)
 
-def get_user_by_username(username: str) -> Optional[SimpleUser]:
-    """根据用户名获取用户"""
-    return LOCAL_USERS.get(username)
+
+def get_user_by_username(username: str) -> Optional[Principal]:
+    """根据用户名获取用户（带缓存）；未命中时查询数据库，异步代码中需在线程池中调用"""
+    principal = principal_cache.get(username)
+    if principal is not None:
+        return principal
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+    finally:
+        db.close()
+    if user is None:
+        return None
+    principal = Principal.model_validate(user)
+    principal_cache.set(username, principal)
+    return principal
 
 
 def create_access_token(username: str, role: str, expires_delta: Optional[timedelta] = None) -> str:
@@ -55,6 +83,7 @@ def create_access_token(username: str, role: str, expires_delta: Optional[timede
     to_encode = {
         "sub": username,
         "role": role,
+        "iat": int(time.time()),
         "exp": expire
     }
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -70,6 +99,101 @@ def verify_token(token: str) -> Optional[Dict]:
         return None
 
 
+# 已验证的令牌摘要 -> 用户
+token_cache = TTLCache(ttl=settings.AUTH_CACHE_TTL, maxsize=settings.AUTH_CACHE_MAXSIZE)
+
+
+def token_digest(token: str) -> str:
+    """令牌的摘要，作为缓存和吊销记录的键（不在内存和缓存后端中保存令牌原文）"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _remaining_seconds(payload: Dict) -> float:
+    """令牌剩余的有效秒数，没有 exp 时按配置的令牌有效期计算"""
+    exp = payload.get("exp")
+    if exp is None:
+        return settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return exp - time.time()
+
+
+def _is_revoked(digest: str, payload: Dict) -> bool:
+    if cache_backend.get(f"auth:revoked:{digest}") is not None:
+        return True
+    revoked_at = cache_backend.get(f"auth:revoked_user:{payload['sub']}")
+    return revoked_at is not None and payload.get("iat", 0) <= revoked_at
+
+
+def _verify_and_cache(token: str, digest: str) -> Optional[Principal]:
+    """令牌缓存未命中：解码 JWT、检查吊销记录并查找用户，然后缓存到令牌过期"""
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None or payload.get("role") is None:
+        return None
+    if _is_revoked(digest, payload):
+        return None
+    user = get_user_by_username(payload["sub"])
+    if user is None:
+        return None
+    ttl = min(settings.AUTH_CACHE_TTL, _remaining_seconds(payload))
+    if ttl > 0:
+        token_cache.set(digest, user, ttl)
+    return user
+
+
+def authenticate_token(token: str) -> Optional[Principal]:
+    """根据令牌获取用户，令牌无效、已过期或已吊销时返回 None；未命中缓存时可能查询数据库"""
+    digest = token_digest(token)
+    user = token_cache.get(digest)
+    if user is not None:
+        return user
+    return _verify_and_cache(token, digest)
+
+
+async def resolve_token(token: str) -> Optional[Principal]:
+    """异步版本：命中缓存时只是一次字典查找，未命中时在线程池中验证，不阻塞事件循环"""
+    digest = token_digest(token)
+    user = token_cache.get(digest)
+    if user is not None:
+        return user
+    return await anyio.to_thread.run_sync(_verify_and_cache, token, digest)
+
+
+def revoke_token(token: str) -> None:
+    """吊销令牌（如退出登录），记录保留到令牌过期"""
+    payload = verify_token(token)
+    if payload is None:
+        return
+    digest = token_digest(token)
+    ttl = _remaining_seconds(payload)
+    if ttl > 0:
+        cache_backend.set(f"auth:revoked:{digest}", 1, ttl)
+    _broadcast({"event": "auth", "token": digest})
+
+
+def revoke_user_tokens(username: str) -> None:
+    """吊销用户此前签发的全部令牌（如修改角色或删除用户后），吊销的下一秒起登录获得的令牌不受影响"""
+    cache_backend.set(
+        f"auth:revoked_user:{username}", int(time.time()), settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
+    _broadcast({"event": "auth", "username": username})
+
+
+def handle_auth_event(message: Dict) -> None:
+    """缓存后端的 auth 事件：从本地缓存中移除被吊销的令牌；吊销用户很少发生，移除该用户并清空令牌缓存"""
+    if message.get("event") != "auth":
+        return
+    if message.get("token"):
+        token_cache.delete(message["token"])
+    elif message.get("username"):
+        principal_cache.delete(message["username"])
+        token_cache.clear()
+
+
+def _broadcast(message: Dict) -> None:
+    # 本 worker 先直接处理，不依赖缓存后端把消息回传给自己
+    handle_auth_event(message)
+    cache_backend.publish(message)
+
+
 def check_admin_permission(role: str) -> bool:
     """检查管理员权限"""
     return role == "admin"
@@ -92,30 +216,23 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        # 验证token
-        payload = verify_token(credentials.credentials)
-        if payload is None:
-            raise credentials_exception
-        
-        username: str = payload.get("sub")
-        role: str = payload.get("role")
-        
-        if username is None or role is None:
-            raise credentials_exception
-            
-        # 获取用户信息
-        user = get_user_by_username(username)
-        if user is None:
-            raise credentials_exception
-            
-        return user
-        
-    except Exception:
+    user = await resolve_token(credentials.credentials)
+    if user is None:
         raise credentials_exception
+    return user
+
+
+optional_security = HTTPBearer(auto_error=False)
 
 
-async def get_current_admin_user(current_user: SimpleUser = Depends(get_current_user)):
+async def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
+    """获取当前用户，未登录或令牌无效时返回 None（用于不强制登录的接口）"""
+    if credentials is None:
+        return None
+    return await resolve_token(credentials.credentials)
+
+
+async def get_current_admin_user(current_user: Principal = Depends(get_current_user)):
     """获取当前管理员用户（需要管理员权限）"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -125,7 +242,7 @@ async def get_current_admin_user(current_user: SimpleUser = Depends(get_current_
     return current_user
 
 
-async def get_current_teacher_or_admin_user(current_user: SimpleUser = Depends(get_current_user)):
+async def get_current_teacher_or_admin_user(current_user: Principal = Depends(get_current_user)):
     """获取当前老师或管理员用户（需要老师或管理员权限）"""
     if current_user.role not in ["admin", "teacher"]:
         raise HTTPException(
@@ -134,33 +251,3 @@ async def get_current_teacher_or_admin_user(current_user: SimpleUser = Depends(g
         )
     return current_user
 
-
-if __name__ == "__main__":
-    # 测试简单认证
-    print("🔍 测试简单认证...")
-    
-    # 测试用户验证
-    user = authenticate_user("admin", "123456")
-    print(f"✅ 管理员验证: {user.username if user else '失败'}")
-    
-    user = authenticate_user("teacher1", "123456")
-    print(f"✅ 老师1验证: {user.username if user else '失败'}")
-    
-    user = authenticate_user("teacher2", "123456")
-    print(f"✅ 老师2验证: {user.username if user else '失败'}")
-    
-    user = authenticate_user("wrong", "wrong")
-    print(f"❌ 错误用户验证: {user.username if user else '失败'}")
-    
-    # 测试Token生成
-    token = create_access_token("admin", "admin")
-    print(f"✅ Token生成: {token[:50]}...")
-    
-    # 测试Token验证
-    payload = verify_token(token)
-    print(f"✅ Token验证: {payload}")
-    
-    # 测试权限
-    print(f"✅ 管理员权限: {check_admin_permission('admin')}")
-    print(f"✅ 老师权限: {check_teacher_or_admin_permission('teacher')}")
-    print(f"❌ 访客权限: {check_admin_permission('guest')}")
\ No newline at end of file
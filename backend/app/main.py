@@ -1,24 +1,56 @@
 """
 中文教育资源管理系统 - FastAPI应用入口
 """
-from fastapi import FastAPI, HTTPException, Depends, status, Form
+from fastapi import FastAPI, HTTPException, Depends, status, File, Form, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
 from typing import List, Optional
+import io
 import logging
 
-from sqlalchemy import or_
+import anyio
+
 from sqlalchemy.orm import Session
 
+from app.api.v1 import admin, hanzi
+from app.core.cache import cache_backend
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
-from app.core.database import get_db, test_connection, ensure_owner_columns
-from app.core.simple_auth import authenticate_user, create_access_token, verify_token, get_current_user
+from app.core.database import get_db, read_router
+from app.core.health import readiness
+from app.core.simple_auth import (
+    authenticate_user, create_access_token, get_current_user, get_optional_user, handle_auth_event, revoke_token,
+    security,
+)
 from app.models.chengyu import Chengyu
 from app.models.ciyu import Ciyu
-from app.schemas.chengyu import ChengyuResponse, ChengyuListResponse, ChengyuCreate, ChengyuUpdate
-from app.schemas.ciyu import CiyuResponse, CiyuListResponse, CiyuCreate, CiyuUpdate
-from app.schemas.common import APIResponse, PaginatedResponse, SearchParams
+from app.schemas.chengyu import ChengyuResponse, ChengyuListResponse, ChengyuCreate, ChengyuUpdate, ChengyuBatchUpdate
+from app.schemas.ciyu import CiyuResponse, CiyuListResponse, CiyuCreate, CiyuUpdate, CiyuBatchUpdate
+from app.schemas.common import APIResponse, BatchDeleteRequest, BatchGetRequest, PaginatedResponse, SearchParams
 from app.schemas.user import UserLogin, UserResponse, Token
+from app.services.batch import batch_delete, batch_get, batch_update, parse_ids, parse_words
+from app.services.bulk_import import detect_format, import_entries, iter_records
+from app.services.char_index import character_index, fetch_candidates_page, iter_matches, parse_query_characters
+from app.services.export import (
+    EXPORT_MEDIA_TYPES, EXPORT_TARGETS, check_format, export_headers, stream_export
+)
+from app.services.hanzi import lookup_hanzi
+from app.services.relation_graph import RELATION_MODELS, relation_graph
+from app.services.projection import model_to_item, project_columns, resolve_fields, row_to_item
+from app.services.search import (
+    SEARCH_TARGETS, apply_fulltext_filter, apply_pinyin_filter, parse_search_types,
+    search_entries, search_hanzi
+)
+from app.services.visibility import apply_visibility, is_public_owner
+from app.utils.http_cache import DETAIL_CACHE_CONTROL, LIST_CACHE_CONTROL, conditional_response, to_timestamp
+from app.utils.response_cache import (
+    cache_detail, get_cached_detail, invalidate_detail, invalidate_list_pages,
+    list_cache, list_cache_key
+)
+from app.utils.serialization import ORJSONResponse, encode_json
+from app.utils.pagination import encode_cursor, paginate_keyset, resolve_after_id
+from app.utils.totals import TOTAL_MODES, count_scope, get_total, invalidate_totals, total_pages
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -41,8 +73,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# HTTP Bearer认证
-security = HTTPBearer()
+# 响应压缩（br / gzip），列表页的大段中文释义压缩后通常只有原来的三分之一左右
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESS_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
+# 注册路由
+app.include_router(admin.router)
+app.include_router(hanzi.router)
+
+# 并发模型说明：数据库会话是同步的 SQLAlchemy Session，
+# 因此访问数据库的接口都用普通 def 定义，由 FastAPI 分派到线程池执行，
+# 避免 PyMySQL 的网络往返阻塞事件循环；不访问数据库的接口保持 async def
+
+# 列表接口支持的检索模式
+SEARCH_MODES = ("headword", "fulltext", "pinyin")
 
 
 def ensure_owner_or_admin(resource, current_user):
@@ -56,6 +104,136 @@ def ensure_owner_or_admin(resource, current_user):
         return
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="权限不足，只能修改自己创建的资源")
 
+def get_read_db_for_user(current_user = Depends(get_current_user)):
+    """已登录用户的只读会话：刚写入过数据的用户读主库，其余读只读副本"""
+    db = read_router.read_session(current_user.username)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db_for_optional_user(current_user = Depends(get_optional_user)):
+    """不强制登录的读接口使用的只读会话"""
+    db = read_router.read_session(current_user.username if current_user else None)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def record_write(resource, current_user, item_id=None, item_ids=()):
+    """
+    写操作提交后：清除计数、列表页和被修改条目的详情缓存，让该用户接下来的读请求走主库，
+    并通过缓存后端通知其他 worker；item_id / item_ids 都未提供时表示修改范围未知（如批量导入新增）
+    数据已经提交，缓存失效或发布失败（如 Redis 不可用）只记录日志、不向调用方抛出，缓存随 TTL 过期
+    """
+    read_router.mark_write(current_user.username)
+    ids = [item_id] if item_id is not None else list(item_ids)
+    try:
+        invalidate_totals(resource)
+        invalidate_list_pages(resource)
+        for changed_id in ids:
+            invalidate_detail(resource, changed_id)
+        cache_backend.publish({
+            "event": "write", "resource": resource, "id": item_id, "ids": ids or None, "user": current_user.username
+        })
+    except Exception as e:
+        logger.error(f"{resource} 写入后清除缓存失败: {e}")
+
+
+def handle_write_event(message):
+    """其他 worker 发生写入：同步该用户的读写分离状态"""
+    if message.get("event") == "write":
+        read_router.mark_write(message.get("user"))
+
+
+cache_backend.subscribe(handle_write_event)
+cache_backend.subscribe(character_index.handle_write_event)
+cache_backend.subscribe(relation_graph.handle_relation_event)
+cache_backend.subscribe(handle_auth_event)
+
+
+def run_import(resource, file, fmt, on_conflict, current_user, db):
+    """批量导入上传的 JSON Lines / CSV 文件，返回逐行报告"""
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(status_code=403, detail="权限不足")
+    try:
+        fmt = detect_format(file.filename, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 逐行读取上传的临时文件，按批写入数据库
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = import_entries(
+            db, resource, iter_records(lines, fmt), current_user.username,
+            is_admin=current_user.role == "admin", on_conflict=on_conflict
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="文件必须是 UTF-8 编码")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        lines.detach()
+
+    if report["inserted"]:
+        record_write(resource, current_user)
+        for row in report["rows"]:
+            if row["status"] == "updated":
+                invalidate_detail(resource, row["id"])
+    elif report["updated"]:
+        record_write(resource, current_user, item_ids=[row["id"] for row in report["rows"] if row["status"] == "updated"])
+    logger.info(
+        f"用户 {current_user.username} 导入{resource}: 新增 {report['inserted']}，更新 {report['updated']}，"
+        f"跳过 {report['skipped']}，失败 {report['failed']}"
+    )
+    return ORJSONResponse(report)
+
+
+def run_batch_get(resource, ids, words, db):
+    """批量获取成语/词语，参数无效时返回 400"""
+    try:
+        return batch_get(db, resource, ids, words)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def run_batch_write(resource, write, current_user, db):
+    """
+    批量更新/删除：write(db, username, is_admin) 返回逐条报告
+    提交后清除计数、列表页和被修改条目的详情缓存
+    """
+    try:
+        report = write(db, current_user.username, current_user.role == "admin")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"批量修改{resource}失败: {e}")
+        raise HTTPException(status_code=500, detail="批量修改失败")
+
+    changed = [row["id"] for row in report["rows"] if row["status"] in ("updated", "deleted")]
+    if changed:
+        record_write(resource, current_user, item_ids=changed)
+    logger.info(f"用户 {current_user.username} 批量修改{resource}: {len(changed)}/{report['total']} 条成功")
+    return ORJSONResponse(report)
+
+
+def apply_search(query, resource, search, search_mode):
+    """
+    按检索模式过滤列表：headword 只匹配词条，fulltext 检索词条、拼音、释义和例句，
+    pinyin 按规范化拼音或首字母前缀匹配
+    """
+    if not search:
+        return query
+    if search_mode == "fulltext":
+        return apply_fulltext_filter(query, resource, search)
+    if search_mode == "pinyin":
+        return apply_pinyin_filter(query, resource, search)
+    headword_column = SEARCH_TARGETS[resource][1]
+    return query.filter(headword_column.like(f"%{search}%"))
+
+
 # 根路径
 @app.get("/")
 async def root():
@@ -68,7 +246,7 @@ async def root():
     }
 
 @app.get("/debug/check-data")
-async def check_existing_data(db: Session = Depends(get_db)):
+def check_existing_data(db: Session = Depends(get_db)):
     """检查现有数据 - 无需认证"""
     try:
         chengyu_count = db.query(Chengyu).count()
@@ -86,14 +264,23 @@ async def health_check():
     """健康检查接口"""
     return {"status": "healthy", "message": "服务运行正常"}
 
+
+@app.get("/health/ready")
+def readiness_check(response: Response):
+    """就绪检查接口：数据库可连接且迁移为最新版本时返回 200，否则返回 503（结果缓存数秒）"""
+    result = readiness()
+    if not result["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
+
 # 认证相关接口
 @app.post("/api/v1/auth/login", response_model=Token)
 async def login(username: str = Form(...), password: str = Form(...), db: Session = Depends(get_db)):
     """用户登录接口"""
     logger.info(f"用户登录尝试: {username}")
     
-    # 验证用户
-    user = authenticate_user(username, password)
+    # 验证用户（bcrypt 校验在线程池中执行，不阻塞事件循环）
+    user = await anyio.to_thread.run_sync(authenticate_user, db, username, password)
     if not user:
         logger.warning(f"登录失败: 用户名或密码错误 - {username}")
         raise HTTPException(
@@ -116,6 +303,14 @@ async def login(username: str = Form(...), password: str = Form(...), db: Sessio
         )
     )
 
+
+@app.post("/api/v1/auth/logout")
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(security), current_user = Depends(get_current_user)):
+    """退出登录：吊销当前令牌"""
+    revoke_token(credentials.credentials)
+    logger.info(f"用户退出登录: {current_user.username}")
+    return {"message": "已退出登录"}
+
 @app.get("/api/v1/auth/me", response_model=UserResponse)
 async def get_current_user_info(current_user = Depends(get_current_user)):
     """获取当前用户信息"""
@@ -125,86 +320,299 @@ async def get_current_user_info(current_user = Depends(get_current_user)):
         role=current_user.role
     )
 
+# 检索接口
+@app.get("/api/v1/search", response_class=ORJSONResponse)
+def search(
+    q: str,
+    types: Optional[str] = None,
+    limit: int = 20,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_read_db_for_user)
+):
+    """按相关度检索成语、词语和汉字（types 为逗号分隔的 chengyu,ciyu,hanzi）"""
+    try:
+        search_types = parse_search_types(types)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    limit = max(1, min(limit, 100))
+
+    try:
+        results = {}
+        for search_type in search_types:
+            if search_type == "hanzi":
+                results["hanzi"] = search_hanzi(db, q, limit)
+                continue
+            model = SEARCH_TARGETS[search_type][0]
+            query = apply_visibility(db.query(model), model, current_user)
+            results[search_type] = search_entries(query, search_type, q, limit)
+        return {"query": q, "results": results}
+    except Exception as e:
+        logger.error(f"检索失败: {e}")
+        raise HTTPException(status_code=500, detail="检索失败")
+
+@app.get("/api/v1/search/characters")
+def search_by_characters(
+    request: Request,
+    chars: str,
+    resource: str = "chengyu",
+    size: int = 20,
+    cursor: Optional[str] = None,
+    after_id: Optional[int] = None,
+    view: str = "summary",
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_read_db_for_user)
+):
+    """
+    查找同时含有 chars 中所有汉字的成语或词语（resource 为 chengyu 或 ciyu），按ID降序游标分页
+    通过内存中的汉字倒排索引求交集，不做 LIKE 扫描；hanzi 中返回各汉字在汉字表中的记录
+    """
+    if resource not in SEARCH_TARGETS:
+        raise HTTPException(status_code=400, detail="resource 只能是 chengyu 或 ciyu")
+    size = max(1, min(size, 100))
+    try:
+        characters = parse_query_characters(chars)
+        after_id = resolve_after_id(cursor, after_id)
+        field_names = resolve_fields(resource, view)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    truncate = view == "summary"
+
+    matches = iter_matches(character_index.postings(resource, characters), after_id)
+    model = SEARCH_TARGETS[resource][0]
+    query = apply_visibility(db.query(model), model, current_user)
+    query = query.with_entities(*project_columns(resource, field_names, truncate))
+    rows, next_cursor = fetch_candidates_page(query, resource, matches, size)
+
+    body = encode_json({
+        "characters": characters,
+        "hanzi": lookup_hanzi(db, characters, [], [])["items"],
+        "items": [row_to_item(resource, row, field_names, truncate) for row in rows],
+        "size": size,
+        "next_cursor": next_cursor,
+    })
+    return conditional_response(request, body, LIST_CACHE_CONTROL, vary="Authorization")
+
+def fetch_visible_items(db, resource, ids, current_user):
+    """按ID读取当前用户可见的条目（摘要视图），返回 {id: 条目}"""
+    model = SEARCH_TARGETS[resource][0]
+    field_names = resolve_fields(resource, "summary")
+    query = apply_visibility(db.query(model), model, current_user)
+    query = query.with_entities(*project_columns(resource, field_names, truncate=True))
+    return {
+        row.id: row_to_item(resource, row, field_names, truncate=True)
+        for row in query.filter(model.id.in_(list(ids))).all()
+    }
+
+
+def check_relation_resource(resource):
+    if resource not in RELATION_MODELS:
+        raise HTTPException(status_code=400, detail="resource 只能是 chengyu 或 ciyu")
+
+
+@app.get("/api/v1/relations/{resource}/{item_id}", response_class=ORJSONResponse)
+def get_relations(
+    resource: str,
+    item_id: int,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_read_db_for_user)
+):
+    """条目的近义、反义关系（来自关系表），按关系类型分组返回摘要视图"""
+    check_relation_resource(resource)
+    neighbours = relation_graph.neighbours(resource, item_id)
+    items = fetch_visible_items(db, resource, {item_id}.union(*neighbours.values()), current_user)
+    if item_id not in items:
+        raise HTTPException(status_code=404, detail="条目不存在")
+    return ORJSONResponse({
+        "id": item_id,
+        **{relation_type: [items[other] for other in ids if other in items] for relation_type, ids in neighbours.items()},
+    })
+
+
+@app.get("/api/v1/relations/{resource}/{item_id}/expand", response_class=ORJSONResponse)
+def expand_relations(
+    resource: str,
+    item_id: int,
+    type: str = "synonym",
+    hops: int = 2,
+    limit: int = 50,
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_read_db_for_user)
+):
+    """沿近义（或反义）关系扩展 hops 跳（最多 3 跳），每项带有 distance（跳数）"""
+    check_relation_resource(resource)
+    try:
+        expanded = relation_graph.expand(resource, item_id, type, hops, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    items = fetch_visible_items(db, resource, [item_id] + [other for other, _ in expanded], current_user)
+    if item_id not in items:
+        raise HTTPException(status_code=404, detail="条目不存在")
+    return ORJSONResponse({
+        "id": item_id,
+        "type": type,
+        "hops": hops,
+        "items": [{**items[other], "distance": distance} for other, distance in expanded if other in items],
+    })
+
+# 导出接口
+@app.get("/api/v1/export/{resource}")
+def export_entries(resource: str, format: str = "ndjson", current_user = Depends(get_current_user)):
+    """
+    流式导出成语/词语/汉字（format 为 ndjson、csv 或 parquet），老师只导出自己可见的数据
+    分批读取、边读边输出，导出整表时内存占用不随表大小增长
+    """
+    if resource not in EXPORT_TARGETS:
+        raise HTTPException(status_code=404, detail="不支持导出该资源")
+    try:
+        check_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    model = EXPORT_TARGETS[resource]
+
+    def build_query(db):
+        query = db.query(model)
+        if resource == "hanzi":
+            return query
+        return apply_visibility(query, model, current_user)
+
+    content = stream_export(lambda: read_router.read_session(current_user.username), build_query, resource, format)
+    return StreamingResponse(content, media_type=EXPORT_MEDIA_TYPES[format], headers=export_headers(resource, format))
+
+
 # 成语相关接口
 @app.get("/api/v1/chengyu")
-async def get_chengyu_list(
+def get_chengyu_list(
+    request: Request,
     page: int = 1,
     size: int = 20,
     search: Optional[str] = None,
+    search_mode: str = "headword",
+    cursor: Optional[str] = None,
+    after_id: Optional[int] = None,
+    include_total: bool = True,
+    total_mode: str = "exact",
+    view: str = "full",
+    fields: Optional[str] = None,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db_for_user)
 ):
-    """获取成语列表（根据用户权限过滤）"""
+    """获取成语列表（根据用户权限过滤）
+
+    默认使用 page/size 偏移分页；传入 cursor（上一页返回的 next_cursor）或 after_id
+    时切换为基于主键的游标分页，深翻页不再受 OFFSET 影响。
+    total_mode=estimated 使用执行计划估算总数，include_total=false 时不统计总数。
+    search_mode=fulltext 时在拼音、释义等字段中全文检索，search_mode=pinyin 时按拼音/首字母前缀检索
+    view=summary 只返回列表展示所需的字段并截断长文本，fields 指定返回的字段（逗号分隔）。
+    响应带 ETag，客户端携带 If-None-Match 且内容未变时返回 304
+    """
     try:
-        query = db.query(Chengyu)
-        
-        # 老师只能看到公共资源（包括管理员创建的）和自己创建的
-        if current_user.role == "teacher":
-            query = query.filter(
-                or_(
-                    Chengyu.created_by == None,
-                    Chengyu.created_by == "",
-                    Chengyu.created_by == "system",
-                    Chengyu.created_by == "admin",
-                    Chengyu.created_by == current_user.username
-                )
-            )
-        
-        # 搜索过滤 - 只根据成语内容进行匹配
-        if search:
-            query = query.filter(Chengyu.chengyu.like(f"%{search}%"))
+        after_id = resolve_after_id(cursor, after_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if total_mode not in TOTAL_MODES:
+        raise HTTPException(status_code=400, detail=f"total_mode 只能是 {', '.join(TOTAL_MODES)}")
+    if search_mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"search_mode 只能是 {', '.join(SEARCH_MODES)}")
+    try:
+        field_names = resolve_fields("chengyu", view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    truncate = view == "summary"
+
+    # 列表页缓存：刚写入过数据的用户跳过缓存，保证读到自己的修改
+    use_cache = not read_router.recently_wrote(current_user.username)
+    cache_key = list_cache_key(
+        count_scope(current_user), page=page, size=size, search=search, search_mode=search_mode,
+        after_id=after_id, include_total=include_total, total_mode=total_mode, view=view, fields=field_names
+    )
+    if use_cache:
+        body = list_cache.get("chengyu", cache_key)
+        if body is not None:
+            return conditional_response(request, body, LIST_CACHE_CONTROL, vary="Authorization")
+
+    try:
+        query = apply_visibility(db.query(Chengyu), Chengyu, current_user)
+        query = apply_search(query, "chengyu", search, search_mode)
         
         # 分页 - 使用降序排序显示最新内容
-        total = query.count()
-        offset = (page - 1) * size
-        chengyu_list = query.order_by(Chengyu.id.desc()).offset(offset).limit(size).all()
-        
-        # 构建返回数据
-        items = []
-        for chengyu in chengyu_list:
-            item_dict = {
-                'id': chengyu.id,
-                'chengyu': chengyu.chengyu,
-                'url': chengyu.url,
-                'pinyin': chengyu.pinyin,
-                'zhuyin': chengyu.zhuyin,
-                'emotion': chengyu.emotion,
-                'explanation': chengyu.explanation,
-                'source': chengyu.source,
-                'usage': chengyu.usage,
-                'example': chengyu.example,
-                'synonyms': chengyu.synonyms,
-                'antonyms': chengyu.antonyms,
-                'translation': chengyu.translation,
-                'created_by': chengyu.created_by,
-                'created_at': chengyu.created_at,
-                'updated_at': chengyu.updated_at
-            }
-            items.append(item_dict)
+        total = get_total(
+            query, "chengyu", count_scope(current_user), f"{search_mode}:{search or ''}",
+            mode=total_mode, include_total=include_total
+        )
+        # 只查询需要返回的列
+        query = query.with_entities(*project_columns("chengyu", field_names, truncate))
+        if after_id is not None:
+            chengyu_list, next_cursor = paginate_keyset(query, Chengyu.id, size, after_id)
+        else:
+            offset = (page - 1) * size
+            chengyu_list = query.order_by(Chengyu.id.desc()).offset(offset).limit(size + 1).all()
+            has_more = len(chengyu_list) > size
+            chengyu_list = chengyu_list[:size]
+            next_cursor = encode_cursor(chengyu_list[-1].id) if has_more and chengyu_list else None
         
-        return {
+        items = [row_to_item("chengyu", row, field_names, truncate) for row in chengyu_list]
+
+        body = encode_json({
             "items": items,
             "total": total,
             "page": page,
             "size": size,
-            "pages": (total + size - 1) // size
-        }
+            "pages": total_pages(total, size),
+            "next_cursor": next_cursor
+        })
+        if use_cache:
+            list_cache.set("chengyu", cache_key, body)
+        return conditional_response(request, body, LIST_CACHE_CONTROL, vary="Authorization")
     except Exception as e:
         logger.error(f"获取成语列表失败: {str(e)}")
         import traceback
         logger.error(f"详细错误: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"获取成语列表失败: {str(e)}")
 
-@app.get("/api/v1/chengyu/{chengyu_id}", response_model=ChengyuResponse)
-async def get_chengyu(chengyu_id: int, db: Session = Depends(get_db)):
-    """获取单个成语详情"""
-    chengyu = db.query(Chengyu).filter(Chengyu.id == chengyu_id).first()
-    if not chengyu:
-        raise HTTPException(status_code=404, detail="成语不存在")
-    return ChengyuResponse.from_orm(chengyu)
+# 批量获取需注册在 /{chengyu_id} 之前，否则 "batch" 会被当作ID解析
+@app.get("/api/v1/chengyu/batch")
+def get_chengyu_batch(
+    request: Request,
+    ids: Optional[str] = None,
+    words: Optional[str] = None,
+    db: Session = Depends(get_read_db_for_optional_user)
+):
+    """按ID或成语批量获取详情（ids、words 为逗号分隔的列表），结果按请求顺序返回"""
+    try:
+        id_list = parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    body = run_batch_get("chengyu", id_list, parse_words(words), db)
+    return conditional_response(request, body, DETAIL_CACHE_CONTROL)
+
+
+@app.post("/api/v1/chengyu/batch")
+def post_chengyu_batch(payload: BatchGetRequest, db: Session = Depends(get_read_db_for_optional_user)):
+    """按ID或成语批量获取详情（请求体传入，适合列表较长或含逗号的情况）"""
+    body = run_batch_get("chengyu", payload.ids, payload.words, db)
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/api/v1/chengyu/{chengyu_id}", response_class=ORJSONResponse, responses={200: {"model": ChengyuResponse}})
+def get_chengyu(chengyu_id: int, request: Request, db: Session = Depends(get_read_db_for_optional_user)):
+    """获取单个成语详情（命中缓存时不访问数据库，支持 ETag / Last-Modified 条件请求）"""
+    cached = get_cached_detail("chengyu", chengyu_id)
+    if cached is None:
+        field_names = resolve_fields("chengyu")
+        row = db.query(Chengyu).with_entities(*project_columns("chengyu", field_names)).filter(Chengyu.id == chengyu_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="成语不存在")
+        item = row_to_item("chengyu", row, field_names)
+        body = encode_json(item)
+        last_modified = to_timestamp(item["updated_at"] or item["created_at"])
+        cache_detail("chengyu", chengyu_id, body, last_modified)
+    else:
+        body, last_modified = cached
+    return conditional_response(request, body, DETAIL_CACHE_CONTROL, last_modified)
 
-@app.post("/api/v1/chengyu", response_model=ChengyuResponse)
-async def create_chengyu(
+@app.post("/api/v1/chengyu", response_class=ORJSONResponse, responses={200: {"model": ChengyuResponse}})
+def create_chengyu(
     chengyu_data: ChengyuCreate,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -214,12 +622,16 @@ async def create_chengyu(
         raise HTTPException(status_code=403, detail="权限不足")
     
     try:
-        chengyu = Chengyu(**chengyu_data.dict(), created_by=current_user.username)
+        chengyu = Chengyu(
+            **chengyu_data.dict(), created_by=current_user.username,
+            is_public=is_public_owner(current_user.username, current_user.role == "admin")
+        )
         db.add(chengyu)
         db.commit()
+        record_write("chengyu", current_user, chengyu.id)
         db.refresh(chengyu)
         logger.info(f"用户 {current_user.username} 创建了成语: {chengyu.chengyu}")
-        return ChengyuResponse.from_orm(chengyu)
+        return ORJSONResponse(model_to_item("chengyu", chengyu))
     except Exception as e:
         db.rollback()
         error_msg = str(e)
@@ -238,8 +650,51 @@ async def create_chengyu(
             )
 
 
-@app.put("/api/v1/chengyu/{chengyu_id}", response_model=ChengyuResponse)
-async def update_chengyu(
+@app.post("/api/v1/chengyu/import")
+def import_chengyu(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    on_conflict: str = "skip",
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """批量导入成语（JSON Lines 或 CSV，UTF-8 编码）
+
+    on_conflict=skip 跳过已存在的成语，update 用文件中出现的字段更新已存在的成语。
+    返回新增/更新/跳过/失败数量及逐行结果。
+    """
+    return run_import("chengyu", file, format, on_conflict, current_user, db)
+
+
+# 批量接口需注册在 /{chengyu_id} 之前
+@app.put("/api/v1/chengyu/batch")
+def update_chengyu_batch(
+    payload: ChengyuBatchUpdate,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """批量更新成语，每项只写入传入的字段；返回每个ID的结果（updated / not_found / forbidden / failed）"""
+    items = [item.model_dump(exclude_unset=True) for item in payload.items]
+    return run_batch_write(
+        "chengyu", lambda db, username, is_admin: batch_update(db, "chengyu", items, username, is_admin), current_user, db
+    )
+
+
+@app.post("/api/v1/chengyu/batch/delete")
+def delete_chengyu_batch(
+    payload: BatchDeleteRequest,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """批量删除成语，返回每个ID的结果（deleted / not_found / forbidden）"""
+    return run_batch_write(
+        "chengyu", lambda db, username, is_admin: batch_delete(db, "chengyu", payload.ids, username, is_admin),
+        current_user, db
+    )
+
+
+@app.put("/api/v1/chengyu/{chengyu_id}", response_class=ORJSONResponse, responses={200: {"model": ChengyuResponse}})
+def update_chengyu(
     chengyu_id: int,
     chengyu_data: ChengyuUpdate,
     current_user=Depends(get_current_user),
@@ -259,17 +714,18 @@ async def update_chengyu(
         for key, value in payload.items():
             setattr(chengyu, key, value)
         db.commit()
+        record_write("chengyu", current_user, chengyu_id)
         db.refresh(chengyu)
         logger.info(f"用户 {current_user.username} 更新了成语: {chengyu.chengyu}")
-        return ChengyuResponse.from_orm(chengyu)
+        return ORJSONResponse(model_to_item("chengyu", chengyu))
     except Exception as e:
         db.rollback()
         logger.error(f"更新成语失败: {e}")
         raise HTTPException(status_code=500, detail="更新成语失败")
 
 
-@app.delete("/api/v1/chengyu/{chengyu_id}")
-async def delete_chengyu(
+@app.delete("/api/v1/chengyu/{chengyu_id}", response_class=ORJSONResponse, responses={200: {"model": APIResponse}})
+def delete_chengyu(
     chengyu_id: int,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -283,8 +739,9 @@ async def delete_chengyu(
     try:
         db.delete(chengyu)
         db.commit()
+        record_write("chengyu", current_user, chengyu_id)
         logger.info(f"用户 {current_user.username} 删除了成语: {chengyu.chengyu}")
-        return APIResponse(success=True, message="成语已删除")
+        return ORJSONResponse(APIResponse(success=True, message="成语已删除").model_dump())
     except Exception as e:
         db.rollback()
         logger.error(f"删除成语失败: {e}")
@@ -292,79 +749,135 @@ async def delete_chengyu(
 
 # 词语相关接口
 @app.get("/api/v1/ciyu")
-async def get_ciyu_list(
+def get_ciyu_list(
+    request: Request,
     page: int = 1,
     size: int = 20,
     search: Optional[str] = None,
+    search_mode: str = "headword",
+    cursor: Optional[str] = None,
+    after_id: Optional[int] = None,
+    include_total: bool = True,
+    total_mode: str = "exact",
+    view: str = "full",
+    fields: Optional[str] = None,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db_for_user)
 ):
-    """获取词语列表（根据用户权限过滤）"""
+    """获取词语列表（根据用户权限过滤）
+
+    默认使用 page/size 偏移分页；传入 cursor（上一页返回的 next_cursor）或 after_id
+    时切换为基于主键的游标分页，深翻页不再受 OFFSET 影响。
+    total_mode=estimated 使用执行计划估算总数，include_total=false 时不统计总数。
+    search_mode=fulltext 时在拼音、释义等字段中全文检索，search_mode=pinyin 时按拼音/首字母前缀检索
+    view=summary 只返回列表展示所需的字段并截断长文本，fields 指定返回的字段（逗号分隔）。
+    响应带 ETag，客户端携带 If-None-Match 且内容未变时返回 304
+    """
     try:
-        query = db.query(Ciyu)
-        
-        # 老师只能看到公共资源（包括管理员创建的）和自己创建的
-        if current_user.role == "teacher":
-            query = query.filter(
-                or_(
-                    Ciyu.created_by == None,
-                    Ciyu.created_by == "",
-                    Ciyu.created_by == "system",
-                    Ciyu.created_by == "admin",
-                    Ciyu.created_by == current_user.username
-                )
-            )
-        
-        # 搜索过滤 - 只根据词语内容进行匹配
-        if search:
-            query = query.filter(Ciyu.word.like(f"%{search}%"))
+        after_id = resolve_after_id(cursor, after_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if total_mode not in TOTAL_MODES:
+        raise HTTPException(status_code=400, detail=f"total_mode 只能是 {', '.join(TOTAL_MODES)}")
+    if search_mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"search_mode 只能是 {', '.join(SEARCH_MODES)}")
+    try:
+        field_names = resolve_fields("ciyu", view, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    truncate = view == "summary"
+
+    # 列表页缓存：刚写入过数据的用户跳过缓存，保证读到自己的修改
+    use_cache = not read_router.recently_wrote(current_user.username)
+    cache_key = list_cache_key(
+        count_scope(current_user), page=page, size=size, search=search, search_mode=search_mode,
+        after_id=after_id, include_total=include_total, total_mode=total_mode, view=view, fields=field_names
+    )
+    if use_cache:
+        body = list_cache.get("ciyu", cache_key)
+        if body is not None:
+            return conditional_response(request, body, LIST_CACHE_CONTROL, vary="Authorization")
+
+    try:
+        query = apply_visibility(db.query(Ciyu), Ciyu, current_user)
+        query = apply_search(query, "ciyu", search, search_mode)
         
         # 分页 - 使用降序排序显示最新内容
-        total = query.count()
-        offset = (page - 1) * size
-        ciyu_list = query.order_by(Ciyu.id.desc()).offset(offset).limit(size).all()
-        
-        # 构建返回数据
-        items = []
-        for ciyu in ciyu_list:
-            item_dict = {
-                'id': ciyu.id,
-                'word': ciyu.word,
-                'url': ciyu.url,
-                'pinyin': ciyu.pinyin,
-                'zhuyin': ciyu.zhuyin,
-                'part_of_speech': ciyu.part_of_speech,
-                'is_common': ciyu.is_common,
-                'definition': ciyu.definition,
-                'synonyms': ciyu.synonyms,
-                'antonyms': ciyu.antonyms,
-                'created_by': ciyu.created_by,
-                'created_at': ciyu.created_at,
-                'updated_at': ciyu.updated_at
-            }
-            items.append(item_dict)
+        total = get_total(
+            query, "ciyu", count_scope(current_user), f"{search_mode}:{search or ''}",
+            mode=total_mode, include_total=include_total
+        )
+        # 只查询需要返回的列
+        query = query.with_entities(*project_columns("ciyu", field_names, truncate))
+        if after_id is not None:
+            ciyu_list, next_cursor = paginate_keyset(query, Ciyu.id, size, after_id)
+        else:
+            offset = (page - 1) * size
+            ciyu_list = query.order_by(Ciyu.id.desc()).offset(offset).limit(size + 1).all()
+            has_more = len(ciyu_list) > size
+            ciyu_list = ciyu_list[:size]
+            next_cursor = encode_cursor(ciyu_list[-1].id) if has_more and ciyu_list else None
         
-        return {
+        items = [row_to_item("ciyu", row, field_names, truncate) for row in ciyu_list]
+
+        body = encode_json({
             "items": items,
             "total": total,
             "page": page,
             "size": size,
-            "pages": (total + size - 1) // size
-        }
+            "pages": total_pages(total, size),
+            "next_cursor": next_cursor
+        })
+        if use_cache:
+            list_cache.set("ciyu", cache_key, body)
+        return conditional_response(request, body, LIST_CACHE_CONTROL, vary="Authorization")
     except Exception as e:
         logger.error(f"获取词语列表失败: {str(e)}")
         raise HTTPException(status_code=500, detail="获取词语列表失败")
 
-@app.get("/api/v1/ciyu/{ciyu_id}", response_model=CiyuResponse)
-async def get_ciyu(ciyu_id: int, db: Session = Depends(get_db)):
-    """获取单个词语详情"""
-    ciyu = db.query(Ciyu).filter(Ciyu.id == ciyu_id).first()
-    if not ciyu:
-        raise HTTPException(status_code=404, detail="词语不存在")
-    return CiyuResponse.from_orm(ciyu)
+# 批量获取需注册在 /{ciyu_id} 之前，否则 "batch" 会被当作ID解析
+@app.get("/api/v1/ciyu/batch")
+def get_ciyu_batch(
+    request: Request,
+    ids: Optional[str] = None,
+    words: Optional[str] = None,
+    db: Session = Depends(get_read_db_for_optional_user)
+):
+    """按ID或词语批量获取详情（ids、words 为逗号分隔的列表），结果按请求顺序返回"""
+    try:
+        id_list = parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    body = run_batch_get("ciyu", id_list, parse_words(words), db)
+    return conditional_response(request, body, DETAIL_CACHE_CONTROL)
+
 
-@app.post("/api/v1/ciyu", response_model=CiyuResponse)
-async def create_ciyu(
+@app.post("/api/v1/ciyu/batch")
+def post_ciyu_batch(payload: BatchGetRequest, db: Session = Depends(get_read_db_for_optional_user)):
+    """按ID或词语批量获取详情（请求体传入，适合列表较长或含逗号的情况）"""
+    body = run_batch_get("ciyu", payload.ids, payload.words, db)
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/api/v1/ciyu/{ciyu_id}", response_class=ORJSONResponse, responses={200: {"model": CiyuResponse}})
+def get_ciyu(ciyu_id: int, request: Request, db: Session = Depends(get_read_db_for_optional_user)):
+    """获取单个词语详情（命中缓存时不访问数据库，支持 ETag / Last-Modified 条件请求）"""
+    cached = get_cached_detail("ciyu", ciyu_id)
+    if cached is None:
+        field_names = resolve_fields("ciyu")
+        row = db.query(Ciyu).with_entities(*project_columns("ciyu", field_names)).filter(Ciyu.id == ciyu_id).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="词语不存在")
+        item = row_to_item("ciyu", row, field_names)
+        body = encode_json(item)
+        last_modified = to_timestamp(item["updated_at"] or item["created_at"])
+        cache_detail("ciyu", ciyu_id, body, last_modified)
+    else:
+        body, last_modified = cached
+    return conditional_response(request, body, DETAIL_CACHE_CONTROL, last_modified)
+
+@app.post("/api/v1/ciyu", response_class=ORJSONResponse, responses={200: {"model": CiyuResponse}})
+def create_ciyu(
     ciyu_data: CiyuCreate,
     current_user = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -374,20 +887,67 @@ async def create_ciyu(
         raise HTTPException(status_code=403, detail="权限不足")
     
     try:
-        ciyu = Ciyu(**ciyu_data.dict(), created_by=current_user.username)
+        ciyu = Ciyu(
+            **ciyu_data.dict(), created_by=current_user.username,
+            is_public=is_public_owner(current_user.username, current_user.role == "admin")
+        )
         db.add(ciyu)
         db.commit()
+        record_write("ciyu", current_user, ciyu.id)
         db.refresh(ciyu)
         logger.info(f"用户 {current_user.username} 创建了词语: {ciyu.word}")
-        return CiyuResponse.from_orm(ciyu)
+        return ORJSONResponse(model_to_item("ciyu", ciyu))
     except Exception as e:
         db.rollback()
         logger.error(f"创建词语失败: {str(e)}")
         raise HTTPException(status_code=500, detail="创建词语失败")
 
 
-@app.put("/api/v1/ciyu/{ciyu_id}", response_model=CiyuResponse)
-async def update_ciyu(
+@app.post("/api/v1/ciyu/import")
+def import_ciyu(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    on_conflict: str = "skip",
+    current_user = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """批量导入词语（JSON Lines 或 CSV，UTF-8 编码）
+
+    on_conflict=skip 跳过已存在的词语，update 用文件中出现的字段更新已存在的词语。
+    返回新增/更新/跳过/失败数量及逐行结果。
+    """
+    return run_import("ciyu", file, format, on_conflict, current_user, db)
+
+
+# 批量接口需注册在 /{ciyu_id} 之前
+@app.put("/api/v1/ciyu/batch")
+def update_ciyu_batch(
+    payload: CiyuBatchUpdate,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """批量更新词语，每项只写入传入的字段；返回每个ID的结果（updated / not_found / forbidden / failed）"""
+    items = [item.model_dump(exclude_unset=True) for item in payload.items]
+    return run_batch_write(
+        "ciyu", lambda db, username, is_admin: batch_update(db, "ciyu", items, username, is_admin), current_user, db
+    )
+
+
+@app.post("/api/v1/ciyu/batch/delete")
+def delete_ciyu_batch(
+    payload: BatchDeleteRequest,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """批量删除词语，返回每个ID的结果（deleted / not_found / forbidden）"""
+    return run_batch_write(
+        "ciyu", lambda db, username, is_admin: batch_delete(db, "ciyu", payload.ids, username, is_admin),
+        current_user, db
+    )
+
+
+@app.put("/api/v1/ciyu/{ciyu_id}", response_class=ORJSONResponse, responses={200: {"model": CiyuResponse}})
+def update_ciyu(
     ciyu_id: int,
     ciyu_data: CiyuUpdate,
     current_user=Depends(get_current_user),
@@ -407,17 +967,18 @@ async def update_ciyu(
         for key, value in payload.items():
             setattr(ciyu, key, value)
         db.commit()
+        record_write("ciyu", current_user, ciyu_id)
         db.refresh(ciyu)
         logger.info(f"用户 {current_user.username} 更新了词语: {ciyu.word}")
-        return CiyuResponse.from_orm(ciyu)
+        return ORJSONResponse(model_to_item("ciyu", ciyu))
     except Exception as e:
         db.rollback()
         logger.error(f"更新词语失败: {e}")
         raise HTTPException(status_code=500, detail="更新词语失败")
 
 
-@app.delete("/api/v1/ciyu/{ciyu_id}")
-async def delete_ciyu(
+@app.delete("/api/v1/ciyu/{ciyu_id}", response_class=ORJSONResponse, responses={200: {"model": APIResponse}})
+def delete_ciyu(
     ciyu_id: int,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -431,8 +992,9 @@ async def delete_ciyu(
     try:
         db.delete(ciyu)
         db.commit()
+        record_write("ciyu", current_user, ciyu_id)
         logger.info(f"用户 {current_user.username} 删除了词语: {ciyu.word}")
-        return APIResponse(success=True, message="词语已删除")
+        return ORJSONResponse(APIResponse(success=True, message="词语已删除").model_dump())
     except Exception as e:
         db.rollback()
         logger.error(f"删除词语失败: {e}")
@@ -443,19 +1005,16 @@ async def delete_ciyu(
 async def startup_event():
     """应用启动事件"""
     print("正在启动中文教育资源管理系统...")
-    
-    # 确保 created_by 字段存在
-    if ensure_owner_columns():
-        print("created_by 字段已准备就绪")
-    else:
-        print("警告: 无法确保 created_by 字段")
 
-    # 测试数据库连接
-    if test_connection():
-        print("数据库连接正常")
-    else:
-        print("警告: 数据库连接失败")
-    
+    # 同步接口所用线程池的大小
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+    # 开始接收其他 worker 发布的缓存失效消息
+    cache_backend.start()
+
+    # 启动时不连接数据库、不执行 DDL：表结构变更由 alembic upgrade head 在部署时执行，
+    # 数据库连接和迁移版本由 /health/ready 在首次请求时检查
+
     print(f"应用启动完成，访问地址: http://localhost:8000")
     print(f"API文档地址: http://localhost:8000/docs")
     logger.info("中文教育资源管理系统启动")
@@ -464,6 +1023,7 @@ async def startup_event():
 async def shutdown_event():
     """应用关闭事件"""
     print("中文教育资源管理系统正在关闭...")
+    cache_backend.close()
     logger.info("中文教育资源管理系统关闭")
 
 if __name__ == "__main__":
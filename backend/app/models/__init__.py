@@ -5,6 +5,7 @@ from .chengyu import Chengyu
 from .ciyu import Ciyu
 from .hanzi import Hanzi
 from .relation import ChengyuRelation, CiyuRelation, RelationType
+from .sync_state import SyncState
 from .user import User
 
 __all__ = [
@@ -14,5 +15,6 @@ __all__ = [
     "ChengyuRelation",
     "CiyuRelation",
     "RelationType",
+    "SyncState",
     "User"
 ]
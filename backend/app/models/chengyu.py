@@ -2,19 +2,28 @@
 成语模型
 定义了一个成语类，包含成语的详细信息
 """
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Boolean, Index, false
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.utils.pinyin import pinyin_index_values
 
 
 class Chengyu(Base):
     """成语模型，包含成语的详细信息"""
     __tablename__ = "hanyuguoxue_chengyu"
+    __table_args__ = (
+        # 老师的可见范围查询（is_public = 1 OR created_by = ?）按ID排序分页
+        Index("ix_hanyuguoxue_chengyu_public_id", "is_public", "id"),
+        Index("ix_hanyuguoxue_chengyu_owner_id", "created_by", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     chengyu = Column(String(50), unique=True, nullable=False, index=True, comment="成语")
     url = Column(Text, nullable=True, comment="URL链接")
     pinyin = Column(String(200), nullable=True, comment="拼音")
+    pinyin_plain = Column(String(200), nullable=True, index=True, comment="无声调紧凑拼音")
+    pinyin_initials = Column(String(50), nullable=True, index=True, comment="拼音首字母")
     zhuyin = Column(String(200), nullable=True, comment="注音")
     emotion = Column(String(50), nullable=True, comment="情感色彩")
     explanation = Column(Text, nullable=True, comment="解释")
@@ -24,10 +33,18 @@ class Chengyu(Base):
     synonyms = Column(JSON, nullable=True, comment="同义词")
     antonyms = Column(JSON, nullable=True, comment="反义词")
     translation = Column(Text, nullable=True, comment="翻译")
-    created_by = Column(String(128), nullable=True, index=True, comment="创建者用户名")
+    created_by = Column(String(128), nullable=True, comment="创建者用户名")
+    is_public = Column(Boolean, nullable=False, default=False, server_default=false(), comment="是否对所有老师可见")
     error = Column(Text, nullable=True, comment="错误信息")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="更新时间")
 
+    @validates("pinyin")
+    def _sync_pinyin_index(self, key, value):
+        """拼音变化时同步更新拼音索引列"""
+        for column, index_value in pinyin_index_values(value).items():
+            setattr(self, column, index_value)
+        return value
+
     def __repr__(self):
         return f"<Chengyu(id={self.id}, chengyu='{self.chengyu}')>"
\ No newline at end of file
@@ -1,29 +1,46 @@
 """
 词语模型
 """
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Boolean, Index, false
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.utils.pinyin import pinyin_index_values
 
 
 class Ciyu(Base):
     """词语模型，包含词语的详细信息"""
     __tablename__ = "hanyuguoxue_ciyu"
+    __table_args__ = (
+        # 老师的可见范围查询（is_public = 1 OR created_by = ?）按ID排序分页
+        Index("ix_hanyuguoxue_ciyu_public_id", "is_public", "id"),
+        Index("ix_hanyuguoxue_ciyu_owner_id", "created_by", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     word = Column(String(100), unique=True, nullable=False, index=True, comment="词语")
     url = Column(Text, nullable=True, comment="URL链接")
     pinyin = Column(String(200), nullable=True, comment="拼音")
+    pinyin_plain = Column(String(200), nullable=True, index=True, comment="无声调紧凑拼音")
+    pinyin_initials = Column(String(100), nullable=True, index=True, comment="拼音首字母")
     zhuyin = Column(String(200), nullable=True, comment="注音")
     part_of_speech = Column(String(50), nullable=True, index=True, comment="词性")
     is_common = Column(Boolean, default=False, nullable=True, comment="是否常用")
     definition = Column(Text, nullable=True, comment="定义")
     synonyms = Column(JSON, nullable=True, comment="同义词")
     antonyms = Column(JSON, nullable=True, comment="反义词")
-    created_by = Column(String(128), nullable=True, index=True, comment="创建者用户名")
+    created_by = Column(String(128), nullable=True, comment="创建者用户名")
+    is_public = Column(Boolean, nullable=False, default=False, server_default=false(), comment="是否对所有老师可见")
     error = Column(Text, nullable=True, comment="错误信息")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="更新时间")
 
+    @validates("pinyin")
+    def _sync_pinyin_index(self, key, value):
+        """拼音变化时同步更新拼音索引列"""
+        for column, index_value in pinyin_index_values(value).items():
+            setattr(self, column, index_value)
+        return value
+
     def __repr__(self):
         return f"<Ciyu(id={self.id}, word='{self.word}')>"
\ No newline at end of file
@@ -1,7 +1,10 @@
 """
 汉字模型
+七个 JSON 信息列体积很大，定义为延迟加载：查询 Hanzi 对象时默认不读取，
+需要时通过 undefer() 按列加载
 """
 from sqlalchemy import Column, Integer, String, Text, JSON, DateTime
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -14,13 +17,13 @@ class Hanzi(Base):
     character = Column(String(10), unique=True, nullable=False, index=True, comment="汉字")
     url = Column(String(500), nullable=True, comment="URL链接")
     unicode_decimal = Column(Integer, nullable=True, index=True, comment="Unicode十进制")
-    basic_info = Column(JSON, nullable=True, comment="基本信息")
-    gaishu_info = Column(JSON, nullable=True, comment="概述信息")
-    yisi_info = Column(JSON, nullable=True, comment="意思信息")
-    fanyi_info = Column(JSON, nullable=True, comment="翻译信息")
-    guoyu_info = Column(JSON, nullable=True, comment="国语信息")
-    liangan_info = Column(JSON, nullable=True, comment="两岸信息")
-    evolution_data = Column(JSON, nullable=True, comment="演变数据")
+    basic_info = deferred(Column(JSON, nullable=True, comment="基本信息"))
+    gaishu_info = deferred(Column(JSON, nullable=True, comment="概述信息"))
+    yisi_info = deferred(Column(JSON, nullable=True, comment="意思信息"))
+    fanyi_info = deferred(Column(JSON, nullable=True, comment="翻译信息"))
+    guoyu_info = deferred(Column(JSON, nullable=True, comment="国语信息"))
+    liangan_info = deferred(Column(JSON, nullable=True, comment="两岸信息"))
+    evolution_data = deferred(Column(JSON, nullable=True, comment="演变数据"))
     error = Column(Text, nullable=True, comment="错误信息")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="更新时间")
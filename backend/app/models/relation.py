@@ -1,7 +1,7 @@
 """
 关系模型
 """
-from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Enum, UniqueConstraint
 from sqlalchemy.sql import func
 from app.core.database import Base
 import enum
@@ -16,6 +16,8 @@ class RelationType(enum.Enum):
 class ChengyuRelation(Base):
     """成语关系模型"""
     __tablename__ = "chengyu_relation"
+    # 同一对条目的同一种关系只保存一次（min_id < max_id）
+    __table_args__ = (UniqueConstraint("min_id", "max_id", "relation_type", name="uq_chengyu_relation_edge"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     min_id = Column(Integer, nullable=False, index=True, comment="最小ID")
@@ -30,6 +32,8 @@ class ChengyuRelation(Base):
 class CiyuRelation(Base):
     """词语关系模型"""
     __tablename__ = "ciyu_relation"
+    # 同一对条目的同一种关系只保存一次（min_id < max_id）
+    __table_args__ = (UniqueConstraint("min_id", "max_id", "relation_type", name="uq_ciyu_relation_edge"),)
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     min_id = Column(Integer, nullable=False, index=True, comment="最小ID")
@@ -0,0 +1,25 @@
+"""
+后台同步任务进度模型
+"""
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class SyncState(Base):
+    """后台同步任务的进度，任务按ID顺序分批处理，每批与进度一起提交，中断后可从 last_id 继续"""
+    __tablename__ = "sync_state"
+
+    name = Column(String(64), primary_key=True, comment="任务名")
+    status = Column(String(16), nullable=False, default="idle", comment="状态 (idle/running/done/failed)")
+    mode = Column(String(16), nullable=True, comment="同步模式 (full/incremental)")
+    last_id = Column(Integer, nullable=False, default=0, comment="本次运行已处理到的ID")
+    since = Column(DateTime(timezone=True), nullable=True, comment="本次运行只处理该时间之后更新的行")
+    run_started_at = Column(DateTime(timezone=True), nullable=True, comment="本次运行的开始时间")
+    synced_at = Column(DateTime(timezone=True), nullable=True, comment="上次完成的运行的开始时间")
+    stats = Column(JSON, nullable=True, comment="本次运行的统计")
+    error = Column(Text, nullable=True, comment="错误信息")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    def __repr__(self):
+        return f"<SyncState(name='{self.name}', status='{self.status}', last_id={self.last_id})>"
@@ -4,6 +4,7 @@ Pydantic schemas模块
 from .user import UserLogin, UserCreate, UserResponse, Token, TokenData
 from .chengyu import ChengyuBase, ChengyuCreate, ChengyuUpdate, ChengyuResponse, ChengyuListResponse
 from .ciyu import CiyuBase, CiyuCreate, CiyuUpdate, CiyuResponse, CiyuListResponse
+from .hanzi import HanziResponse, HanziListResponse, HanziLookupResponse
 from .common import APIResponse, ErrorResponse, PaginatedResponse, SearchParams
 
 __all__ = [
@@ -28,6 +29,11 @@ __all__ = [
     "CiyuResponse", 
     "CiyuListResponse",
     
+    # Hanzi schemas
+    "HanziResponse",
+    "HanziListResponse",
+    "HanziLookupResponse",
+    
     # Common schemas
     "APIResponse",
     "ErrorResponse",
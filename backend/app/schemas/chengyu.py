@@ -41,6 +41,17 @@ class ChengyuUpdate(BaseModel):
     translation: Optional[str] = None
 
 
+
+class ChengyuBatchUpdateItem(ChengyuUpdate):
+    """批量更新中的单个成语，id 指定要更新的条目"""
+    id: int
+
+
+class ChengyuBatchUpdate(BaseModel):
+    """批量更新成语请求"""
+    items: List[ChengyuBatchUpdateItem]
+
+
 class ChengyuResponse(ChengyuBase):
     """成语响应"""
     id: int
@@ -59,4 +70,5 @@ class ChengyuListResponse(BaseModel):
     total: int
     page: int
     size: int
-    pages: int
\ No newline at end of file
+    pages: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
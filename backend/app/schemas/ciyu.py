@@ -35,6 +35,17 @@ class CiyuUpdate(BaseModel):
     antonyms: Optional[List[str]] = None
 
 
+
+class CiyuBatchUpdateItem(CiyuUpdate):
+    """批量更新中的单个词语，id 指定要更新的条目"""
+    id: int
+
+
+class CiyuBatchUpdate(BaseModel):
+    """批量更新词语请求"""
+    items: List[CiyuBatchUpdateItem]
+
+
 class CiyuResponse(CiyuBase):
     """词语响应"""
     id: int
@@ -53,4 +64,5 @@ class CiyuListResponse(BaseModel):
     total: int
     page: int
     size: int
-    pages: int
\ No newline at end of file
+    pages: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
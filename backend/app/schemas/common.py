@@ -31,6 +31,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 class SearchParams(BaseModel):
@@ -39,4 +40,14 @@ class SearchParams(BaseModel):
     page: int = 1
     size: int = 20
     sort_by: Optional[str] = None
-    order: Optional[str] = "desc"
\ No newline at end of file
+    order: Optional[str] = "desc"
+
+class BatchGetRequest(BaseModel):
+    """按ID或词条批量获取"""
+    ids: List[int] = []
+    words: List[str] = []
+
+
+class BatchDeleteRequest(BaseModel):
+    """按ID批量删除"""
+    ids: List[int]
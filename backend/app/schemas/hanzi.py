@@ -0,0 +1,39 @@
+"""
+汉字相关的Pydantic schemas
+"""
+from pydantic import BaseModel
+from typing import Optional, Any, List
+from datetime import datetime
+
+
+class HanziResponse(BaseModel):
+    """汉字响应，JSON 信息列只在 sections 中请求时返回"""
+    id: int
+    character: str
+    url: Optional[str] = None
+    unicode_decimal: Optional[int] = None
+    basic_info: Optional[Any] = None
+    gaishu_info: Optional[Any] = None
+    yisi_info: Optional[Any] = None
+    fanyi_info: Optional[Any] = None
+    guoyu_info: Optional[Any] = None
+    liangan_info: Optional[Any] = None
+    evolution_data: Optional[Any] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class HanziListResponse(BaseModel):
+    """汉字列表响应（游标分页）"""
+    items: List[HanziResponse]
+    size: int
+    next_cursor: Optional[str] = None
+
+
+class HanziLookupResponse(BaseModel):
+    """按字或 Unicode 码位查找的结果"""
+    items: List[HanziResponse]
+    missing: List[str]
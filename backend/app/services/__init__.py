@@ -0,0 +1,3 @@
+"""
+业务服务模块
+"""
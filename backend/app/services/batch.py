@@ -0,0 +1,226 @@
+"""
+成语/词语批量读写
+- 批量获取：先查详情缓存，未命中的ID和所有词条合并为一条 IN 查询；
+  结果按请求顺序输出，直接拼接各条目的JSON，缓存命中的条目不再重新序列化
+- 批量更新/删除：一条 IN 查询（加行锁）取出创建者，集中判断权限，
+  再用批量语句在同一个事务中写入，返回每个ID的处理结果
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, or_
+from sqlalchemy.orm import Session
+
+from app.services.projection import HEADWORD_FIELDS, PROJECTIONS, project_columns, resolve_fields, row_to_item
+from app.utils.http_cache import to_timestamp
+from app.utils.pinyin import pinyin_index_values
+from app.utils.response_cache import cache_detail, get_cached_detail
+from app.utils.serialization import encode_json
+
+# 单次请求最多获取的条目数
+BATCH_GET_LIMIT = 100
+
+# 单次请求最多更新/删除的条目数
+BATCH_WRITE_LIMIT = 500
+
+
+def parse_ids(raw: Optional[str]) -> List[int]:
+    """解析逗号分隔的ID列表，格式错误时抛出 ValueError"""
+    if not raw:
+        return []
+    try:
+        return [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError("ids 必须是逗号分隔的整数")
+
+
+def parse_words(raw: Optional[str]) -> List[str]:
+    """解析逗号分隔的词条列表"""
+    if not raw:
+        return []
+    return [part for part in raw.split(",")]
+
+
+def batch_get(db: Session, resource: str, ids: Iterable[int], words: Iterable[str]) -> bytes:
+    """
+    返回 {"items": [...], "missing_ids": [...], "missing_words": [...]} 的JSON
+    items 先按 ids 的顺序、再按 words 的顺序排列，同一条目只返回一次
+    """
+    ids = list(dict.fromkeys(ids))
+    words = list(dict.fromkeys(word.strip() for word in words if word.strip()))
+    if not ids and not words:
+        raise ValueError("请提供 ids 或 words")
+    if len(ids) + len(words) > BATCH_GET_LIMIT:
+        raise ValueError(f"一次最多获取 {BATCH_GET_LIMIT} 条")
+
+    model = PROJECTIONS[resource][0]
+    headword = HEADWORD_FIELDS[resource]
+    bodies = {}
+    for item_id in ids:
+        cached = get_cached_detail(resource, item_id)
+        if cached is not None:
+            bodies[item_id] = cached[0]
+
+    word_ids = {}
+    uncached_ids = [item_id for item_id in ids if item_id not in bodies]
+    conditions = []
+    if uncached_ids:
+        conditions.append(model.id.in_(uncached_ids))
+    if words:
+        conditions.append(getattr(model, headword).in_(words))
+    if conditions:
+        field_names = resolve_fields(resource)
+        query = db.query(model).with_entities(*project_columns(resource, field_names)).filter(or_(*conditions))
+        for row in query:
+            item = row_to_item(resource, row, field_names)
+            word_ids[item[headword]] = item["id"]
+            if item["id"] in bodies:
+                continue
+            body = encode_json(item)
+            cache_detail(resource, item["id"], body, to_timestamp(item["updated_at"] or item["created_at"]))
+            bodies[item["id"]] = body
+
+    ordered = []
+    seen = set()
+    for item_id in ids + [word_ids.get(word) for word in words]:
+        if item_id in bodies and item_id not in seen:
+            seen.add(item_id)
+            ordered.append(bodies[item_id])
+
+    missing_ids = [item_id for item_id in ids if item_id not in bodies]
+    missing_words = [word for word in words if word not in word_ids]
+    return b"".join((
+        b'{"items":[', b",".join(ordered), b'],"missing_ids":', encode_json(missing_ids),
+        b',"missing_words":', encode_json(missing_words), b"}",
+    ))
+
+
+def _add_row(report: Dict, item_id: int, status: str, message: Optional[str] = None) -> None:
+    row = {"id": item_id, "status": status}
+    if message:
+        row["message"] = message
+    report[status] += 1
+    report["rows"].append(row)
+
+
+def _check_owners(db: Session, model, ids: List[int], username: str, is_admin: bool, report: Dict) -> List[int]:
+    """
+    一次取出所有条目的创建者并加行锁（SQLite 会忽略 FOR UPDATE），
+    不存在或无权修改的记录到报告中，返回允许写入的ID
+    """
+    owners = dict(db.query(model.id, model.created_by).filter(model.id.in_(ids)).with_for_update().all())
+    allowed = []
+    for item_id in ids:
+        if item_id not in owners:
+            _add_row(report, item_id, "not_found", "条目不存在")
+        elif not is_admin and owners[item_id] != username:
+            _add_row(report, item_id, "forbidden", "只能修改自己创建的条目")
+        else:
+            allowed.append(item_id)
+    return allowed
+
+
+def _sort_rows(report: Dict, ids: List[int]) -> Dict:
+    """逐条结果按请求中的顺序排列"""
+    position = {item_id: index for index, item_id in enumerate(ids)}
+    report["rows"].sort(key=lambda row: position[row["id"]])
+    return report
+
+
+def _check_batch_size(count: int) -> None:
+    if not count:
+        raise ValueError("请提供要处理的条目")
+    if count > BATCH_WRITE_LIMIT:
+        raise ValueError(f"一次最多处理 {BATCH_WRITE_LIMIT} 条")
+
+
+def _headword_conflicts(db: Session, resource: str, changes: Dict[int, Dict]) -> Dict[int, str]:
+    """找出改名后与已有词条或同批其他条目重名的ID"""
+    model = PROJECTIONS[resource][0]
+    headword = HEADWORD_FIELDS[resource]
+    renamed = {item_id: values[headword] for item_id, values in changes.items() if headword in values}
+    if not renamed:
+        return {}
+    counts: Dict[str, int] = {}
+    for word in renamed.values():
+        counts[word] = counts.get(word, 0) + 1
+    column = getattr(model, headword)
+    existing = dict(db.query(column, model.id).filter(column.in_(list(counts))).all())
+
+    conflicts = {}
+    for item_id, word in renamed.items():
+        if counts[word] > 1:
+            conflicts[item_id] = f"{word} 在本次请求中重复"
+        elif existing.get(word, item_id) != item_id:
+            conflicts[item_id] = f"{word} 已存在"
+    return conflicts
+
+
+def batch_update(db: Session, resource: str, items: List[Dict], username: str, is_admin: bool = False) -> Dict:
+    """
+    批量更新，items 为 {"id": ..., 要更新的字段...}；每个条目只写入传入的字段
+    有权限且校验通过的条目在一个事务中写入，按字段组合分组后每组一条 executemany 的 UPDATE
+    """
+    _check_batch_size(len(items))
+    by_id = {item["id"]: item for item in items}
+    if len(by_id) != len(items):
+        raise ValueError("同一个 id 只能出现一次")
+    ids = list(by_id)
+
+    model = PROJECTIONS[resource][0]
+    headword = HEADWORD_FIELDS[resource]
+    report = {"total": len(ids), "updated": 0, "not_found": 0, "forbidden": 0, "failed": 0, "rows": []}
+    changes = {}
+    for item_id in _check_owners(db, model, ids, username, is_admin, report):
+        values = {name: value for name, value in by_id[item_id].items() if name != "id"}
+        if not values:
+            _add_row(report, item_id, "failed", "没有更新字段")
+            continue
+        if headword in values and not (values[headword] or "").strip():
+            _add_row(report, item_id, "failed", f"{headword} 不能为空")
+            continue
+        changes[item_id] = values
+    for item_id, message in _headword_conflicts(db, resource, changes).items():
+        del changes[item_id]
+        _add_row(report, item_id, "failed", message)
+
+    # executemany 要求同一语句的参数字段一致，因此按字段组合分组
+    groups: Dict[Tuple[str, ...], List[Dict]] = {}
+    for item_id, values in changes.items():
+        params = dict(values)
+        if "pinyin" in params:
+            params.update(pinyin_index_values(params["pinyin"]))
+        params["item_id"] = item_id
+        groups.setdefault(tuple(sorted(params)), []).append(params)
+    try:
+        for params in groups.values():
+            # 不指定 values() 时按参数名生成 SET 子句，updated_at 由列的 onupdate 更新
+            db.execute(model.__table__.update().where(model.__table__.c.id == bindparam("item_id")), params)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for item_id in changes:
+        _add_row(report, item_id, "updated")
+    return _sort_rows(report, ids)
+
+
+def batch_delete(db: Session, resource: str, ids: Iterable[int], username: str, is_admin: bool = False) -> Dict:
+    """批量删除，有权限的条目用一条 DELETE ... WHERE id IN (...) 在一个事务中删除"""
+    ids = list(dict.fromkeys(ids))
+    _check_batch_size(len(ids))
+
+    model = PROJECTIONS[resource][0]
+    report = {"total": len(ids), "deleted": 0, "not_found": 0, "forbidden": 0, "rows": []}
+    allowed = _check_owners(db, model, ids, username, is_admin, report)
+    try:
+        if allowed:
+            db.query(model).filter(model.id.in_(allowed)).delete(synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for item_id in allowed:
+        _add_row(report, item_id, "deleted")
+    return _sort_rows(report, ids)
@@ -0,0 +1,284 @@
+"""
+成语/词语批量导入
+逐行解析 JSON Lines 或 CSV，用 ChengyuCreate / CiyuCreate 校验，按批写入：
+- 每批先用一条 IN 查询找出已存在的词条，确定每行是新增、更新还是跳过
+- 再按字段组合分组，用一条 executemany 的 upsert 语句写入
+  （MySQL 为 INSERT ... ON DUPLICATE KEY UPDATE，SQLite/PostgreSQL 为 ON CONFLICT）
+- 某批写入失败时逐行重试，只把出错的行标记为失败
+更新已有词条时只写入文件中出现的字段，其余字段保持原值（与 PUT 接口一致）
+"""
+import csv
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.models.chengyu import Chengyu
+from app.models.ciyu import Ciyu
+from app.schemas.chengyu import ChengyuCreate
+from app.schemas.ciyu import CiyuCreate
+from app.services.visibility import is_public_owner
+from app.utils.pinyin import pinyin_index_values
+
+IMPORT_FORMATS = ("jsonl", "csv")
+CONFLICT_POLICIES = ("skip", "update")
+
+# 支持单条语句 upsert 的数据库，其他数据库对已存在的行逐条 UPDATE
+UPSERT_DIALECTS = ("mysql", "sqlite", "postgresql")
+
+# 资源 -> (模型, 校验用的 schema, 唯一键字段)
+IMPORT_TARGETS = {
+    "chengyu": (Chengyu, ChengyuCreate, "chengyu"),
+    "ciyu": (Ciyu, CiyuCreate, "word"),
+}
+
+# CSV 中的列表字段：JSON 数组或以 | 分隔
+LIST_FIELDS = ("synonyms", "antonyms")
+
+# 单行记录: (行号, 解析出的字段, 解析错误)
+Record = Tuple[int, Optional[Dict], Optional[str]]
+
+
+def detect_format(filename: Optional[str], fmt: Optional[str] = None) -> str:
+    """根据参数或文件扩展名确定格式，无法确定时抛出 ValueError"""
+    if fmt:
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"format 只能是 {', '.join(IMPORT_FORMATS)}")
+        return fmt
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    raise ValueError("无法根据文件名判断格式，请指定 format=jsonl 或 format=csv")
+
+
+def _parse_list(value: str) -> Optional[List[str]]:
+    value = value.strip()
+    if not value:
+        return None
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split("|") if item.strip()]
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Record]:
+    """逐行解析，不把整个文件读入内存"""
+    if fmt == "jsonl":
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield line_no, None, f"JSON 解析失败: {e}"
+                continue
+            if not isinstance(data, dict):
+                yield line_no, None, "每行必须是一个 JSON 对象"
+                continue
+            yield line_no, data, None
+        return
+
+    reader = csv.DictReader(lines)
+    for row in reader:
+        try:
+            data = {}
+            for key, value in row.items():
+                if key is None or value is None:
+                    continue
+                key = key.strip()
+                if key in LIST_FIELDS:
+                    data[key] = _parse_list(value)
+                else:
+                    data[key] = value.strip() or None
+        except ValueError as e:
+            yield reader.line_num, None, f"列表字段解析失败: {e}"
+            continue
+        yield reader.line_num, data, None
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors())
+
+
+def _upsert_statement(table, dialect: str, key: str, columns: Tuple[str, ...], on_conflict: str):
+    """生成批量写入语句，已存在的词条按 on_conflict 跳过或更新 columns 中的字段"""
+    update_columns = [name for name in columns if name not in (key, "created_by", "is_public")]
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        statement = mysql_insert(table)
+        if on_conflict == "skip" or not update_columns:
+            # 不用 INSERT IGNORE：它会把超长等错误降级为警告并截断数据
+            return statement.on_duplicate_key_update({key: statement.inserted[key]})
+        values = {name: statement.inserted[name] for name in update_columns}
+        values["updated_at"] = func.now()
+        return statement.on_duplicate_key_update(values)
+
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    statement = dialect_insert(table)
+    if on_conflict == "skip" or not update_columns:
+        return statement.on_conflict_do_nothing(index_elements=[key])
+    values = {name: statement.excluded[name] for name in update_columns}
+    values["updated_at"] = func.now()
+    return statement.on_conflict_do_update(index_elements=[key], set_=values)
+
+
+class _Importer:
+    """单次导入的状态与报告"""
+
+    def __init__(self, db: Session, resource: str, username: str, is_admin: bool, on_conflict: str):
+        self.db = db
+        self.model, self.schema, self.key = IMPORT_TARGETS[resource]
+        self.table = self.model.__table__
+        self.dialect = db.get_bind().dialect.name
+        self.username = username
+        self.is_admin = is_admin
+        self.on_conflict = on_conflict
+        self.seen = set()
+        self.report = {"total": 0, "inserted": 0, "updated": 0, "skipped": 0, "failed": 0, "rows": []}
+
+    def add_row(self, line: int, status: str, key: Optional[str] = None, message: Optional[str] = None,
+                item_id: Optional[int] = None) -> None:
+        row = {"line": line, "key": key, "status": status}
+        if message:
+            row["message"] = message
+        if item_id is not None:
+            row["id"] = item_id
+        self.report[status] += 1
+        self.report["rows"].append(row)
+
+    def validate(self, record: Record) -> Optional[Tuple[int, str, Dict]]:
+        """校验单行，返回 (行号, 唯一键, 要写入的字段)，失败或重复时记录到报告并返回 None"""
+        line, data, error = record
+        self.report["total"] += 1
+        if error:
+            self.add_row(line, "failed", message=error)
+            return None
+        try:
+            entry = self.schema(**data)
+        except ValidationError as e:
+            self.add_row(line, "failed", key=data.get(self.key), message=_format_validation_error(e))
+            return None
+
+        key = getattr(entry, self.key).strip()
+        if not key:
+            self.add_row(line, "failed", message=f"{self.key} 不能为空")
+            return None
+        if key in self.seen:
+            self.add_row(line, "skipped", key=key, message="文件中重复出现，只导入第一次")
+            return None
+        self.seen.add(key)
+
+        values = entry.model_dump(exclude_unset=True)
+        values[self.key] = key
+        if "pinyin" in values:
+            values.update(pinyin_index_values(values["pinyin"]))
+        return line, key, values
+
+    def flush(self, batch: List[Tuple[int, str, Dict]]) -> None:
+        """写入一批数据并提交"""
+        key_column = getattr(self.model, self.key)
+        keys = [key for _, key, _ in batch]
+        existing = {
+            row[0]: (row[1], row[2])
+            for row in self.db.query(key_column, self.model.id, self.model.created_by).filter(key_column.in_(keys))
+        }
+
+        planned = []
+        for line, key, values in batch:
+            if key not in existing:
+                planned.append((line, key, values, "inserted", None))
+                continue
+            item_id, owner = existing[key]
+            if self.on_conflict == "skip":
+                self.add_row(line, "skipped", key=key, message="已存在", item_id=item_id)
+            elif not self.is_admin and owner != self.username:
+                self.add_row(line, "failed", key=key, message="只能更新自己创建的条目", item_id=item_id)
+            else:
+                planned.append((line, key, values, "updated", item_id))
+        if not planned:
+            return
+
+        try:
+            self._write(planned)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self._write_one_by_one(planned)
+            return
+        for line, key, _, status, item_id in planned:
+            self.add_row(line, status, key=key, item_id=item_id)
+
+    def _write(self, planned) -> None:
+        upsert = self.dialect in UPSERT_DIALECTS
+        # executemany 要求同一语句的参数字段一致，因此按字段组合分组
+        groups: Dict[Tuple[str, ...], List[Dict]] = {}
+        for _, _, values, status, item_id in planned:
+            if status == "updated" and not upsert:
+                self.db.execute(
+                    self.table.update().where(self.table.c.id == item_id).values(**values, updated_at=func.now())
+                )
+                continue
+            params = dict(values)
+            if status == "inserted":
+                params["created_by"] = self.username
+                params["is_public"] = is_public_owner(self.username, self.is_admin)
+            groups.setdefault(tuple(sorted(params)), []).append(params)
+
+        for columns, params in groups.items():
+            if upsert:
+                statement = _upsert_statement(self.table, self.dialect, self.key, columns, self.on_conflict)
+            else:
+                statement = insert(self.table)
+            self.db.execute(statement, params)
+
+    def _write_one_by_one(self, planned) -> None:
+        for entry in planned:
+            line, key, _, status, item_id = entry
+            try:
+                self._write([entry])
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                self.add_row(line, "failed", key=key, message=str(getattr(e, "orig", e)), item_id=item_id)
+                continue
+            self.add_row(line, status, key=key, item_id=item_id)
+
+
+def import_entries(
+    db: Session,
+    resource: str,
+    records: Iterable[Record],
+    username: str,
+    is_admin: bool = False,
+    on_conflict: str = "skip",
+    batch_size: int = 1000,
+) -> Dict:
+    """
+    批量导入成语/词语，返回汇总和逐行报告
+    on_conflict=skip 跳过已存在的词条，update 更新已存在的词条（非管理员只能更新自己创建的）
+    """
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"on_conflict 只能是 {', '.join(CONFLICT_POLICIES)}")
+
+    importer = _Importer(db, resource, username, is_admin, on_conflict)
+    batch = []
+    for record in records:
+        validated = importer.validate(record)
+        if validated is None:
+            continue
+        batch.append(validated)
+        if len(batch) >= batch_size:
+            importer.flush(batch)
+            batch = []
+    if batch:
+        importer.flush(batch)
+
+    importer.report["rows"].sort(key=lambda row: row["line"])
+    return importer.report
@@ -0,0 +1,266 @@
+"""
+汉字 -> 成语/词语 倒排索引
+每个汉字对应一个升序的ID数组（posting list），"含有马和牛的成语"这类查询
+在内存中对各字的 posting list 按ID降序惰性求交集，取够一页即停止，不再对词条做 LIKE '%马%' 全表扫描。
+
+索引在第一次查询时从主库构建（只读取 id 和词条两列），之后通过缓存后端的写入事件增量维护：
+写接口发布的事件带有被修改的ID，下次查询前用一条 IN 查询重新读取这些条目；
+修改范围未知的写入（如批量导入新增）会让该资源的索引在下次查询时重建。
+收不到写入事件时（进程内缓存下的其他 worker、SQL 脚本、爬虫），每隔 check_seconds 秒用一条聚合查询
+核对条目数、最大ID和最后修改时间，有变化时重新读取最近修改过的条目，条目数仍不一致（有删除）时重建
+"""
+import bisect
+import re
+import threading
+import time
+from array import array
+from datetime import timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.services.projection import HEADWORD_FIELDS, PROJECTIONS
+from app.utils.pagination import encode_cursor
+
+# 一次查询最多的汉字数
+MAX_QUERY_CHARS = 8
+
+# 按候选ID分段回表时每段的最大ID数
+FETCH_CHUNK_SIZE = 500
+
+_CJK_CHAR = re.compile(r"[\u3400-\u9fff\U00020000-\U0002ffff]")
+
+
+def split_characters(text: str) -> List[str]:
+    """按出现顺序返回文本中不重复的汉字"""
+    return list(dict.fromkeys(_CJK_CHAR.findall(text or "")))
+
+
+def _contains(posting: array, item_id: int) -> bool:
+    index = bisect.bisect_left(posting, item_id)
+    return index < len(posting) and posting[index] == item_id
+
+
+class _Postings:
+    """单个资源的倒排表，同时保存每个ID的词条，用于修改或删除时移除旧的汉字"""
+
+    def __init__(self):
+        self.lists: Dict[str, array] = {}
+        self.headwords: Dict[int, str] = {}
+        # 上次核对时数据库中的 (条目数, 最大ID, 最后修改时间)
+        self.fingerprint: Optional[Tuple] = None
+        self.checked_at = 0.0
+
+    def add(self, item_id: int, headword: str) -> None:
+        self.headwords[item_id] = headword
+        for char in split_characters(headword):
+            posting = self.lists.setdefault(char, array("q"))
+            if not posting or posting[-1] < item_id:
+                posting.append(item_id)
+            elif not _contains(posting, item_id):
+                posting.insert(bisect.bisect_left(posting, item_id), item_id)
+
+    def remove(self, item_id: int) -> None:
+        headword = self.headwords.pop(item_id, None)
+        if headword is None:
+            return
+        for char in split_characters(headword):
+            posting = self.lists.get(char)
+            if posting is not None and _contains(posting, item_id):
+                del posting[bisect.bisect_left(posting, item_id)]
+                if not posting:
+                    del self.lists[char]
+
+    def snapshot(self, chars: List[str]) -> List[array]:
+        """复制各汉字的 posting list（按长度升序），任一汉字没有条目时返回空列表"""
+        postings = [self.lists.get(char) for char in chars]
+        if not postings or any(posting is None for posting in postings):
+            return []
+        # 复制一份，调用方在锁外求交集时不受后续增量更新影响
+        return sorted((posting[:] for posting in postings), key=len)
+
+
+class CharacterIndex:
+    """成语/词语的汉字倒排索引，线程安全"""
+
+    def __init__(self, open_session: Callable[[], Session], check_seconds: float = 0):
+        self._open_session = open_session
+        self._check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Optional[_Postings]] = {resource: None for resource in HEADWORD_FIELDS}
+        self._pending: Dict[str, Set[int]] = {resource: set() for resource in HEADWORD_FIELDS}
+        self._rebuilds = 0
+        self._checks = 0
+
+    def handle_write_event(self, message: Dict) -> None:
+        """缓存后端的写入事件：记录待刷新的ID，修改范围未知时丢弃索引"""
+        resource = message.get("resource")
+        if message.get("event") != "write" or resource not in self._postings:
+            return
+        ids = message.get("ids")
+        with self._lock:
+            if ids:
+                self._pending[resource].update(ids)
+            else:
+                self._postings[resource] = None
+
+    def postings(self, resource: str, chars: List[str]) -> List[array]:
+        """chars 中各汉字的 posting list 快照，交给 iter_matches 求交集"""
+        with self._lock:
+            return self._ensure(resource).snapshot(chars)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rebuilds": self._rebuilds,
+                "checks": self._checks,
+                **{
+                    resource: None if postings is None else {
+                        "entries": len(postings.headwords),
+                        "characters": len(postings.lists),
+                        "pending": len(self._pending[resource]),
+                    }
+                    for resource, postings in self._postings.items()
+                },
+            }
+
+    def _ensure(self, resource: str) -> _Postings:
+        """需持有锁调用：索引不存在时构建，超过核对间隔时核对数据库，然后应用待刷新的ID"""
+        postings = self._postings[resource]
+        pending = self._pending[resource]
+        if postings is not None and self._check_seconds and time.monotonic() - postings.checked_at > self._check_seconds:
+            postings = self._check(resource, postings)
+        if postings is None:
+            postings = self._build(resource)
+            self._postings[resource] = postings
+            self._rebuilds += 1
+        if pending:
+            self._refresh(resource, postings, list(pending))
+            pending.clear()
+        return postings
+
+    def _fingerprint(self, db: Session, resource: str) -> Tuple:
+        model = PROJECTIONS[resource][0]
+        return tuple(db.query(func.count(model.id), func.max(model.id), func.max(model.updated_at)).one())
+
+    def _check(self, resource: str, postings: _Postings) -> Optional[_Postings]:
+        """
+        需持有锁调用：数据库有变化时把上次核对后修改过的条目加入待刷新的ID；
+        应用后条目数仍与数据库不一致（有删除，或写入时未更新 updated_at）时返回 None 触发重建
+        """
+        self._checks += 1
+        model = PROJECTIONS[resource][0]
+        db = self._open_session()
+        try:
+            fingerprint = self._fingerprint(db, resource)
+            if fingerprint == postings.fingerprint:
+                postings.checked_at = time.monotonic()
+                return postings
+            last_modified = postings.fingerprint[2] if postings.fingerprint else None
+            changed = db.query(model.id)
+            if last_modified is not None:
+                # 放宽一秒：updated_at 精度可能只到秒，同一秒内稍后的修改不能漏掉，多读几行无妨
+                changed = changed.filter(model.updated_at >= last_modified - timedelta(seconds=1))
+            changed_ids = [item_id for item_id, in changed]
+        finally:
+            db.close()
+        self._refresh(resource, postings, changed_ids)
+        if len(postings.headwords) != fingerprint[0]:
+            return None
+        postings.fingerprint = fingerprint
+        postings.checked_at = time.monotonic()
+        return postings
+
+    def _build(self, resource: str) -> _Postings:
+        model = PROJECTIONS[resource][0]
+        headword = getattr(model, HEADWORD_FIELDS[resource])
+        postings = _Postings()
+        db = self._open_session()
+        try:
+            # 先记录核对基准：构建期间的写入会在下次核对时补上
+            postings.fingerprint = self._fingerprint(db, resource)
+            postings.checked_at = time.monotonic()
+            rows = db.query(model.id, headword).order_by(model.id).execution_options(yield_per=5000)
+            for item_id, word in rows:
+                postings.add(item_id, word)
+        finally:
+            db.close()
+        return postings
+
+    def _refresh(self, resource: str, postings: _Postings, ids: List[int]) -> None:
+        """重新读取被修改的条目：已删除的只移除，其余先移除旧词条再按新词条加入"""
+        model = PROJECTIONS[resource][0]
+        headword = getattr(model, HEADWORD_FIELDS[resource])
+        db = self._open_session()
+        try:
+            current = {}
+            for start in range(0, len(ids), FETCH_CHUNK_SIZE):
+                chunk = ids[start:start + FETCH_CHUNK_SIZE]
+                current.update(db.query(model.id, headword).filter(model.id.in_(chunk)).all())
+        finally:
+            db.close()
+        for item_id in ids:
+            postings.remove(item_id)
+            if item_id in current:
+                postings.add(item_id, current[item_id])
+
+
+def parse_query_characters(chars: Optional[str]) -> List[str]:
+    """解析要查询的汉字，无效时抛出 ValueError"""
+    parsed = split_characters(chars or "")
+    if not parsed:
+        raise ValueError("chars 中至少要包含一个汉字")
+    if len(parsed) > MAX_QUERY_CHARS:
+        raise ValueError(f"一次最多查询 {MAX_QUERY_CHARS} 个汉字")
+    return parsed
+
+
+def iter_matches(postings: List[array], before_id: Optional[int] = None) -> Iterator[int]:
+    """
+    按ID降序逐个产生同时出现在所有 posting list 中的ID（未做权限过滤）
+    从最短的列表倒序遍历，在其余列表中二分查找；惰性求交集，取够一页即可停止
+    """
+    if not postings:
+        return
+    first, rest = postings[0], postings[1:]
+    end = bisect.bisect_left(first, before_id) if before_id is not None else len(first)
+    for index in range(end - 1, -1, -1):
+        item_id = first[index]
+        if all(_contains(posting, item_id) for posting in rest):
+            yield item_id
+
+
+def fetch_candidates_page(query: Query, resource: str, matches: Iterator[int], size: int):
+    """
+    从按ID降序的候选ID中取出一页；query 需已做权限过滤和列投影
+    候选ID分段回表：第一段只取一页所需的ID，被权限过滤掉的行由后续逐段加倍的分段补齐，
+    返回 (当前页数据, 下一页游标)
+    """
+    model = PROJECTIONS[resource][0]
+    rows = []
+    # 多取一条用于判断是否还有下一页
+    chunk_size = size + 1
+    while len(rows) <= size:
+        chunk = list(islice(matches, chunk_size))
+        if not chunk:
+            break
+        rows.extend(
+            query.filter(model.id.in_(chunk)).order_by(model.id.desc()).limit(size + 1 - len(rows)).all()
+        )
+        chunk_size = min(chunk_size * 2, FETCH_CHUNK_SIZE)
+    has_more = len(rows) > size
+    rows = rows[:size]
+    next_cursor = encode_cursor(rows[-1].id) if has_more and rows else None
+    return rows, next_cursor
+
+
+def _open_primary_session() -> Session:
+    # 在函数内导入，避免导入本模块时就创建数据库引擎
+    from app.core.database import SessionLocal
+    return SessionLocal()
+
+
+character_index = CharacterIndex(_open_primary_session, check_seconds=settings.CHAR_INDEX_CHECK_SECONDS)
@@ -0,0 +1,176 @@
+"""
+成语/词语/汉字批量导出
+通过 yield_per 使用服务端游标分批读取（MySQL 下不会一次把整表读入客户端内存），
+每批编码后立即输出，支持 NDJSON、CSV 和 Parquet（需要安装 pyarrow）
+"""
+import csv
+import io
+from typing import Callable, Dict, Iterator, List, Sequence
+
+import orjson
+from sqlalchemy import JSON, Boolean, DateTime, Integer
+from sqlalchemy.orm import Query, Session
+
+from app.models.chengyu import Chengyu
+from app.models.ciyu import Ciyu
+from app.models.hanzi import Hanzi
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_TARGETS = {"chengyu": Chengyu, "ciyu": Ciyu, "hanzi": Hanzi}
+
+# 只供内部使用、不导出的列（拼音索引列和 is_public 由其他字段推导，导入时重新计算）
+INTERNAL_COLUMNS = ("pinyin_plain", "pinyin_initials", "is_public", "error")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def export_columns(model) -> List:
+    """导出的列（按表定义顺序）"""
+    return [column for column in model.__table__.columns if column.name not in INTERNAL_COLUMNS]
+
+
+def iter_batches(db: Session, query: Query, model, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Sequence]:
+    """按 ID 顺序分批读取，每批为一组行元组"""
+    statement = query.with_entities(*export_columns(model)).order_by(model.id).statement
+    result = db.execute(statement.execution_options(yield_per=batch_size))
+    yield from result.partitions()
+
+
+def _ndjson_chunks(names: List[str], batches: Iterator[Sequence]) -> Iterator[bytes]:
+    for rows in batches:
+        yield b"".join(orjson.dumps(dict(zip(names, row))) + b"\n" for row in rows)
+
+
+def _csv_value(value):
+    if isinstance(value, (list, dict)):
+        return orjson.dumps(value).decode("utf-8")
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunks(names: List[str], batches: Iterator[Sequence]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # 带 BOM，Excel 打开时才能正确识别 UTF-8 中文
+    buffer.write("\ufeff")
+    writer.writerow(names)
+    for rows in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """ParquetWriter 的输出目标，每写完一个行组就取出已写入的字节"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _parquet_schema(columns):
+    import pyarrow as pa
+
+    fields = []
+    for column in columns:
+        if isinstance(column.type, JSON):
+            arrow_type = pa.string()
+        elif isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _parquet_chunks(columns, batches: Iterator[Sequence]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(columns)
+    json_indexes = [index for index, column in enumerate(columns) if isinstance(column.type, JSON)]
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in batches:
+            # 每批写成一个行组；JSON 列以 JSON 字符串保存
+            data = [list(values) for values in zip(*rows)]
+            for index in json_indexes:
+                data[index] = [None if value is None else orjson.dumps(value).decode("utf-8") for value in data[index]]
+            writer.write_table(pa.Table.from_arrays(data, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def check_format(fmt: str) -> None:
+    """检查导出格式，不支持时抛出 ValueError"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format 只能是 {', '.join(EXPORT_FORMATS)}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("导出 Parquet 需要安装 pyarrow: uv sync --extra parquet")
+
+
+def stream_export(
+    open_session: Callable[[], Session],
+    build_query: Callable[[Session], Query],
+    resource: str,
+    fmt: str,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    生成导出文件的内容
+    使用独立的会话（而不是请求依赖注入的会话），导出期间一直持有，遍历结束或客户端断开时关闭
+    """
+    model = EXPORT_TARGETS[resource]
+    columns = export_columns(model)
+    names = [column.name for column in columns]
+    db = open_session()
+    try:
+        batches = iter_batches(db, build_query(db), model, batch_size)
+        if fmt == "ndjson":
+            yield from _ndjson_chunks(names, batches)
+        elif fmt == "csv":
+            yield from _csv_chunks(names, batches)
+        else:
+            yield from _parquet_chunks(columns, batches)
+    finally:
+        db.close()
+
+
+def export_filename(resource: str, fmt: str) -> str:
+    return f"{EXPORT_TARGETS[resource].__tablename__}.{fmt}"
+
+
+def export_headers(resource: str, fmt: str) -> Dict[str, str]:
+    """下载用的响应头"""
+    return {"Content-Disposition": f'attachment; filename="{export_filename(resource, fmt)}"'}
@@ -0,0 +1,92 @@
+"""
+汉字查询
+JSON 信息列在模型中定义为延迟加载，只有 sections 中请求的列才用 undefer() 读出；
+按字查找走 character 唯一索引，按码位查找走 unicode_decimal 索引
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Query, Session, undefer
+
+from app.models.hanzi import Hanzi
+
+# sections 参数 -> JSON 信息列
+HANZI_SECTIONS = {
+    "basic": "basic_info",
+    "gaishu": "gaishu_info",
+    "yisi": "yisi_info",
+    "fanyi": "fanyi_info",
+    "guoyu": "guoyu_info",
+    "liangan": "liangan_info",
+    "evolution": "evolution_data",
+}
+
+# 始终返回的字段
+HANZI_BASE_FIELDS = ("id", "character", "url", "unicode_decimal", "created_at", "updated_at")
+
+# 单次查找最多的字数
+HANZI_LOOKUP_LIMIT = 100
+
+
+def parse_sections(raw: Optional[str]) -> List[str]:
+    """解析逗号分隔的 sections，all 表示全部；无效值抛出 ValueError"""
+    if not raw:
+        return []
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    if "all" in requested:
+        return list(HANZI_SECTIONS)
+    unknown = [name for name in requested if name not in HANZI_SECTIONS]
+    if unknown:
+        raise ValueError(f"未知的 sections: {', '.join(unknown)}，可选值: {', '.join(HANZI_SECTIONS)}, all")
+    return list(dict.fromkeys(requested))
+
+
+def hanzi_query(db: Session, sections: Iterable[str]) -> Query:
+    """只额外加载请求的 JSON 信息列"""
+    return db.query(Hanzi).options(*[undefer(getattr(Hanzi, HANZI_SECTIONS[name])) for name in sections])
+
+
+def hanzi_to_item(hanzi: Hanzi, sections: Iterable[str]) -> Dict:
+    item = {name: getattr(hanzi, name) for name in HANZI_BASE_FIELDS}
+    for name in sections:
+        column = HANZI_SECTIONS[name]
+        item[column] = getattr(hanzi, column)
+    return item
+
+
+def parse_lookup(chars: Optional[str], unicode: Optional[str]) -> Tuple[List[str], List[int]]:
+    """
+    解析查找参数：chars 中的每个字（忽略逗号和空白），unicode 为逗号分隔的十进制码位
+    返回 (字列表, 码位列表)，参数无效时抛出 ValueError
+    """
+    characters = list(dict.fromkeys(char for char in (chars or "") if not char.isspace() and char != ","))
+    try:
+        codes = list(dict.fromkeys(int(part) for part in (unicode or "").split(",") if part.strip()))
+    except ValueError:
+        raise ValueError("unicode 必须是逗号分隔的十进制码位")
+    if not characters and not codes:
+        raise ValueError("请提供 chars 或 unicode")
+    if len(characters) + len(codes) > HANZI_LOOKUP_LIMIT:
+        raise ValueError(f"一次最多查找 {HANZI_LOOKUP_LIMIT} 个字")
+    return characters, codes
+
+
+def lookup_hanzi(db: Session, characters: List[str], codes: List[int], sections: List[str]) -> Dict:
+    """按字和码位查找，每类一条 IN 查询；结果按请求顺序排列，未找到的放入 missing"""
+    found: Dict[str, Hanzi] = {}
+    by_code: Dict[int, Hanzi] = {}
+    if characters:
+        for hanzi in hanzi_query(db, sections).filter(Hanzi.character.in_(characters)):
+            found[hanzi.character] = hanzi
+    if codes:
+        for hanzi in hanzi_query(db, sections).filter(Hanzi.unicode_decimal.in_(codes)):
+            by_code[hanzi.unicode_decimal] = hanzi
+
+    items, seen, missing = [], set(), []
+    ordered = [(char, found.get(char)) for char in characters] + [(str(code), by_code.get(code)) for code in codes]
+    for key, hanzi in ordered:
+        if hanzi is None:
+            missing.append(key)
+        elif hanzi.id not in seen:
+            seen.add(hanzi.id)
+            items.append(hanzi_to_item(hanzi, sections))
+    return {"items": items, "missing": missing}
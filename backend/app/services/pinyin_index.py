@@ -0,0 +1,52 @@
+"""
+拼音索引列批量回填
+"""
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.utils.pinyin import pinyin_index_values
+
+
+def backfill_pinyin_index(db: Session, model, batch_size: int = 1000, only_missing: bool = True) -> int:
+    """
+    按ID顺序分批计算并写回 pinyin_plain / pinyin_initials
+    每批一次 executemany 更新并提交，可随时中断后重新执行；
+    保持 updated_at 不变，避免回填被当作内容修改
+    返回处理的行数
+    """
+    table = model.__table__
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(
+            pinyin_plain=bindparam("plain"),
+            pinyin_initials=bindparam("initials"),
+            updated_at=table.c.updated_at,
+        )
+    )
+
+    last_id = 0
+    processed = 0
+    while True:
+        query = db.query(model.id, model.pinyin).filter(model.id > last_id)
+        if only_missing:
+            query = query.filter(model.pinyin.isnot(None), model.pinyin_plain.is_(None))
+        rows = query.order_by(model.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            values = pinyin_index_values(row.pinyin)
+            params.append({
+                "row_id": row.id,
+                "plain": values["pinyin_plain"],
+                "initials": values["pinyin_initials"],
+            })
+        db.execute(statement, params)
+        db.commit()
+
+        last_id = rows[-1].id
+        processed += len(rows)
+
+    return processed
@@ -0,0 +1,85 @@
+"""
+列表字段投影
+- view=full: 返回全部字段（默认，与之前的列表响应一致）
+- view=summary: 只返回列表页展示所需的字段，长文本在 SQL 中截断
+- fields=a,b,c: 指定返回字段，id 总是返回
+只查询需要的列，大段 Text/JSON 列不再随列表查询读出
+"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+
+from app.models.chengyu import Chengyu
+from app.models.ciyu import Ciyu
+
+LIST_VIEWS = ("full", "summary")
+
+# 资源的词条字段
+HEADWORD_FIELDS = {"chengyu": "chengyu", "ciyu": "word"}
+
+# 摘要视图中长文本保留的字数
+SUMMARY_TEXT_LENGTH = 60
+
+# 资源 -> (模型, 全部字段, 摘要字段, 摘要中截断的字段)
+PROJECTIONS = {
+    "chengyu": (
+        Chengyu,
+        ("id", "chengyu", "url", "pinyin", "zhuyin", "emotion", "explanation", "source", "usage", "example",
+         "synonyms", "antonyms", "translation", "created_by", "created_at", "updated_at"),
+        ("id", "chengyu", "pinyin", "emotion", "explanation", "created_by", "updated_at"),
+        ("explanation",),
+    ),
+    "ciyu": (
+        Ciyu,
+        ("id", "word", "url", "pinyin", "zhuyin", "part_of_speech", "is_common", "definition",
+         "synonyms", "antonyms", "created_by", "created_at", "updated_at"),
+        ("id", "word", "pinyin", "part_of_speech", "is_common", "definition", "created_by", "updated_at"),
+        ("definition",),
+    ),
+}
+
+
+def resolve_fields(resource: str, view: str = "full", fields: Optional[str] = None) -> List[str]:
+    """确定返回字段：指定了 fields 时按其顺序返回，否则使用视图的默认字段；参数无效时抛出 ValueError"""
+    if view not in LIST_VIEWS:
+        raise ValueError(f"view 只能是 {', '.join(LIST_VIEWS)}")
+    _, full_fields, summary_fields, _ = PROJECTIONS[resource]
+    if not fields:
+        return list(summary_fields if view == "summary" else full_fields)
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in full_fields]
+    if unknown:
+        raise ValueError(f"未知字段: {', '.join(unknown)}")
+    return ["id"] + [name for name in dict.fromkeys(requested) if name != "id"]
+
+
+def project_columns(resource: str, field_names: Sequence[str], truncate: bool = False) -> list:
+    """
+    生成要查询的列；truncate 为 True 时长文本列只读取前 SUMMARY_TEXT_LENGTH + 1 个字符
+    （多取一个字符用于判断是否被截断）
+    """
+    model, _, _, truncated_fields = PROJECTIONS[resource]
+    columns = []
+    for name in field_names:
+        column = getattr(model, name)
+        if truncate and name in truncated_fields:
+            column = func.substr(column, 1, SUMMARY_TEXT_LENGTH + 1).label(name)
+        columns.append(column)
+    return columns
+
+
+def row_to_item(resource: str, row, field_names: Sequence[str], truncate: bool = False) -> Dict:
+    """将查询结果行（列顺序与 field_names 一致）转为响应字典，被截断的文本以省略号结尾"""
+    item = dict(zip(field_names, row))
+    if truncate:
+        for name in PROJECTIONS[resource][3]:
+            value = item.get(name)
+            if value and len(value) > SUMMARY_TEXT_LENGTH:
+                item[name] = value[:SUMMARY_TEXT_LENGTH] + "…"
+    return item
+
+
+def model_to_item(resource: str, obj) -> Dict:
+    """将 ORM 对象转为包含全部字段的响应字典（写接口返回刚提交的数据时使用）"""
+    return {name: getattr(obj, name) for name in PROJECTIONS[resource][1]}
@@ -0,0 +1,246 @@
+"""
+成语/词语关系图
+把 chengyu_relation / ciyu_relation 的边（min_id, max_id, relation_type）按关系类型加载为
+CSR（压缩稀疏行）结构：offsets[id] 到 offsets[id + 1] 是该条目的邻居在 targets 数组中的区间，
+查询邻居只是一次数组切片，多跳近义词扩展为内存中的广度优先遍历。
+
+图在第一次查询时从主库构建。关系表变化后发布 relations 事件（带有端点ID），
+下次查询前只重新读取涉及这些条目的边，以覆盖表的形式替换它们的邻居；
+覆盖的条目过多或事件不带ID时整张图重建
+"""
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.relation import ChengyuRelation, CiyuRelation, RelationType
+
+RELATION_MODELS = {"chengyu": ChengyuRelation, "ciyu": CiyuRelation}
+RELATION_TYPES = tuple(relation_type.value for relation_type in RelationType)
+
+MAX_EXPAND_HOPS = 3
+MAX_EXPAND_RESULTS = 200
+
+# 增量覆盖的条目数超过该值时重建整张图
+OVERLAY_REBUILD_THRESHOLD = 5000
+
+# 按ID读取边时每条 IN 查询的最大ID数
+FETCH_CHUNK_SIZE = 500
+
+Edge = Tuple[int, int, str]
+
+
+class _CSR:
+    """单一关系类型的邻接表（无向图，每条边在两个端点下各存一次，邻居按ID升序）"""
+
+    def __init__(self, offsets: array, targets: array):
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_pairs(cls, pairs: Set[Tuple[int, int]]) -> "_CSR":
+        size = max((max_id for _, max_id in pairs), default=-1) + 1
+        # 先统计度数，前缀和即为各行起点
+        counts = [0] * (size + 1)
+        for min_id, max_id in pairs:
+            counts[min_id + 1] += 1
+            counts[max_id + 1] += 1
+        for index in range(1, size + 1):
+            counts[index] += counts[index - 1]
+
+        targets = array("q", bytes(8 * counts[-1]))
+        cursor = counts[:-1]
+        for min_id, max_id in pairs:
+            targets[cursor[min_id]] = max_id
+            cursor[min_id] += 1
+            targets[cursor[max_id]] = min_id
+            cursor[max_id] += 1
+        for node in range(size):
+            start, end = counts[node], counts[node + 1]
+            if end - start > 1:
+                targets[start:end] = array("q", sorted(targets[start:end]))
+        return cls(array("q", counts), targets)
+
+    def neighbours(self, node: int) -> Sequence[int]:
+        if node < 0 or node + 1 >= len(self.offsets):
+            return ()
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def edge_count(self) -> int:
+        return len(self.targets) // 2
+
+
+class _Graph:
+    """单个资源的关系图：CSR 加上增量刷新后的覆盖表（条目 -> 各关系类型的完整邻居）"""
+
+    def __init__(self, edges: Iterable[Edge]):
+        pairs: Dict[str, Set[Tuple[int, int]]] = {relation_type: set() for relation_type in RELATION_TYPES}
+        for min_id, max_id, relation_type in edges:
+            if min_id != max_id:
+                pairs[relation_type].add((min(min_id, max_id), max(min_id, max_id)))
+        self.csr = {relation_type: _CSR.from_pairs(edge_pairs) for relation_type, edge_pairs in pairs.items()}
+        self.overlay: Dict[int, Dict[str, Tuple[int, ...]]] = {}
+
+    def neighbours(self, node: int, relation_type: str) -> Sequence[int]:
+        overridden = self.overlay.get(node)
+        if overridden is not None:
+            return overridden[relation_type]
+        return self.csr[relation_type].neighbours(node)
+
+    def all_neighbours(self, node: int) -> Set[int]:
+        return {other for relation_type in RELATION_TYPES for other in self.neighbours(node, relation_type)}
+
+    def override(self, nodes: Set[int], edges: Iterable[Edge]) -> None:
+        """用读出的边替换 nodes 的邻居，edges 需包含与 nodes 相连的全部边"""
+        adjacency = {node: {relation_type: set() for relation_type in RELATION_TYPES} for node in nodes}
+        for min_id, max_id, relation_type in edges:
+            if min_id == max_id:
+                continue
+            if min_id in adjacency:
+                adjacency[min_id][relation_type].add(max_id)
+            if max_id in adjacency:
+                adjacency[max_id][relation_type].add(min_id)
+        for node, neighbours in adjacency.items():
+            self.overlay[node] = {relation_type: tuple(sorted(ids)) for relation_type, ids in neighbours.items()}
+
+
+def _edge_rows(query) -> Iterable[Edge]:
+    for min_id, max_id, relation_type in query:
+        yield min_id, max_id, relation_type.value
+
+
+class RelationGraph:
+    """成语/词语关系图，线程安全"""
+
+    def __init__(self, open_session: Callable[[], Session]):
+        self._open_session = open_session
+        self._lock = threading.Lock()
+        self._graphs: Dict[str, Optional[_Graph]] = {resource: None for resource in RELATION_MODELS}
+        self._pending: Dict[str, Set[int]] = {resource: set() for resource in RELATION_MODELS}
+        self._rebuilds = 0
+
+    def handle_relation_event(self, message: Dict) -> None:
+        """缓存后端的 relations 事件：记录关系有变化的条目，不带ID时丢弃整张图"""
+        resource = message.get("resource")
+        if message.get("event") != "relations" or resource not in self._graphs:
+            return
+        ids = message.get("ids")
+        with self._lock:
+            if ids:
+                self._pending[resource].update(ids)
+            else:
+                self._graphs[resource] = None
+
+    def neighbours(self, resource: str, item_id: int) -> Dict[str, List[int]]:
+        """条目的直接关系，按关系类型分组"""
+        with self._lock:
+            graph = self._ensure(resource)
+            return {relation_type: list(graph.neighbours(item_id, relation_type)) for relation_type in RELATION_TYPES}
+
+    def expand(self, resource: str, item_id: int, relation_type: str = "synonym", hops: int = 2,
+               limit: int = MAX_EXPAND_RESULTS) -> List[Tuple[int, int]]:
+        """
+        沿同一种关系广度优先扩展 hops 跳，返回 [(条目ID, 跳数)]，按跳数由近到远，不含起点
+        参数无效时抛出 ValueError
+        """
+        if relation_type not in RELATION_TYPES:
+            raise ValueError(f"type 只能是 {', '.join(RELATION_TYPES)}")
+        if not 1 <= hops <= MAX_EXPAND_HOPS:
+            raise ValueError(f"hops 必须在 1 到 {MAX_EXPAND_HOPS} 之间")
+        limit = max(1, min(limit, MAX_EXPAND_RESULTS))
+
+        with self._lock:
+            graph = self._ensure(resource)
+            seen = {item_id}
+            frontier = [item_id]
+            result = []
+            for depth in range(1, hops + 1):
+                next_frontier = []
+                for node in frontier:
+                    for other in graph.neighbours(node, relation_type):
+                        if other in seen:
+                            continue
+                        seen.add(other)
+                        next_frontier.append(other)
+                        result.append((other, depth))
+                        if len(result) >= limit:
+                            return result
+                frontier = sorted(next_frontier)
+            return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "rebuilds": self._rebuilds,
+                **{
+                    resource: None if graph is None else {
+                        **{relation_type: csr.edge_count() for relation_type, csr in graph.csr.items()},
+                        "overlay": len(graph.overlay),
+                        "pending": len(self._pending[resource]),
+                    }
+                    for resource, graph in self._graphs.items()
+                },
+            }
+
+    def _ensure(self, resource: str) -> _Graph:
+        """需持有锁调用：图不存在或覆盖表过大时重建，然后应用待刷新的条目"""
+        graph = self._graphs[resource]
+        pending = self._pending[resource]
+        if graph is not None and len(graph.overlay) + len(pending) > OVERLAY_REBUILD_THRESHOLD:
+            graph = None
+        if graph is None:
+            graph = self._build(resource)
+            self._graphs[resource] = graph
+            self._rebuilds += 1
+        if pending:
+            self._refresh(resource, graph, set(pending))
+            pending.clear()
+        return graph
+
+    def _build(self, resource: str) -> _Graph:
+        model = RELATION_MODELS[resource]
+        db = self._open_session()
+        try:
+            query = db.query(model.min_id, model.max_id, model.relation_type).execution_options(yield_per=10000)
+            return _Graph(_edge_rows(query))
+        finally:
+            db.close()
+
+    def _refresh(self, resource: str, graph: _Graph, ids: Set[int]) -> None:
+        """
+        边 (a, b) 变化时 a、b 至少有一个在 ids 中，另一个是它原来或现在的邻居；
+        因此先读出与 ids 相连的边得到新邻居，加上图中的旧邻居，再读出与这些条目相连的边整体覆盖
+        """
+        db = self._open_session()
+        try:
+            affected = set(ids)
+            for min_id, max_id, _ in self._edges_touching(db, resource, ids):
+                affected.update((min_id, max_id))
+            for node in ids:
+                affected.update(graph.all_neighbours(node))
+            graph.override(affected, self._edges_touching(db, resource, affected))
+        finally:
+            db.close()
+
+    def _edges_touching(self, db: Session, resource: str, ids: Set[int]) -> List[Edge]:
+        model = RELATION_MODELS[resource]
+        ids = sorted(ids)
+        edges = []
+        for start in range(0, len(ids), FETCH_CHUNK_SIZE):
+            chunk = ids[start:start + FETCH_CHUNK_SIZE]
+            query = db.query(model.min_id, model.max_id, model.relation_type).filter(
+                or_(model.min_id.in_(chunk), model.max_id.in_(chunk))
+            )
+            edges.extend(_edge_rows(query))
+        return edges
+
+
+def _open_primary_session() -> Session:
+    # 在函数内导入，避免导入本模块时就创建数据库引擎
+    from app.core.database import SessionLocal
+    return SessionLocal()
+
+
+relation_graph = RelationGraph(_open_primary_session)
@@ -0,0 +1,270 @@
+"""
+关系表同步
+把成语/词语 synonyms / antonyms JSON 列中的词条名解析为ID，同步到 chengyu_relation / ciyu_relation。
+按ID顺序分批处理，每批：
+- 一条 IN 查询把本批引用的词条名解析为ID
+- 一条 IN 查询读出与本批条目相连的已有边，与期望的边比较
+- 新增的边用一条 executemany 的 INSERT 写入，多余的边用一条 DELETE ... WHERE id IN (...) 删除
+- 同一个事务中更新进度（sync_state.last_id），中断后从该位置继续
+
+关系是无向的：只要任一端的 JSON 列出了另一端，这条边就保留。
+full 模式处理全部条目并清理指向已删除条目的边；incremental 模式只处理上次完成的运行开始后
+updated_at 有变化的条目
+"""
+import json
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.relation import RelationType
+from app.models.sync_state import SyncState
+from app.services.projection import HEADWORD_FIELDS, PROJECTIONS
+from app.services.relation_graph import RELATION_MODELS
+from app.utils.http_cache import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+SYNC_MODES = ("full", "incremental")
+
+# 关系类型 -> 条目上的 JSON 列
+RELATION_FIELDS = {"synonym": "synonyms", "antonym": "antonyms"}
+
+# 按ID读取时每条 IN 查询的最大参数数
+LOOKUP_CHUNK_SIZE = 1000
+
+# 运行中的任务超过该秒数没有提交进度，视为已中断，可以接着运行
+STALE_AFTER = 300
+
+EdgeKey = Tuple[int, int, str]
+
+
+class SyncInProgressError(RuntimeError):
+    """同一资源已有正在运行的同步任务"""
+
+
+def state_name(resource: str) -> str:
+    return f"relations:{resource}"
+
+
+def _words(value) -> List[str]:
+    """JSON 列中的词条名，兼容以 JSON 字符串保存的旧数据"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    if not isinstance(value, list):
+        return []
+    return [word.strip() for word in value if isinstance(word, str) and word.strip()]
+
+
+def _chunks(values: Iterable, size: int = LOOKUP_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class _ChunkSync:
+    """同步一批条目的关系"""
+
+    def __init__(self, db: Session, resource: str):
+        self.db = db
+        self.model = PROJECTIONS[resource][0]
+        self.headword = getattr(self.model, HEADWORD_FIELDS[resource])
+        self.relation = RELATION_MODELS[resource]
+
+    def resolve(self, words: Set[str]) -> Dict[str, int]:
+        ids = {}
+        for chunk in _chunks(words):
+            ids.update(self.db.query(self.headword, self.model.id).filter(self.headword.in_(chunk)).all())
+        return ids
+
+    def existing_edges(self, ids: Set[int]) -> Dict[EdgeKey, int]:
+        relation = self.relation
+        edges = {}
+        for chunk in _chunks(ids):
+            query = self.db.query(relation.id, relation.min_id, relation.max_id, relation.relation_type).filter(
+                or_(relation.min_id.in_(chunk), relation.max_id.in_(chunk))
+            )
+            for edge_id, min_id, max_id, relation_type in query:
+                edges[(min_id, max_id, relation_type.value)] = edge_id
+        return edges
+
+    def still_listed(self, stale: List[EdgeKey], sources: Dict[int, str]) -> Set[EdgeKey]:
+        """另一端不在本批的边：另一端的 JSON 仍列出本批条目时保留"""
+        others = {max_id if min_id in sources else min_id for min_id, max_id, _ in stale}
+        lists = {}
+        for chunk in _chunks(others):
+            for row in self.db.query(self.model.id, self.model.synonyms, self.model.antonyms).filter(
+                self.model.id.in_(chunk)
+            ):
+                lists[row.id] = {
+                    relation_type: set(_words(getattr(row, field))) for relation_type, field in RELATION_FIELDS.items()
+                }
+        kept = set()
+        for key in stale:
+            min_id, max_id, relation_type = key
+            source, other = (min_id, max_id) if min_id in sources else (max_id, min_id)
+            if other in lists and sources[source] in lists[other][relation_type]:
+                kept.add(key)
+        return kept
+
+    def run(self, rows, report: Dict) -> Set[int]:
+        """同步 rows（id, 词条, synonyms, antonyms）的关系，返回边有变化的条目ID"""
+        sources = {row[0]: row[1] for row in rows}
+        listed = [(row[0], relation_type, _words(getattr(row, field)))
+                  for row in rows for relation_type, field in RELATION_FIELDS.items()]
+        ids_by_word = self.resolve({word for _, _, words in listed for word in words})
+
+        desired: Set[EdgeKey] = set()
+        for item_id, relation_type, words in listed:
+            for word in words:
+                other = ids_by_word.get(word)
+                if other is None:
+                    report["unresolved"] += 1
+                elif other != item_id:
+                    desired.add((min(item_id, other), max(item_id, other), relation_type))
+
+        existing = self.existing_edges(set(sources))
+        stale = [key for key in existing if key not in desired]
+        # 两端都在本批时以本批的 JSON 为准，否则还要看另一端
+        partial = [key for key in stale if not (key[0] in sources and key[1] in sources)]
+        kept = self.still_listed(partial, sources) if partial else set()
+        removed = [key for key in stale if key not in kept]
+        added = [key for key in desired if key not in existing]
+
+        if added:
+            self.db.execute(insert(self.relation.__table__), [
+                {"min_id": min_id, "max_id": max_id, "relation_type": RelationType(relation_type)}
+                for min_id, max_id, relation_type in added
+            ])
+        for chunk in _chunks(existing[key] for key in removed):
+            self.db.query(self.relation).filter(self.relation.id.in_(chunk)).delete(synchronize_session=False)
+
+        report["processed"] += len(rows)
+        report["inserted"] += len(added)
+        report["deleted"] += len(removed)
+        return {item_id for min_id, max_id, _ in added + removed for item_id in (min_id, max_id)}
+
+
+def prune_dangling_edges(db: Session, resource: str) -> int:
+    """删除指向已删除条目的边"""
+    model = PROJECTIONS[resource][0]
+    relation = RELATION_MODELS[resource]
+    existing_ids = select(model.id)
+    return db.query(relation).filter(
+        or_(relation.min_id.not_in(existing_ids), relation.max_id.not_in(existing_ids))
+    ).delete(synchronize_session=False)
+
+
+def _start(db: Session, resource: str, mode: str, restart: bool) -> SyncState:
+    """锁定进度行并决定本次运行的起点：接着上次中断的位置，或开始新的一次运行"""
+    state = db.query(SyncState).filter(SyncState.name == state_name(resource)).with_for_update().first()
+    if state is None:
+        state = SyncState(name=state_name(resource), status="idle", last_id=0)
+        db.add(state)
+        db.flush()
+
+    now = db.query(func.now()).scalar()
+    heartbeat = to_timestamp(state.updated_at)
+    if state.status == "running" and heartbeat is not None and to_timestamp(now) - heartbeat < STALE_AFTER:
+        db.rollback()
+        raise SyncInProgressError(f"{resource} 的关系同步正在运行")
+
+    if state.status in ("running", "failed") and not restart:
+        logger.info(f"继续 {resource} 的关系同步：从 ID {state.last_id} 之后开始")
+    else:
+        state.mode = mode
+        state.since = state.synced_at if mode == "incremental" else None
+        state.run_started_at = now
+        state.last_id = 0
+        state.stats = None
+    state.status = "running"
+    state.error = None
+    db.commit()
+    return state
+
+
+def sync_relations(
+    open_session: Callable[[], Session],
+    resource: str,
+    mode: str = "incremental",
+    batch_size: int = 1000,
+    restart: bool = False,
+    publish: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    同步一个资源的关系表，返回统计
+    上次运行中断或失败时默认从中断处继续（沿用当时的模式），restart=True 时重新开始；
+    incremental 模式在没有完成过的运行时处理全部条目（但不清理悬空的边）。
+    publish 用于发布 relations 事件，让各 worker 的关系图刷新
+    """
+    if mode not in SYNC_MODES:
+        raise ValueError(f"mode 只能是 {', '.join(SYNC_MODES)}")
+
+    model = PROJECTIONS[resource][0]
+    headword = getattr(model, HEADWORD_FIELDS[resource])
+    db = open_session()
+    try:
+        state = _start(db, resource, mode, restart)
+        report = dict(state.stats or {"processed": 0, "inserted": 0, "deleted": 0, "unresolved": 0, "pruned": 0})
+        chunk_sync = _ChunkSync(db, resource)
+        try:
+            while True:
+                query = db.query(model.id, headword, model.synonyms, model.antonyms).filter(model.id > state.last_id)
+                if state.since is not None:
+                    query = query.filter(model.updated_at >= state.since)
+                rows = query.order_by(model.id).limit(batch_size).all()
+                if not rows:
+                    break
+
+                changed = chunk_sync.run(rows, report)
+                state.last_id = rows[-1][0]
+                state.stats = dict(report)
+                db.commit()
+                if changed and publish:
+                    publish({"event": "relations", "resource": resource, "ids": sorted(changed)})
+
+            if state.mode == "full":
+                report["pruned"] = prune_dangling_edges(db, resource)
+            state.status = "done"
+            state.synced_at = state.run_started_at
+            state.last_id = 0
+            state.stats = dict(report)
+            db.commit()
+            if report["pruned"] and publish:
+                publish({"event": "relations", "resource": resource, "ids": None})
+        except Exception as e:
+            db.rollback()
+            state.status = "failed"
+            state.error = str(e)
+            db.commit()
+            raise
+        return {"resource": resource, "mode": state.mode, **report}
+    finally:
+        db.close()
+
+
+def sync_status(db: Session) -> Dict[str, Optional[Dict]]:
+    """各资源关系同步的进度"""
+    states = {
+        state.name: state
+        for state in db.query(SyncState).filter(SyncState.name.in_([state_name(r) for r in RELATION_MODELS]))
+    }
+    result = {}
+    for resource in RELATION_MODELS:
+        state = states.get(state_name(resource))
+        result[resource] = None if state is None else {
+            "status": state.status,
+            "mode": state.mode,
+            "last_id": state.last_id,
+            "since": state.since,
+            "run_started_at": state.run_started_at,
+            "synced_at": state.synced_at,
+            "stats": state.stats,
+            "error": state.error,
+            "updated_at": state.updated_at,
+        }
+    return result
@@ -0,0 +1,164 @@
+"""
+全文检索服务
+MySQL 下使用 ngram 分词的 FULLTEXT 索引（由迁移 0004_search_indexes 创建），
+覆盖词条、拼音、释义和例句，并按相关度排序；其他数据库回退为多列 LIKE 匹配。
+不含汉字的检索词（拼音、首字母）在任何数据库上都走 LIKE 匹配并同时匹配规范化拼音列，
+"yi"、"yixin"、首字母 "yxl" 也能找到带声调拼音的条目，结果与数据库无关
+"""
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, literal, or_
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Query, Session
+
+from app.models.chengyu import Chengyu
+from app.models.ciyu import Ciyu
+from app.models.hanzi import Hanzi
+from app.utils.pinyin import normalize_pinyin
+
+# 资源 -> (模型, 词条列, FULLTEXT索引覆盖的列, 释义列)
+# 列顺序必须与 FULLTEXT 索引定义完全一致，MATCH() 才能命中索引
+SEARCH_TARGETS = {
+    "chengyu": (Chengyu, Chengyu.chengyu, (Chengyu.chengyu, Chengyu.pinyin, Chengyu.explanation, Chengyu.example), Chengyu.explanation),
+    "ciyu": (Ciyu, Ciyu.word, (Ciyu.word, Ciyu.pinyin, Ciyu.definition), Ciyu.definition),
+}
+
+SEARCH_TYPES = ("chengyu", "ciyu", "hanzi")
+
+# 布尔模式下有特殊含义的字符
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+_CJK_CHAR = re.compile(r"[\u3400-\u9fff\U00020000-\U0002ffff]")
+
+SNIPPET_LENGTH = 80
+
+
+def clean_search_term(term: str) -> str:
+    """去掉布尔检索运算符和多余空白"""
+    return " ".join(_BOOLEAN_OPERATORS.sub(" ", term).split())
+
+
+def use_fulltext(dialect_name: str, term: str) -> bool:
+    """
+    MySQL 上检索词含汉字且不短于 ngram 长度（默认2）时使用全文索引
+    全文索引覆盖的列只有带声调的 pinyin 是拼音，不含汉字的检索词走 like_condition 才能匹配规范化拼音列
+    """
+    return dialect_name == "mysql" and len(term) >= 2 and _CJK_CHAR.search(term) is not None
+
+
+def _use_fulltext(query: Query, term: str) -> bool:
+    return use_fulltext(query.session.get_bind().dialect.name, term)
+
+
+def fulltext_match(resource: str, term: str):
+    """构造 MATCH ... AGAINST 表达式（短语匹配，布尔模式）"""
+    _, _, columns, _ = SEARCH_TARGETS[resource]
+    return mysql.match(*columns, against=f'"{term}"').in_boolean_mode()
+
+
+def like_condition(resource: str, term: str):
+    """不使用全文索引时的检索条件：各列 LIKE 包含匹配，加上规范化拼音包含匹配和首字母前缀匹配"""
+    model, _, columns, _ = SEARCH_TARGETS[resource]
+    conditions = [column.like(f"%{term}%") for column in columns]
+    keyword = "" if _CJK_CHAR.search(term) else normalize_pinyin(term)
+    if keyword:
+        conditions += [model.pinyin_plain.like(f"%{keyword}%"), model.pinyin_initials.like(f"{keyword}%")]
+    return or_(*conditions)
+
+
+def apply_fulltext_filter(query: Query, resource: str, term: str) -> Query:
+    """在词条、拼音、释义和例句中检索，用于列表接口的 search_mode=fulltext"""
+    term = clean_search_term(term)
+    if not term:
+        return query
+    if _use_fulltext(query, term):
+        return query.filter(fulltext_match(resource, term))
+    return query.filter(like_condition(resource, term))
+
+
+def apply_pinyin_filter(query: Query, resource: str, term: str) -> Query:
+    """
+    拼音前缀检索，支持 "yi ma dang xian"、"yimadangxian" 和首字母 "ymdx"
+    只对建了索引的规范化拼音列做前缀匹配；检索词不含拼音字母时回退为词条匹配
+    """
+    model, headword, _, _ = SEARCH_TARGETS[resource]
+    keyword = normalize_pinyin(term)
+    if not keyword:
+        return query.filter(headword.like(f"%{term}%"))
+    return query.filter(
+        or_(model.pinyin_plain.like(f"{keyword}%"), model.pinyin_initials.like(f"{keyword}%"))
+    )
+
+
+def search_entries(query: Query, resource: str, term: str, limit: int = 20) -> List[Dict]:
+    """
+    按相关度检索成语或词语
+    排序：词条完全匹配 > 词条前缀匹配 > 全文相关度 > ID降序
+    query 需已按用户权限过滤
+    """
+    term = clean_search_term(term)
+    if not term:
+        return []
+
+    model, headword, _, detail = SEARCH_TARGETS[resource]
+    if _use_fulltext(query, term):
+        match = fulltext_match(resource, term)
+        query = query.filter(match)
+        score = match
+    else:
+        query = query.filter(like_condition(resource, term))
+        score = literal(0)
+
+    exact = case((headword == term, 1), else_=0)
+    prefix = case((headword.like(f"{term}%"), 1), else_=0)
+    rows = (
+        query.with_entities(model.id, headword, model.pinyin, detail, score.label("score"))
+        .order_by(exact.desc(), prefix.desc(), score.desc(), model.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+    return [
+        {
+            "id": row[0],
+            "headword": row[1],
+            "pinyin": row[2],
+            "snippet": (row[3] or "")[:SNIPPET_LENGTH],
+            "score": float(row[4] or 0),
+        }
+        for row in rows
+    ]
+
+
+def search_hanzi(db: Session, term: str, limit: int = 20) -> List[Dict]:
+    """按检索词中的汉字查找单字，走 character 唯一索引，不读取大JSON列"""
+    characters: List[str] = []
+    for char in _CJK_CHAR.findall(term):
+        if char not in characters:
+            characters.append(char)
+    characters = characters[:limit]
+    if not characters:
+        return []
+
+    rows = (
+        db.query(Hanzi.id, Hanzi.character, Hanzi.unicode_decimal)
+        .filter(Hanzi.character.in_(characters))
+        .all()
+    )
+    by_char = {row.character: row for row in rows}
+    return [
+        {"id": by_char[char].id, "character": char, "unicode_decimal": by_char[char].unicode_decimal}
+        for char in characters
+        if char in by_char
+    ]
+
+
+def parse_search_types(types: Optional[str]) -> List[str]:
+    """解析逗号分隔的检索类型，非法值抛出 ValueError"""
+    if not types:
+        return list(SEARCH_TYPES)
+    parsed = [item.strip() for item in types.split(",") if item.strip()]
+    invalid = [item for item in parsed if item not in SEARCH_TYPES]
+    if invalid:
+        raise ValueError(f"不支持的检索类型: {', '.join(invalid)}")
+    return parsed
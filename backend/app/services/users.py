@@ -0,0 +1,56 @@
+"""
+用户管理
+创建用户时在调用方线程中计算 bcrypt 哈希（每个约数百毫秒），批量创建时逐个哈希后一次提交。
+新建管理员后，该用户名此前创建的成语/词语随之变为公共条目
+"""
+from typing import Dict, Iterable, List
+
+from sqlalchemy.orm import Session
+
+from app.core.security import hash_password
+from app.models import Chengyu, Ciyu
+from app.models.user import User
+from app.services.visibility import backfill_public_flags
+
+USER_ROLES = ("admin", "teacher")
+
+
+def check_new_user(username: str, password: str, role: str) -> None:
+    """检查新用户的字段，无效时抛出 ValueError"""
+    if not username or not username.strip():
+        raise ValueError("用户名不能为空")
+    if len(username) > 50:
+        raise ValueError("用户名不能超过 50 个字符")
+    if not password:
+        raise ValueError("密码不能为空")
+    if role not in USER_ROLES:
+        raise ValueError(f"role 只能是 {', '.join(USER_ROLES)}")
+
+
+def create_users(db: Session, users: Iterable[Dict]) -> Dict[str, List[str]]:
+    """
+    批量创建用户（每项含 username、password、role），已存在的用户名跳过
+    返回 {"created": [...], "skipped": [...]}；字段无效时抛出 ValueError，不写入任何用户
+    """
+    users = list(users)
+    for user in users:
+        check_new_user(user["username"], user["password"], user.get("role", "teacher"))
+    usernames = [user["username"].strip() for user in users]
+    existing = {row.username for row in db.query(User.username).filter(User.username.in_(usernames))}
+
+    created, skipped = [], []
+    for user, username in zip(users, usernames):
+        if username in existing or username in created:
+            skipped.append(username)
+            continue
+        db.add(User(username=username, hashed_password=hash_password(user["password"]),
+                    role=user.get("role", "teacher")))
+        created.append(username)
+    db.commit()
+
+    admins = [username for user, username in zip(users, usernames)
+              if username in created and user.get("role", "teacher") == "admin"]
+    if admins:
+        for model in (Chengyu, Ciyu):
+            backfill_public_flags(db, model, owners=admins)
+    return {"created": created, "skipped": skipped}
@@ -0,0 +1,59 @@
+"""
+成语/词语的可见范围
+老师只能看到公共条目和自己创建的条目。是否公共在写入时计算并保存在 is_public 列，
+查询条件为 is_public = 1 OR created_by IS NULL OR created_by IN (PUBLIC_OWNERS..., :username)，
+分别由 (is_public, id) 和 (created_by, id) 复合索引支持，按ID排序分页时可以直接沿索引读取。
+爬虫、SQL 脚本、导入备份等绕过接口写入的行 is_public 默认为 0，创建者为空或为 PUBLIC_OWNERS 时仍视为公共
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Query, Session
+
+from app.models.user import User
+
+# 创建者为这些用户名（或为空）的旧数据视为公共条目
+PUBLIC_OWNERS = ("", "system", "admin")
+
+
+def is_public_owner(username: Optional[str], is_admin: bool) -> bool:
+    """新条目是否公共：管理员和系统导入的条目对所有老师可见"""
+    return is_admin or not username or username in PUBLIC_OWNERS
+
+
+def visibility_condition(model, current_user):
+    """当前用户可见范围的过滤条件，不受限时返回 None"""
+    if current_user is None or current_user.role != "teacher":
+        return None
+    return or_(
+        model.is_public == True,
+        model.created_by.is_(None),
+        model.created_by.in_(PUBLIC_OWNERS + (current_user.username,)),
+    )
+
+
+def apply_visibility(query: Query, model, current_user) -> Query:
+    """老师只能看到公共条目（包括管理员创建的）和自己创建的"""
+    condition = visibility_condition(model, current_user)
+    return query if condition is None else query.filter(condition)
+
+
+def backfill_public_flags(db: Session, model, owners: Optional[Iterable[str]] = None) -> int:
+    """
+    按创建者批量重新计算 is_public（公共、非公共各一条 UPDATE），返回被修改的行数
+    创建者为空、为 PUBLIC_OWNERS 或为管理员账号的条目是公共的；指定 owners 时只处理这些用户创建的条目
+    """
+    admins = select(User.username).where(User.role == "admin")
+    public = or_(model.created_by.is_(None), model.created_by.in_(PUBLIC_OWNERS), model.created_by.in_(admins))
+    scope = [] if owners is None else [model.created_by.in_(list(owners))]
+    changed = 0
+    for flag, condition in ((True, public), (False, ~public)):
+        # 保持 updated_at 不变：可见范围不是内容修改，不应触发增量同步和缓存失效
+        result = db.execute(
+            update(model).where(condition, model.is_public != flag, *scope)
+            .values(is_public=flag, updated_at=model.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        changed += result.rowcount
+    db.commit()
+    return changed
@@ -4,7 +4,7 @@
 from typing import Optional
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.simple_auth import verify_token, get_user_by_username, check_admin_permission, check_teacher_or_admin_permission
+from app.core.simple_auth import resolve_token, check_admin_permission, check_teacher_or_admin_permission
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -20,17 +20,7 @@ async def get_current_user_from_token(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = verify_token(credentials.credentials)
-        if payload is None:
-            raise credentials_exception
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except Exception:
-        raise credentials_exception
-    
-    user = get_user_by_username(username)
+    user = await resolve_token(credentials.credentials)
     if user is None:
         raise credentials_exception
     
@@ -0,0 +1,85 @@
+"""
+HTTP 条件请求
+- ETag: 响应体内容的哈希，If-None-Match 匹配时返回 304
+- Last-Modified: 条目的 updated_at，未携带 If-None-Match 时按 If-Modified-Since 判断
+- Cache-Control: 各接口的缓存策略，浏览器缓存响应后每次通过条件请求校验
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+# 详情与用户无关，可被共享缓存保存；列表按用户权限过滤，只允许浏览器缓存
+DETAIL_CACHE_CONTROL = "public, no-cache"
+LIST_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(body: bytes) -> str:
+    """由响应体生成强 ETag"""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def to_timestamp(value: Optional[datetime]) -> Optional[int]:
+    """datetime 转为整秒时间戳；数据库返回的无时区时间按 UTC 处理"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def format_http_date(timestamp: int) -> str:
+    """格式化为 HTTP 日期（RFC 7231）"""
+    return format_datetime(datetime.fromtimestamp(timestamp, tz=timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """按弱比较判断 If-None-Match 是否包含当前 ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified_since(if_modified_since: str, last_modified: int) -> bool:
+    """If-Modified-Since 不早于最后修改时间时返回 True，无法解析的日期视为不匹配"""
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified <= int(since.timestamp())
+
+
+def conditional_response(
+    request: Request,
+    body: bytes,
+    cache_control: str,
+    last_modified: Optional[int] = None,
+    vary: Optional[str] = None,
+) -> Response:
+    """
+    返回带校验头的 JSON 响应；客户端缓存仍然有效时返回不带响应体的 304
+    同时携带 If-None-Match 和 If-Modified-Since 时只按 ETag 判断
+    """
+    etag = make_etag(body)
+    headers: Dict[str, str] = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_http_date(last_modified)
+    if vary:
+        headers["Vary"] = vary
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(if_modified_since and last_modified is not None
+                            and not_modified_since(if_modified_since, last_modified))
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,51 @@
+"""
+分页工具函数
+支持传统的 page/size 偏移分页和基于主键的游标（keyset）分页
+"""
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(last_id: int) -> str:
+    """将上一页最后一条记录的ID编码为不透明游标"""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """解析游标，返回上一页最后一条记录的ID，格式错误时抛出 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = data["id"]
+    except Exception:
+        raise ValueError("无效的分页游标")
+
+    if not isinstance(last_id, int) or isinstance(last_id, bool) or last_id < 0:
+        raise ValueError("无效的分页游标")
+    return last_id
+
+
+def resolve_after_id(cursor: Optional[str], after_id: Optional[int]) -> Optional[int]:
+    """根据 cursor / after_id 参数确定游标分页的起点，两者都未提供时返回 None（使用偏移分页）"""
+    if cursor:
+        return decode_cursor(cursor)
+    return after_id
+
+
+def paginate_keyset(query, id_column, size: int, after_id: Optional[int]):
+    """
+    基于主键的游标分页（按ID降序）
+    使用 id < after_id 代替 OFFSET，深翻页时不再扫描并丢弃前面的行
+    返回 (当前页数据, 下一页游标)
+    """
+    if after_id is not None:
+        query = query.filter(id_column < after_id)
+
+    # 多取一条用于判断是否还有下一页
+    rows = query.order_by(id_column.desc()).limit(size + 1).all()
+    has_more = len(rows) > size
+    rows = rows[:size]
+    next_cursor = encode_cursor(rows[-1].id) if has_more and rows else None
+    return rows, next_cursor
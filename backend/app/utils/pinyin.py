@@ -0,0 +1,43 @@
+"""
+拼音规范化工具
+将带声调、带空格的拼音（如 "yī mǎ dāng xiān"）转换为可建索引的形式：
+- 无声调紧凑拼音: yimadangxian
+- 拼音首字母: ymdx
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+_NON_LETTERS = re.compile(r"[^a-z]+")
+
+
+def strip_tones(text: str) -> str:
+    """去掉声调符号，ü 统一写作 v"""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    decomposed = decomposed.replace("u\u0308", "v")
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def pinyin_syllables(text: Optional[str]) -> List[str]:
+    """拆分为无声调音节列表，同时去掉数字声调和标点"""
+    if not text:
+        return []
+    return [syllable for syllable in _NON_LETTERS.split(strip_tones(text)) if syllable]
+
+
+def normalize_pinyin(text: Optional[str]) -> str:
+    """无声调、无空格的紧凑拼音，也用于规范化用户输入的检索词"""
+    return "".join(pinyin_syllables(text))
+
+
+def pinyin_initials(text: Optional[str]) -> str:
+    """每个音节的首字母"""
+    return "".join(syllable[0] for syllable in pinyin_syllables(text))
+
+
+def pinyin_index_values(text: Optional[str]) -> Dict[str, Optional[str]]:
+    """计算拼音索引列的值，拼音为空时两列都为 None"""
+    plain = normalize_pinyin(text)
+    if not plain:
+        return {"pinyin_plain": None, "pinyin_initials": None}
+    return {"pinyin_plain": plain, "pinyin_initials": pinyin_initials(text)}
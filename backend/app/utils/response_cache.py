@@ -0,0 +1,51 @@
+"""
+接口响应缓存
+- 详情：按（资源, ID）缓存序列化后的JSON及其最后修改时间，更新/删除时删除对应条目
+- 列表页：按（资源, 权限范围, 查询参数）缓存，资源有任何写入时整体失效
+缓存存放在可插拔的缓存后端中（见 app.core.cache），多 worker 部署时使用 Redis 共享
+"""
+import hashlib
+import json
+from typing import Optional, Tuple
+
+from app.core.cache import CacheNamespace, cache_backend
+from app.core.config import settings
+
+# 配置了只读副本时，失效后的复制延迟窗口内不回填缓存，避免缓存副本上的旧数据
+_hold_seconds = settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_READ_URL else 0
+
+detail_cache = CacheNamespace(
+    cache_backend, "detail", ttl=settings.DETAIL_CACHE_TTL, hold_seconds=_hold_seconds, versioned=False
+)
+list_cache = CacheNamespace(cache_backend, "list", ttl=settings.LIST_CACHE_TTL, hold_seconds=_hold_seconds)
+
+
+def get_cached_detail(resource: str, item_id: int) -> Optional[Tuple[bytes, Optional[int]]]:
+    """读取缓存的详情，返回（JSON, 最后修改时间戳），未命中时返回 None"""
+    raw = detail_cache.get(resource, str(item_id))
+    if raw is None:
+        return None
+    header, _, body = raw.partition(b"\n")
+    return body, int(header) if header else None
+
+
+def cache_detail(resource: str, item_id: int, body: bytes, last_modified: Optional[int] = None) -> None:
+    """缓存详情JSON，最后修改时间戳写在第一行，供 Last-Modified 使用"""
+    header = b"" if last_modified is None else str(last_modified).encode("ascii")
+    detail_cache.set(resource, str(item_id), header + b"\n" + body)
+
+
+def invalidate_detail(resource: str, item_id: int) -> None:
+    """更新或删除后使详情缓存失效"""
+    detail_cache.invalidate_key(resource, str(item_id))
+
+
+def list_cache_key(scope: str, **params) -> str:
+    """由权限范围和查询参数生成列表页缓存键"""
+    raw = json.dumps({"scope": scope, **params}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def invalidate_list_pages(resource: str) -> None:
+    """资源发生写入后使其所有列表页缓存失效"""
+    list_cache.invalidate(resource)
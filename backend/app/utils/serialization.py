@@ -0,0 +1,21 @@
+"""
+JSON 序列化
+使用 orjson 把查询结果直接编码为 bytes，跳过 Pydantic 校验和 jsonable_encoder 的逐字段遍历；
+datetime 输出为 ISO 8601，中文按 UTF-8 原样输出，与默认 JSONResponse 的结果一致
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def encode_json(data: Any) -> bytes:
+    """编码为 JSON bytes"""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """使用 orjson 编码的 JSON 响应（继承 JSONResponse，OpenAPI 中按 responses 声明的模型生成文档）"""
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
@@ -0,0 +1,87 @@
+"""
+列表总数统计策略
+- exact: 精确 COUNT(*)，结果按（资源, 权限范围, 搜索词）缓存在共享缓存后端中，写接口负责失效
+- estimated: 使用 MySQL 执行计划中的行数估算，不执行 COUNT(*)
+- include_total=false: 不返回总数（适用于无限滚动）
+"""
+import hashlib
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import Query
+
+from app.core.cache import CacheNamespace, cache_backend
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TOTAL_MODES = ("exact", "estimated")
+
+count_cache = CacheNamespace(
+    cache_backend, "count", ttl=settings.COUNT_CACHE_TTL,
+    hold_seconds=settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_READ_URL else 0
+)
+
+
+def count_scope(current_user) -> str:
+    """根据用户角色确定计数的权限范围：管理员看全部，老师只看公共资源和自己的"""
+    if current_user.role == "teacher":
+        return f"owner:{current_user.username}"
+    return "all"
+
+
+def estimate_query_rows(query: Query) -> Optional[int]:
+    """通过 EXPLAIN 读取 MySQL 的行数估算，非 MySQL 数据库或失败时返回 None"""
+    session = query.session
+    bind = session.get_bind()
+    if bind.dialect.name != "mysql":
+        return None
+
+    try:
+        compiled = query.statement.compile(dialect=bind.dialect)
+        result = session.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+        row = result.mappings().first()
+        if not row or row.get("rows") is None:
+            return None
+        filtered = row.get("filtered") or 100
+        return int(row["rows"] * float(filtered) / 100)
+    except Exception as e:
+        logger.warning(f"估算行数失败，回退到精确计数: {e}")
+        return None
+
+
+def get_total(
+    query: Query,
+    resource: str,
+    scope: str,
+    search: Optional[str] = None,
+    mode: str = "exact",
+    include_total: bool = True,
+) -> Optional[int]:
+    """按所选策略获取列表总数，include_total 为 False 时返回 None"""
+    if not include_total:
+        return None
+
+    if mode == "estimated":
+        estimated = estimate_query_rows(query)
+        if estimated is not None:
+            return estimated
+
+    key = hashlib.sha1(f"{scope}|{search or ''}".encode("utf-8")).hexdigest()
+    total = count_cache.get(resource, key)
+    if total is None:
+        total = query.count()
+        count_cache.set(resource, key, total)
+    return total
+
+
+def invalidate_totals(resource: str) -> None:
+    """资源发生增删改后清除该资源的所有计数缓存"""
+    count_cache.invalidate(resource)
+
+
+def total_pages(total: Optional[int], size: int) -> Optional[int]:
+    """根据总数计算页数，总数未知时返回 None"""
+    if total is None:
+        return None
+    return (total + size - 1) // size
@@ -0,0 +1,74 @@
+"""
+响应压缩基准测试
+对同一组接口分别以 identity / gzip / br 请求，统计传输字节数与延迟
+
+用法（先启动服务）:
+    uv run uvicorn app.main:app --port 8000
+    uv run python benchmarks/bench_compression.py --requests 200 \\
+        --path "/api/v1/chengyu?size=100" --path "/api/v1/ciyu?size=100"
+"""
+import argparse
+import statistics
+import sys
+import os
+import time
+
+import httpx
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def make_token(username: str, role: str) -> str:
+    """直接签发令牌，避免登录接口影响测试结果"""
+    from app.core.simple_auth import create_access_token
+    return create_access_token(username=username, role=role)
+
+
+def measure(client: httpx.Client, path: str, encoding: str, total: int, headers) -> None:
+    headers = {**headers, "Accept-Encoding": encoding}
+    client.get(path, headers=headers)  # 预热（同时填充服务端缓存）
+
+    latencies = []
+    wire_bytes = body_bytes = 0
+    used_encoding = None
+    for _ in range(total):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        wire_bytes = response.num_bytes_downloaded
+        body_bytes = len(response.content)
+        used_encoding = response.headers.get("content-encoding", "identity")
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+    ratio = wire_bytes / body_bytes if body_bytes else 1
+    print(
+        f"  {encoding:<9} 实际编码 {used_encoding:<9} 传输 {wire_bytes:>9} 字节 (原始 {body_bytes}, {ratio:.1%})  "
+        f"延迟(ms): 平均 {statistics.mean(latencies) * 1000:.2f}  p95 {p95:.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="响应压缩基准测试")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", help="请求路径，可重复指定")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--role", default="admin")
+    args = parser.parse_args()
+
+    paths = args.path or ["/api/v1/chengyu?size=20", "/api/v1/chengyu?size=100"]
+    headers = {"Authorization": f"Bearer {make_token(args.username, args.role)}"}
+    with httpx.Client(base_url=args.base_url, timeout=60) as client:
+        for path in paths:
+            print(path)
+            for encoding in ENCODINGS:
+                measure(client, path, encoding, args.requests, headers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+并发吞吐量基准测试
+模拟多个客户端同时请求列表/详情接口，统计吞吐量和延迟分位数
+
+用法（先启动服务）:
+    uv run uvicorn app.main:app --port 8000 --workers 1
+    uv run python benchmarks/bench_concurrency.py --concurrency 100 --requests 2000 \\
+        --path "/api/v1/chengyu?size=20&search=马"
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+
+import httpx
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_token(username: str, role: str) -> str:
+    """直接签发令牌，避免登录接口影响测试结果"""
+    from app.core.simple_auth import create_access_token
+    return create_access_token(username=username, role=role)
+
+
+async def run(base_url: str, paths, concurrency: int, total: int, headers) -> None:
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def client_loop(client: httpx.AsyncClient):
+        nonlocal errors
+        for index in counter:
+            path = paths[index % len(paths)]
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                if response.status_code != 200:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        # 预热
+        await client.get(paths[0], headers=headers)
+        start = time.perf_counter()
+        await asyncio.gather(*[client_loop(client) for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"并发数: {concurrency}  请求数: {len(latencies)}  失败: {errors}")
+    print(f"吞吐量: {len(latencies) / elapsed:.1f} req/s  总耗时: {elapsed:.2f}s")
+    print(
+        f"延迟(ms): 平均 {statistics.mean(latencies) * 1000:.1f}  p50 {percentile(0.50):.1f}  "
+        f"p95 {percentile(0.95):.1f}  p99 {percentile(0.99):.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并发吞吐量基准测试")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", help="请求路径，可重复指定以轮流请求")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--role", default="admin")
+    args = parser.parse_args()
+
+    paths = args.path or ["/api/v1/chengyu?size=20"]
+    headers = {"Authorization": f"Bearer {make_token(args.username, args.role)}"}
+    asyncio.run(run(args.base_url, paths, args.concurrency, args.requests, headers))
+
+
+if __name__ == "__main__":
+    main()
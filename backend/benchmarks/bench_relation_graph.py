@@ -0,0 +1,82 @@
+"""
+关系图微基准
+在 SQLite 文件库中生成随机的近义/反义关系，测量 CSR 构建时间，
+以及查询直接关系和多跳近义词扩展的耗时（不含回表读取条目）
+
+用法:
+    uv run python benchmarks/bench_relation_graph.py --nodes 300000 --edges 600000
+"""
+import argparse
+import random
+import sys
+import os
+import tempfile
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.relation import CiyuRelation, RelationType
+from app.services.relation_graph import RelationGraph
+
+
+def seed(session, nodes: int, edges: int) -> None:
+    random.seed(0)
+    rows = []
+    for _ in range(edges):
+        a, b = random.sample(range(1, nodes + 1), 2)
+        relation_type = RelationType.SYNONYM if random.random() < 0.8 else RelationType.ANTONYM
+        rows.append({"min_id": min(a, b), "max_id": max(a, b), "relation_type": relation_type})
+    session.bulk_insert_mappings(CiyuRelation, rows)
+    session.commit()
+
+
+def per_call(func, ids) -> float:
+    start = time.perf_counter()
+    for item_id in ids:
+        func(item_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="关系图微基准")
+    parser.add_argument("--nodes", type=int, default=300000)
+    parser.add_argument("--edges", type=int, default=600000)
+    parser.add_argument("--queries", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.sqlite')}")
+        Base.metadata.create_all(engine, tables=[CiyuRelation.__table__])
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            seed(session, args.nodes, args.edges)
+
+        graph = RelationGraph(Session)
+        start = time.perf_counter()
+        graph.neighbours("ciyu", 1)
+        print(f"构建 {args.edges} 条边: {(time.perf_counter() - start) * 1000:.0f} ms  {graph.stats()['ciyu']}")
+
+        ids = [random.randint(1, args.nodes) for _ in range(args.queries)]
+        print(f"直接关系        每次 {per_call(lambda item_id: graph.neighbours('ciyu', item_id), ids):8.2f} µs")
+        for hops in (1, 2, 3):
+            cost = per_call(lambda item_id: graph.expand("ciyu", item_id, hops=hops, limit=200), ids)
+            print(f"近义词扩展 {hops} 跳  每次 {cost:8.2f} µs")
+
+        # 增量刷新：修改 100 个条目的关系
+        changed = ids[:100]
+        graph.handle_relation_event({"event": "relations", "resource": "ciyu", "ids": changed})
+        start = time.perf_counter()
+        graph.neighbours("ciyu", 1)
+        print(f"增量刷新 {len(changed)} 个条目: {(time.perf_counter() - start) * 1000:.1f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
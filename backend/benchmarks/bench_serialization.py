@@ -0,0 +1,96 @@
+"""
+序列化开销微基准
+在内存 SQLite 中生成成语数据，比较三种把查询结果变成 JSON bytes 的方式（含查询本身）:
+  1. ORM 对象 + ChengyuResponse 校验 + model_dump_json（原详情接口）
+  2. ORM 对象 + 手写字典 + jsonable_encoder + JSONResponse（原列表接口）
+  3. 按列查询的行元组 + orjson（现在的列表/详情接口）
+
+用法:
+    uv run python benchmarks/bench_serialization.py --rows 2000 --repeat 20
+"""
+import argparse
+import random
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Chengyu
+from app.schemas.chengyu import ChengyuResponse
+from app.services.projection import project_columns, resolve_fields, row_to_item
+from app.utils.serialization import encode_json
+
+
+def random_text(length: int) -> str:
+    return "".join(chr(random.randint(0x4E00, 0x9FA5)) for _ in range(length))
+
+
+def seed(session, rows: int) -> None:
+    random.seed(0)
+    session.add_all([
+        Chengyu(
+            chengyu=random_text(4) + str(i), pinyin="yī xīn yī yì", explanation=random_text(80),
+            source=random_text(40), usage=random_text(20), example=random_text(40),
+            synonyms=[random_text(4), random_text(4)], antonyms=[random_text(4)], translation="wholeheartedly",
+            created_by="admin",
+        )
+        for i in range(rows)
+    ])
+    session.commit()
+
+
+def pydantic_path(session) -> int:
+    size = 0
+    for chengyu in session.query(Chengyu).all():
+        size += len(ChengyuResponse.model_validate(chengyu).model_dump_json().encode("utf-8"))
+    return size
+
+
+def dict_path(session) -> int:
+    fields = resolve_fields("chengyu")
+    items = [{name: getattr(chengyu, name) for name in fields} for chengyu in session.query(Chengyu).all()]
+    return len(JSONResponse(content=jsonable_encoder({"items": items})).body)
+
+
+def row_path(session) -> int:
+    fields = resolve_fields("chengyu")
+    rows = session.query(Chengyu).with_entities(*project_columns("chengyu", fields)).all()
+    return len(encode_json({"items": [row_to_item("chengyu", row, fields) for row in rows]}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="序列化开销微基准")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Chengyu.__table__])
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        seed(session, args.rows)
+
+    for name, func in (("pydantic model_validate", pydantic_path), ("dict + jsonable_encoder", dict_path), ("row tuple + orjson", row_path)):
+        timings = []
+        for _ in range(args.repeat):
+            # 每次使用新会话，避免 ORM 对象被 identity map 复用
+            with Session() as session:
+                start = time.perf_counter()
+                size = func(session)
+                timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{name:<24} 最快 {best * 1000:8.2f} ms  每行 {best / args.rows * 1e6:6.2f} µs  输出 {size} 字节")
+
+
+if __name__ == "__main__":
+    main()
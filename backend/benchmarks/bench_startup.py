@@ -0,0 +1,113 @@
+"""
+启动耗时基准
+每轮在新的子进程中（相当于一个新 worker）分别计时:
+  1. import app.main（导入模块、创建引擎和路由）
+  2. 启动事件（TestClient 进入上下文，执行 startup_event）
+  3. 首次 /health/ready（首次连接数据库并核对迁移版本，启动时不再做这些事）
+并用 -X importtime 统计自身耗时最多的模块
+
+默认在临时 SQLite 文件上先执行 alembic upgrade head；--database-url 可指定已迁移的 MySQL
+
+用法:
+    uv run python benchmarks/bench_startup.py --runs 5 --top 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    t2 = time.perf_counter()
+    response = client.get("/health/ready")
+    t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "startup": t2 - t1, "ready": t3 - t2, "status": response.status_code}))
+"""
+
+
+def upgrade(database_url: str) -> None:
+    """在基准数据库上执行迁移"""
+    sys.path.insert(0, BACKEND_DIR)
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", database_url)
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+def run_child(env) -> dict:
+    """新进程中计时一次启动，返回各阶段耗时和 importtime 的逐模块统计"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process"] = time.perf_counter() - start
+    modules = {}
+    for line in proc.stderr.splitlines():
+        # import time:       self [us] |  cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    result["modules"] = modules
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--database-url", help="已迁移的数据库，不指定时使用临时 SQLite 文件")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["DEBUG"] = "false"
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.database_url:
+            os.environ["DATABASE_URL"] = args.database_url
+        else:
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.sqlite')}"
+            upgrade(os.environ["DATABASE_URL"])
+        env = dict(os.environ)
+
+        # 第一轮预热文件系统缓存和 .pyc，不计入结果
+        run_child(env)
+        runs = [run_child(env) for _ in range(args.runs)]
+
+    print(f"{args.runs} 轮，中位数（最小 - 最大）：")
+    for key, label in (
+        ("import", "import app.main"),
+        ("startup", "启动事件"),
+        ("ready", "首次 /health/ready"),
+        ("process", "整个子进程"),
+    ):
+        values = [run[key] * 1000 for run in runs]
+        print(f"  {statistics.median(values):8.1f} ms  ({min(values):.1f} - {max(values):.1f})  {label}")
+    print(f"  /health/ready 状态码: {runs[-1]['status']}")
+
+    totals = {}
+    for run in runs:
+        for name, (self_us, _) in run["modules"].items():
+            totals[name] = totals.get(name, 0) + self_us
+    print(f"\n自身导入耗时最多的 {args.top} 个模块（每轮平均）：")
+    for name, self_us in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {self_us / len(runs) / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
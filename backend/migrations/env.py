@@ -0,0 +1,40 @@
+"""
+Alembic 运行环境
+数据库地址默认取 settings.DATABASE_URL；测试等场景可通过 Config.set_main_option("sqlalchemy.url", ...) 覆盖
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401  注册全部模型，供 --autogenerate 比较
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def run_migrations_online() -> None:
+    connectable = create_engine(database_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    # 迁移在每次 DDL 前检查表、字段和索引是否已存在，需要连接数据库
+    raise SystemExit("不支持离线模式（--sql），请连接数据库执行迁移")
+run_migrations_online()
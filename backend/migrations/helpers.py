@@ -0,0 +1,30 @@
+"""
+迁移脚本共用的检查函数
+本项目的表在引入 Alembic 之前已由爬虫和启动时的 ensure_* 函数创建和修改过，
+因此迁移在执行 DDL 前先检查对象是否已存在，对新库和旧库都可以直接 upgrade head
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def table_exists(table_name: str) -> bool:
+    return _inspector().has_table(table_name)
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    return any(column["name"] == column_name for column in _inspector().get_columns(table_name))
+
+
+def index_exists(table_name: str, index_name: str) -> bool:
+    inspector = _inspector()
+    names = {index["name"] for index in inspector.get_indexes(table_name)}
+    names.update(constraint["name"] for constraint in inspector.get_unique_constraints(table_name))
+    return index_name in names
+
+
+def dialect_name() -> str:
+    return op.get_bind().dialect.name
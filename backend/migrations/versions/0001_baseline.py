@@ -0,0 +1,139 @@
+"""基础表：成语、词语、汉字、关系表和用户表
+
+已存在的表（由爬虫或旧版本创建）保持不变，只创建缺少的表
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import table_exists
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps(with_updated_at: bool = True):
+    columns = [sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), comment="创建时间")]
+    if with_updated_at:
+        columns.append(
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), comment="更新时间")
+        )
+    return columns
+
+
+def _create_chengyu() -> None:
+    op.create_table(
+        "hanyuguoxue_chengyu",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("chengyu", sa.String(50), nullable=False, comment="成语"),
+        sa.Column("url", sa.Text(), nullable=True, comment="URL链接"),
+        sa.Column("pinyin", sa.String(200), nullable=True, comment="拼音"),
+        sa.Column("zhuyin", sa.String(200), nullable=True, comment="注音"),
+        sa.Column("emotion", sa.String(50), nullable=True, comment="情感色彩"),
+        sa.Column("explanation", sa.Text(), nullable=True, comment="解释"),
+        sa.Column("source", sa.Text(), nullable=True, comment="来源"),
+        sa.Column("usage", sa.Text(), nullable=True, comment="用法"),
+        sa.Column("example", sa.Text(), nullable=True, comment="例句"),
+        sa.Column("synonyms", sa.JSON(), nullable=True, comment="同义词"),
+        sa.Column("antonyms", sa.JSON(), nullable=True, comment="反义词"),
+        sa.Column("translation", sa.Text(), nullable=True, comment="翻译"),
+        sa.Column("error", sa.Text(), nullable=True, comment="错误信息"),
+        *_timestamps(),
+    )
+    op.create_index("ix_hanyuguoxue_chengyu_id", "hanyuguoxue_chengyu", ["id"])
+    op.create_index("ix_hanyuguoxue_chengyu_chengyu", "hanyuguoxue_chengyu", ["chengyu"], unique=True)
+
+
+def _create_ciyu() -> None:
+    op.create_table(
+        "hanyuguoxue_ciyu",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("word", sa.String(100), nullable=False, comment="词语"),
+        sa.Column("url", sa.Text(), nullable=True, comment="URL链接"),
+        sa.Column("pinyin", sa.String(200), nullable=True, comment="拼音"),
+        sa.Column("zhuyin", sa.String(200), nullable=True, comment="注音"),
+        sa.Column("part_of_speech", sa.String(50), nullable=True, comment="词性"),
+        sa.Column("is_common", sa.Boolean(), nullable=True, comment="是否常用"),
+        sa.Column("definition", sa.Text(), nullable=True, comment="定义"),
+        sa.Column("synonyms", sa.JSON(), nullable=True, comment="同义词"),
+        sa.Column("antonyms", sa.JSON(), nullable=True, comment="反义词"),
+        sa.Column("error", sa.Text(), nullable=True, comment="错误信息"),
+        *_timestamps(),
+    )
+    op.create_index("ix_hanyuguoxue_ciyu_id", "hanyuguoxue_ciyu", ["id"])
+    op.create_index("ix_hanyuguoxue_ciyu_word", "hanyuguoxue_ciyu", ["word"], unique=True)
+    op.create_index("ix_hanyuguoxue_ciyu_part_of_speech", "hanyuguoxue_ciyu", ["part_of_speech"])
+
+
+def _create_hanzi() -> None:
+    op.create_table(
+        "hanyuguoxue_hanzi",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("character", sa.String(10), nullable=False, comment="汉字"),
+        sa.Column("url", sa.String(500), nullable=True, comment="URL链接"),
+        sa.Column("unicode_decimal", sa.Integer(), nullable=True, comment="Unicode十进制"),
+        sa.Column("basic_info", sa.JSON(), nullable=True, comment="基本信息"),
+        sa.Column("gaishu_info", sa.JSON(), nullable=True, comment="概述信息"),
+        sa.Column("yisi_info", sa.JSON(), nullable=True, comment="意思信息"),
+        sa.Column("fanyi_info", sa.JSON(), nullable=True, comment="翻译信息"),
+        sa.Column("guoyu_info", sa.JSON(), nullable=True, comment="国语信息"),
+        sa.Column("liangan_info", sa.JSON(), nullable=True, comment="两岸信息"),
+        sa.Column("evolution_data", sa.JSON(), nullable=True, comment="演变数据"),
+        sa.Column("error", sa.Text(), nullable=True, comment="错误信息"),
+        *_timestamps(),
+    )
+    op.create_index("ix_hanyuguoxue_hanzi_id", "hanyuguoxue_hanzi", ["id"])
+    op.create_index("ix_hanyuguoxue_hanzi_character", "hanyuguoxue_hanzi", ["character"], unique=True)
+    op.create_index("ix_hanyuguoxue_hanzi_unicode_decimal", "hanyuguoxue_hanzi", ["unicode_decimal"])
+
+
+def _create_relation(table_name: str) -> None:
+    op.create_table(
+        table_name,
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("min_id", sa.Integer(), nullable=False, comment="最小ID"),
+        sa.Column("max_id", sa.Integer(), nullable=False, comment="最大ID"),
+        sa.Column("relation_type", sa.Enum("SYNONYM", "ANTONYM", name="relationtype"), nullable=False,
+                  comment="关系类型"),
+        *_timestamps(with_updated_at=False),
+    )
+    for column in ("id", "min_id", "max_id"):
+        op.create_index(f"ix_{table_name}_{column}", table_name, [column])
+
+
+def _create_users() -> None:
+    op.create_table(
+        "users_knma",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("username", sa.String(50), nullable=False, comment="用户名"),
+        sa.Column("hashed_password", sa.String(255), nullable=False, comment="加密密码"),
+        sa.Column("role", sa.String(20), nullable=False, comment="角色 (admin/teacher)"),
+    )
+    op.create_index("ix_users_knma_id", "users_knma", ["id"])
+    op.create_index("ix_users_knma_username", "users_knma", ["username"], unique=True)
+
+
+TABLES = (
+    ("hanyuguoxue_chengyu", _create_chengyu),
+    ("hanyuguoxue_ciyu", _create_ciyu),
+    ("hanyuguoxue_hanzi", _create_hanzi),
+    ("chengyu_relation", lambda: _create_relation("chengyu_relation")),
+    ("ciyu_relation", lambda: _create_relation("ciyu_relation")),
+    ("users_knma", _create_users),
+)
+
+
+def upgrade() -> None:
+    for table_name, create in TABLES:
+        if not table_exists(table_name):
+            create()
+
+
+def downgrade() -> None:
+    for table_name, _ in reversed(TABLES):
+        op.drop_table(table_name)
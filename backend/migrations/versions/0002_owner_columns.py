@@ -0,0 +1,33 @@
+"""成语/词语的 created_by 字段（原 ensure_owner_columns）
+
+不再创建 created_by 单列索引：0006 用 (created_by, id) 复合索引取代它，大表升级时不必先建后删
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import column_exists, index_exists
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+TABLES = ("hanyuguoxue_chengyu", "hanyuguoxue_ciyu")
+
+
+def upgrade() -> None:
+    for table_name in TABLES:
+        if not column_exists(table_name, "created_by"):
+            op.add_column(table_name, sa.Column("created_by", sa.String(128), nullable=True, comment="创建者用户名"))
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        # 旧版本启动时创建的单列索引可能仍在
+        if index_exists(table_name, f"ix_{table_name}_created_by"):
+            op.drop_index(f"ix_{table_name}_created_by", table_name=table_name)
+        op.drop_column(table_name, "created_by")
@@ -0,0 +1,39 @@
+"""规范化拼音索引列（原 ensure_pinyin_columns）
+
+新增的列为空，需运行 scripts/backfill_pinyin.py 回填
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import column_exists, index_exists
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    ("hanyuguoxue_chengyu", "pinyin_plain", 200, "无声调紧凑拼音"),
+    ("hanyuguoxue_chengyu", "pinyin_initials", 50, "拼音首字母"),
+    ("hanyuguoxue_ciyu", "pinyin_plain", 200, "无声调紧凑拼音"),
+    ("hanyuguoxue_ciyu", "pinyin_initials", 100, "拼音首字母"),
+)
+
+
+def upgrade() -> None:
+    for table_name, column_name, length, comment in COLUMNS:
+        if not column_exists(table_name, column_name):
+            op.add_column(table_name, sa.Column(column_name, sa.String(length), nullable=True, comment=comment))
+        index_name = f"ix_{table_name}_{column_name}"
+        if not index_exists(table_name, index_name):
+            op.create_index(index_name, table_name, [column_name])
+
+
+def downgrade() -> None:
+    for table_name, column_name, _, _ in reversed(COLUMNS):
+        op.drop_index(f"ix_{table_name}_{column_name}", table_name=table_name)
+        op.drop_column(table_name, column_name)
@@ -0,0 +1,36 @@
+"""ngram 分词的 FULLTEXT 检索索引（原 ensure_search_indexes，仅 MySQL）
+
+其他数据库上检索回退为 LIKE 匹配，本迁移不做任何操作
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from migrations.helpers import dialect_name, index_exists
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("hanyuguoxue_chengyu", "ft_chengyu_search", "chengyu, pinyin, explanation, example"),
+    ("hanyuguoxue_ciyu", "ft_ciyu_search", "word, pinyin, definition"),
+)
+
+
+def upgrade() -> None:
+    if dialect_name() != "mysql":
+        return
+    for table_name, index_name, columns in INDEXES:
+        if not index_exists(table_name, index_name):
+            op.execute(f"ALTER TABLE {table_name} ADD FULLTEXT INDEX {index_name} ({columns}) WITH PARSER ngram")
+
+
+def downgrade() -> None:
+    if dialect_name() != "mysql":
+        return
+    for table_name, index_name, _ in INDEXES:
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,71 @@
+"""关系表的边唯一约束和同步进度表（原 ensure_relation_indexes、ensure_sync_state_table）
+
+添加唯一约束前删除重复的边，保留ID最小的一条
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import dialect_name, index_exists, table_exists
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+RELATION_TABLES = ("chengyu_relation", "ciyu_relation")
+
+
+def _delete_duplicate_edges(table_name: str) -> None:
+    if dialect_name() == "mysql":
+        # MySQL 不允许在 DELETE 的子查询中读取同一张表，改用自连接
+        op.execute(
+            f"""
+            DELETE r1 FROM {table_name} r1 JOIN {table_name} r2
+              ON r1.min_id = r2.min_id AND r1.max_id = r2.max_id
+             AND r1.relation_type = r2.relation_type AND r1.id > r2.id
+            """
+        )
+    else:
+        op.execute(
+            f"""
+            DELETE FROM {table_name} WHERE id NOT IN (
+                SELECT MIN(id) FROM {table_name} GROUP BY min_id, max_id, relation_type
+            )
+            """
+        )
+
+
+def upgrade() -> None:
+    for table_name in RELATION_TABLES:
+        constraint_name = f"uq_{table_name}_edge"
+        if index_exists(table_name, constraint_name):
+            continue
+        _delete_duplicate_edges(table_name)
+        with op.batch_alter_table(table_name) as batch:
+            batch.create_unique_constraint(constraint_name, ["min_id", "max_id", "relation_type"])
+
+    if not table_exists("sync_state"):
+        op.create_table(
+            "sync_state",
+            sa.Column("name", sa.String(64), primary_key=True, comment="任务名"),
+            sa.Column("status", sa.String(16), nullable=False, comment="状态 (idle/running/done/failed)"),
+            sa.Column("mode", sa.String(16), nullable=True, comment="同步模式 (full/incremental)"),
+            sa.Column("last_id", sa.Integer(), nullable=False, comment="本次运行已处理到的ID"),
+            sa.Column("since", sa.DateTime(timezone=True), nullable=True, comment="本次运行只处理该时间之后更新的行"),
+            sa.Column("run_started_at", sa.DateTime(timezone=True), nullable=True, comment="本次运行的开始时间"),
+            sa.Column("synced_at", sa.DateTime(timezone=True), nullable=True, comment="上次完成的运行的开始时间"),
+            sa.Column("stats", sa.JSON(), nullable=True, comment="本次运行的统计"),
+            sa.Column("error", sa.Text(), nullable=True, comment="错误信息"),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), comment="更新时间"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("sync_state")
+    for table_name in RELATION_TABLES:
+        with op.batch_alter_table(table_name) as batch:
+            batch.drop_constraint(f"uq_{table_name}_edge", type_="unique")
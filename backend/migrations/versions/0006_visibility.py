@@ -0,0 +1,53 @@
+"""老师可见范围：is_public 字段及 (is_public, id)、(created_by, id) 复合索引（原 ensure_visibility_columns）
+
+新增字段时按创建者批量回填：创建者为空、为 ''、'system'、'admin' 或为管理员账号的条目是公共的。
+(created_by, id) 取代旧版本启动时创建的 created_by 单列索引（0002 不再创建它，这里只删除已有的）
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import column_exists, index_exists
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+TABLES = ("hanyuguoxue_chengyu", "hanyuguoxue_ciyu")
+
+
+def upgrade() -> None:
+    for table_name in TABLES:
+        if not column_exists(table_name, "is_public"):
+            op.add_column(table_name, sa.Column(
+                "is_public", sa.Boolean(), nullable=False, server_default=sa.false(), comment="是否对所有老师可见"
+            ))
+            # 保持 updated_at 不变：可见范围不是内容修改，不应触发关系的增量同步
+            op.execute(
+                f"""
+                UPDATE {table_name} SET is_public = 1, updated_at = updated_at
+                WHERE created_by IS NULL OR created_by IN ('', 'system', 'admin')
+                   OR created_by IN (SELECT username FROM users_knma WHERE role = 'admin')
+                """
+            )
+
+        for index_name, columns in (
+            (f"ix_{table_name}_public_id", ["is_public", "id"]),
+            (f"ix_{table_name}_owner_id", ["created_by", "id"]),
+        ):
+            if not index_exists(table_name, index_name):
+                op.create_index(index_name, table_name, columns)
+
+        if index_exists(table_name, f"ix_{table_name}_created_by"):
+            op.drop_index(f"ix_{table_name}_created_by", table_name=table_name)
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        op.drop_index(f"ix_{table_name}_owner_id", table_name=table_name)
+        op.drop_index(f"ix_{table_name}_public_id", table_name=table_name)
+        op.drop_column(table_name, "is_public")
@@ -0,0 +1,46 @@
+"""
+回填成语/词语的规范化拼音索引列
+
+拼音索引列由迁移 0003 创建，运行前先执行 alembic upgrade head
+
+用法:
+    uv run python scripts/backfill_pinyin.py --resource all --batch-size 2000
+"""
+import argparse
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.models import Chengyu, Ciyu
+from app.services.pinyin_index import backfill_pinyin_index
+
+MODELS = {"chengyu": Chengyu, "ciyu": Ciyu}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回填规范化拼音索引列")
+    parser.add_argument("--resource", choices=["chengyu", "ciyu", "all"], default="all")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--all", action="store_true", help="重新计算所有行（默认只处理未回填的行）")
+    args = parser.parse_args()
+
+    resources = list(MODELS) if args.resource == "all" else [args.resource]
+    db = SessionLocal()
+    try:
+        for resource in resources:
+            start = time.perf_counter()
+            count = backfill_pinyin_index(
+                db, MODELS[resource], batch_size=args.batch_size, only_missing=not args.all
+            )
+            elapsed = time.perf_counter() - start
+            print(f"{resource}: 回填 {count} 行，用时 {elapsed:.1f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
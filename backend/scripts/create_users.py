@@ -0,0 +1,75 @@
+"""
+创建登录用户（users_knma 表）
+
+用法:
+    uv run python scripts/create_users.py --username admin --role admin          # 交互输入密码
+    uv run python scripts/create_users.py --file teachers.csv
+    uv run python scripts/create_users.py --legacy                                # 从内置账号的旧版本升级
+
+CSV 首行为字段名：username,password,role（role 可省略，默认 teacher）；已存在的用户名跳过。
+用户表由迁移创建，运行前先执行 alembic upgrade head。
+--legacy 创建旧版本硬编码的账号 admin、teacher1、teacher2，密码默认沿用旧的 123456（可用 --password 指定），
+升级后原账号即可继续登录，之后请尽快更换密码
+"""
+import argparse
+import csv
+import getpass
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.users import USER_ROLES, create_users
+
+# 旧版本内置在代码中的账号：(用户名, 角色)，密码均为 LEGACY_PASSWORD
+LEGACY_ACCOUNTS = (("admin", "admin"), ("teacher1", "teacher"), ("teacher2", "teacher"))
+LEGACY_PASSWORD = "123456"
+
+
+def read_users(args):
+    if args.legacy:
+        password = args.password or LEGACY_PASSWORD
+        return [{"username": username, "password": password, "role": role} for username, role in LEGACY_ACCOUNTS]
+    if args.file:
+        with open(args.file, encoding="utf-8-sig", newline="") as file:
+            return [
+                {"username": row["username"], "password": row["password"], "role": row.get("role") or "teacher"}
+                for row in csv.DictReader(file)
+            ]
+    if not args.username:
+        sys.exit("需要 --username 或 --file")
+    password = args.password or getpass.getpass(f"{args.username} 的密码: ")
+    return [{"username": args.username, "password": password, "role": args.role}]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="创建登录用户")
+    parser.add_argument("--username")
+    parser.add_argument("--password", help="不指定时交互输入")
+    parser.add_argument("--role", choices=USER_ROLES, default="teacher")
+    parser.add_argument("--file", help="批量创建：包含 username,password,role 列的 CSV")
+    parser.add_argument("--legacy", action="store_true", help="创建旧版本的内置账号 admin、teacher1、teacher2")
+    args = parser.parse_args()
+
+    users = read_users(args)
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        result = create_users(db, users)
+    except ValueError as e:
+        sys.exit(f"创建失败: {e}")
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - start
+    print(f"创建 {len(result['created'])} 个用户，跳过已存在的 {len(result['skipped'])} 个，用时 {elapsed:.1f}s")
+    if result["skipped"]:
+        print(f"已存在: {', '.join(result['skipped'])}")
+    if args.legacy and not args.password and result["created"]:
+        print(f"警告: {', '.join(result['created'])} 使用旧版本的默认密码，请尽快更换")
+
+
+if __name__ == "__main__":
+    main()
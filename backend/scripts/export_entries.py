@@ -0,0 +1,47 @@
+"""
+把成语/词语/汉字表导出为 NDJSON、CSV 或 Parquet 文件（分批读取，内存占用不随表大小增长）
+
+用法:
+    uv run python scripts/export_entries.py --resource chengyu --format ndjson --output chengyu.ndjson
+    uv run python scripts/export_entries.py --resource hanzi --format parquet
+"""
+import argparse
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import ReadSessionLocal
+from app.services.export import (
+    EXPORT_BATCH_SIZE, EXPORT_FORMATS, EXPORT_TARGETS, check_format, export_filename, stream_export
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导出成语/词语/汉字数据")
+    parser.add_argument("--resource", choices=list(EXPORT_TARGETS), required=True)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--output", help="输出文件，默认为 <表名>.<格式>")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    check_format(args.format)
+    output = args.output or export_filename(args.resource, args.format)
+    model = EXPORT_TARGETS[args.resource]
+
+    start = time.perf_counter()
+    size = 0
+    with open(output, "wb") as file:
+        for chunk in stream_export(
+            ReadSessionLocal, lambda db: db.query(model), args.resource, args.format, args.batch_size
+        ):
+            file.write(chunk)
+            size += len(chunk)
+    elapsed = time.perf_counter() - start
+    print(f"已导出到 {output}，{size / 1024 / 1024:.1f} MB，用时 {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
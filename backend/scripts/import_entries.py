@@ -0,0 +1,79 @@
+"""
+从 JSON Lines / CSV 文件批量导入成语或词语
+
+用法:
+    uv run python scripts/import_entries.py --resource ciyu --file words.csv --username admin
+    uv run python scripts/import_entries.py --resource chengyu --file chengyu.jsonl --on-conflict update \\
+        --report report.jsonl
+
+JSON Lines 每行一个对象，字段与创建接口相同；CSV 首行为字段名，
+synonyms/antonyms 列可以是 JSON 数组或以 | 分隔的词语
+"""
+import argparse
+import json
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import cache_backend
+from app.core.database import SessionLocal
+from app.services.bulk_import import (
+    CONFLICT_POLICIES, IMPORT_FORMATS, IMPORT_TARGETS, detect_format, import_entries, iter_records
+)
+from app.utils.response_cache import invalidate_detail, invalidate_list_pages
+from app.utils.totals import invalidate_totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量导入成语/词语")
+    parser.add_argument("--resource", choices=list(IMPORT_TARGETS), required=True)
+    parser.add_argument("--file", required=True)
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="默认根据扩展名判断")
+    parser.add_argument("--on-conflict", choices=CONFLICT_POLICIES, default="skip")
+    parser.add_argument("--username", default="admin", help="记录为创建者的用户名")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--report", help="把逐行结果写入该 JSON Lines 文件")
+    args = parser.parse_args()
+
+    fmt = detect_format(args.file, args.format)
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        with open(args.file, encoding="utf-8-sig", newline="") as lines:
+            report = import_entries(
+                db, args.resource, iter_records(lines, fmt), args.username,
+                is_admin=True, on_conflict=args.on_conflict, batch_size=args.batch_size
+            )
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - start
+
+    # 使用共享缓存后端（Redis）时，让服务端缓存随之失效
+    invalidate_totals(args.resource)
+    invalidate_list_pages(args.resource)
+    for row in report["rows"]:
+        if row["status"] == "updated":
+            invalidate_detail(args.resource, row["id"])
+    # 通知各 worker（汉字倒排索引等）：本次写入范围未知
+    cache_backend.publish({"event": "write", "resource": args.resource, "id": None, "ids": None, "user": args.username})
+
+    print(
+        f"{args.resource}: 共 {report['total']} 行，新增 {report['inserted']}，更新 {report['updated']}，"
+        f"跳过 {report['skipped']}，失败 {report['failed']}，用时 {elapsed:.1f}s "
+        f"({report['total'] / elapsed if elapsed else 0:.0f} 行/秒)"
+    )
+    for row in report["rows"]:
+        if row["status"] == "failed":
+            print(f"  第 {row['line']} 行失败: {row.get('message')}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as output:
+            for row in report["rows"]:
+                output.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
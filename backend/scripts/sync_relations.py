@@ -0,0 +1,52 @@
+"""
+把成语/词语 synonyms / antonyms 中的词条同步到关系表
+
+用法:
+    uv run python scripts/sync_relations.py --resource all --mode full
+    uv run python scripts/sync_relations.py --resource chengyu              # 增量：只处理上次同步后更新过的条目
+
+上次运行中断或失败时默认从中断处继续，--restart 重新开始。同步进度表由迁移创建，运行前先执行 alembic upgrade head
+"""
+import argparse
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import cache_backend
+from app.core.database import SessionLocal
+from app.services.relation_graph import RELATION_MODELS
+from app.services.relation_sync import SYNC_MODES, SyncInProgressError, sync_relations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="同步关系表")
+    parser.add_argument("--resource", choices=list(RELATION_MODELS) + ["all"], default="all")
+    parser.add_argument("--mode", choices=SYNC_MODES, default="incremental")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--restart", action="store_true", help="忽略上次中断的进度，重新开始")
+    args = parser.parse_args()
+
+    resources = list(RELATION_MODELS) if args.resource == "all" else [args.resource]
+    for resource in resources:
+        start = time.perf_counter()
+        try:
+            # 使用共享缓存后端（Redis）时，各 worker 的关系图随之刷新
+            report = sync_relations(
+                SessionLocal, resource, args.mode, args.batch_size, args.restart, publish=cache_backend.publish
+            )
+        except SyncInProgressError as e:
+            print(f"跳过: {e}")
+            continue
+        elapsed = time.perf_counter() - start
+        print(
+            f"{resource}（{report['mode']}）: 处理 {report['processed']} 条，新增边 {report['inserted']}，"
+            f"删除边 {report['deleted']}，清理悬空边 {report['pruned']}，未找到的词条 {report['unresolved']}，"
+            f"用时 {elapsed:.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+测试用户认证：数据库中的用户、已验证令牌缓存的命中、过期与吊销
+"""
+import sys
+import os
+import time
+from datetime import timedelta
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.simple_auth import (
+    authenticate_token, authenticate_user, create_access_token, get_user_by_username, principal_cache,
+    revoke_token, revoke_user_tokens, token_cache, token_digest
+)
+from app.models import Chengyu, Ciyu, User
+from app.services.users import create_users
+
+# 内存 SQLite 每个线程一个连接，建表与测试都在当前线程中进行；新建管理员时会更新成语/词语的可见范围
+Base.metadata.create_all(engine, tables=[User.__table__, Chengyu.__table__, Ciyu.__table__])
+with SessionLocal() as session:
+    if session.query(User).count() == 0:
+        create_users(session, [
+            {"username": "admin", "password": "123456", "role": "admin"},
+            {"username": "teacher1", "password": "123456", "role": "teacher"},
+            {"username": "teacher2", "password": "123456", "role": "teacher"},
+        ])
+
+
+def test_authenticate_user():
+    """测试 bcrypt 密码校验与用户信息缓存"""
+    print("🔍 测试用户认证...")
+    with SessionLocal() as session:
+        user = authenticate_user(session, "teacher1", "123456")
+        assert user.username == "teacher1" and user.role == "teacher"
+        assert authenticate_user(session, "teacher1", "wrong") is None
+        assert authenticate_user(session, "ghost", "123456") is None
+        result = create_users(session, [{"username": "teacher1", "password": "x", "role": "teacher"}])
+        assert result == {"created": [], "skipped": ["teacher1"]}
+    try:
+        with SessionLocal() as session:
+            create_users(session, [{"username": "teacher3", "password": "x", "role": "guest"}])
+        assert False, "应当抛出 ValueError"
+    except ValueError:
+        pass
+
+    principal_cache.clear()
+    assert get_user_by_username("admin").role == "admin"
+    assert principal_cache.peek("admin") is not None
+    assert get_user_by_username("ghost") is None
+    print("✅ 用户认证正确")
+
+
+def test_cached_token():
+    """测试同一令牌第二次验证命中缓存，无效令牌不缓存"""
+    print("🔍 测试令牌缓存...")
+    token = create_access_token("teacher1", "teacher")
+    hits = token_cache.hits
+    assert authenticate_token(token).username == "teacher1"
+    assert authenticate_token(token).username == "teacher1"
+    assert token_cache.hits == hits + 1
+    assert authenticate_token(token + "x") is None
+    assert token_cache.peek(token_digest(token + "x")) is None
+    print("✅ 令牌缓存正确")
+
+
+def test_expiry():
+    """测试缓存时间不超过令牌的过期时间"""
+    token = create_access_token("teacher1", "teacher", expires_delta=timedelta(seconds=1))
+    assert authenticate_token(token) is not None
+    # exp 按秒取整，且秒数相同时仍视为有效
+    time.sleep(2.1)
+    assert authenticate_token(token) is None
+    print("✅ 过期令牌不再有效")
+
+
+def test_revocation():
+    """测试吊销单个令牌和吊销用户的全部令牌"""
+    token = create_access_token("teacher1", "teacher")
+    other = create_access_token("teacher2", "teacher")
+    assert authenticate_token(token) is not None and authenticate_token(other) is not None
+
+    revoke_token(token)
+    assert authenticate_token(token) is None
+    assert authenticate_token(other) is not None
+
+    revoke_user_tokens("teacher2")
+    assert authenticate_token(other) is None
+    assert authenticate_token(create_access_token("admin", "admin")) is not None
+    print("✅ 吊销后令牌失效")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试用户认证...")
+    test_authenticate_user()
+    test_cached_token()
+    test_expiry()
+    test_revocation()
@@ -0,0 +1,74 @@
+"""
+测试成语/词语批量获取
+"""
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Ciyu
+from app.services.batch import BATCH_GET_LIMIT, batch_get, parse_ids
+from app.utils.response_cache import get_cached_detail, invalidate_detail
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Ciyu.__table__])
+    session = sessionmaker(bind=engine)()
+    session.add_all([Ciyu(word="学习"), Ciyu(word="老师"), Ciyu(word="朋友")])
+    session.commit()
+    for item_id in (1, 2, 3):
+        invalidate_detail("ciyu", item_id)
+    return session
+
+
+def test_batch_get_order_and_missing():
+    """测试按请求顺序返回、去重以及缺失项"""
+    print("🔍 测试批量获取...")
+    session = make_session()
+    try:
+        data = orjson.loads(batch_get(session, "ciyu", [3, 1, 99, 3], ["老师", "学习", "没有"]))
+        assert [item["id"] for item in data["items"]] == [3, 1, 2]
+        assert data["missing_ids"] == [99]
+        assert data["missing_words"] == ["没有"]
+        # 查到的条目写入详情缓存，再次获取时直接使用
+        assert get_cached_detail("ciyu", 2) is not None
+        session.query(Ciyu).filter(Ciyu.id == 2).update({"word": "已修改"})
+        session.commit()
+        data = orjson.loads(batch_get(session, "ciyu", [2], []))
+        assert data["items"][0]["word"] == "老师"
+        print("✅ 顺序、去重与缓存正确")
+    finally:
+        session.close()
+
+
+def test_batch_get_limits():
+    """测试参数校验"""
+    session = make_session()
+    try:
+        for ids, words in (([], []), (list(range(BATCH_GET_LIMIT + 1)), [])):
+            try:
+                batch_get(session, "ciyu", ids, words)
+                assert False, "应当抛出 ValueError"
+            except ValueError as e:
+                print(f"✅ 拒绝无效参数: {e}")
+        try:
+            parse_ids("1,a")
+            assert False, "应当抛出 ValueError"
+        except ValueError:
+            pass
+        assert parse_ids("1, 2,") == [1, 2]
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试批量获取...")
+    test_batch_get_order_and_missing()
+    test_batch_get_limits()
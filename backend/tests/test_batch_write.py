@@ -0,0 +1,81 @@
+"""
+测试成语/词语批量更新与删除
+"""
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Ciyu
+from app.services.batch import batch_delete, batch_update
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Ciyu.__table__])
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Ciyu(word="学习", created_by="teacher1"),
+        Ciyu(word="老师", created_by="teacher1"),
+        Ciyu(word="朋友", created_by="teacher2"),
+    ])
+    session.commit()
+    return session
+
+
+def test_batch_update():
+    """测试集中权限判断、重名检查与只写入传入的字段"""
+    print("🔍 测试批量更新...")
+    session = make_session()
+    try:
+        items = [
+            {"id": 1, "pinyin": "xué xí", "is_common": True},
+            {"id": 2, "word": "学习"},
+            {"id": 3, "definition": "x"},
+            {"id": 9, "definition": "x"},
+        ]
+        report = batch_update(session, "ciyu", items, "teacher1")
+        assert [row["status"] for row in report["rows"]] == ["updated", "failed", "forbidden", "not_found"]
+        assert (report["updated"], report["failed"]) == (1, 1)
+
+        session.expire_all()
+        word = session.get(Ciyu, 1)
+        assert (word.pinyin_plain, word.is_common, word.definition) == ("xuexi", True, None)
+        assert session.get(Ciyu, 2).word == "老师"
+
+        # 同批互换名称视为重名，管理员可修改他人条目
+        report = batch_update(session, "ciyu", [{"id": 1, "word": "甲"}, {"id": 3, "word": "甲"}], "admin", True)
+        assert report["failed"] == 2
+        assert batch_update(session, "ciyu", [{"id": 3, "definition": "友"}], "admin", True)["updated"] == 1
+        print("✅ 批量更新结果正确")
+    finally:
+        session.close()
+
+
+def test_batch_delete():
+    """测试批量删除与参数校验"""
+    session = make_session()
+    try:
+        report = batch_delete(session, "ciyu", [2, 3, 2, 9], "teacher1")
+        assert [(row["id"], row["status"]) for row in report["rows"]] == [(2, "deleted"), (3, "forbidden"), (9, "not_found")]
+        assert [row.id for row in session.query(Ciyu.id).order_by(Ciyu.id)] == [1, 3]
+        for call in (lambda: batch_delete(session, "ciyu", [], "admin", True),
+                     lambda: batch_update(session, "ciyu", [{"id": 1}, {"id": 1}], "admin", True)):
+            try:
+                call()
+                assert False, "应当抛出 ValueError"
+            except ValueError as e:
+                print(f"✅ 拒绝无效参数: {e}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试批量更新与删除...")
+    test_batch_update()
+    test_batch_delete()
@@ -0,0 +1,101 @@
+"""
+测试成语/词语批量导入
+"""
+import sys
+import os
+import io
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Ciyu
+from app.services.bulk_import import detect_format, import_entries, iter_records
+
+JSONL = """{"word": "学习", "pinyin": "xué xí", "synonyms": ["研习"]}
+{"word": "学习", "definition": "重复"}
+{"pinyin": "quē shǎo"}
+not json
+
+{"word": "老师", "is_common": true, "created_by": "someone"}
+"""
+
+CSV = """word,pinyin,is_common,synonyms,antonyms
+学习,,1,学|习,
+朋友,péng you,0,"[""友人""]",
+"""
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Ciyu.__table__])
+    return sessionmaker(bind=engine)()
+
+
+def test_parse_records():
+    """测试 JSON Lines / CSV 解析与格式判断"""
+    records = list(iter_records(io.StringIO(JSONL), "jsonl"))
+    assert [line for line, _, _ in records] == [1, 2, 3, 4, 6]
+    assert records[3][2].startswith("JSON 解析失败")
+
+    records = list(iter_records(io.StringIO(CSV, newline=""), "csv"))
+    assert records[0] == (2, {"word": "学习", "pinyin": None, "is_common": "1", "synonyms": ["学", "习"], "antonyms": None}, None)
+    assert records[1][1]["synonyms"] == ["友人"]
+
+    assert detect_format("words.CSV") == "csv"
+    assert detect_format("words.txt", "jsonl") == "jsonl"
+
+
+def test_import_and_report():
+    """测试批量插入、文件内重复、已存在跳过与逐行报告"""
+    print("🔍 测试批量导入...")
+    session = make_session()
+    try:
+        report = import_entries(session, "ciyu", iter_records(io.StringIO(JSONL), "jsonl"), "teacher1", batch_size=1)
+        assert (report["total"], report["inserted"], report["skipped"], report["failed"]) == (5, 2, 1, 2)
+        assert [row["status"] for row in report["rows"]] == ["inserted", "skipped", "failed", "failed", "inserted"]
+
+        word = session.query(Ciyu).filter(Ciyu.word == "学习").one()
+        assert word.synonyms == ["研习"] and word.pinyin_plain == "xuexi" and word.created_by == "teacher1"
+        assert session.query(Ciyu).filter(Ciyu.word == "老师").one().created_by == "teacher1"
+        print(f"✅ 新增 {report['inserted']} 行，失败行带原因: {report['rows'][2]['message']}")
+
+        report = import_entries(session, "ciyu", iter_records(io.StringIO(CSV, newline=""), "csv"), "teacher1")
+        assert [row["status"] for row in report["rows"]] == ["skipped", "inserted"]
+        print("✅ 已存在的词语默认跳过")
+    finally:
+        session.close()
+
+
+def test_import_update():
+    """测试更新模式只写入出现的字段，且老师只能更新自己创建的词语"""
+    session = make_session()
+    try:
+        session.add_all([Ciyu(word="学习", definition="原释义", created_by="teacher1"), Ciyu(word="朋友", created_by="teacher2")])
+        session.commit()
+
+        records = iter_records(io.StringIO(CSV, newline=""), "csv")
+        report = import_entries(session, "ciyu", records, "teacher1", on_conflict="update")
+        assert [row["status"] for row in report["rows"]] == ["updated", "failed"]
+
+        session.expire_all()
+        word = session.query(Ciyu).filter(Ciyu.word == "学习").one()
+        assert word.definition == "原释义" and word.is_common is True and word.synonyms == ["学", "习"]
+        assert session.query(Ciyu).filter(Ciyu.word == "朋友").one().pinyin is None
+
+        records = iter_records(io.StringIO(CSV, newline=""), "csv")
+        report = import_entries(session, "ciyu", records, "admin", is_admin=True, on_conflict="update")
+        assert report["updated"] == 2
+        print("✅ 更新模式遵守创建者权限")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试批量导入...")
+    test_parse_records()
+    test_import_and_report()
+    test_import_update()
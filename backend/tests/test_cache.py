@@ -0,0 +1,191 @@
+"""
+测试缓存与列表计数策略
+"""
+import sys
+import os
+import time
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import CacheNamespace, MemoryCacheBackend, RedisCacheBackend, TTLCache
+from app.core.database import Base
+from app.models import Ciyu
+from app.utils.response_cache import cache_detail, get_cached_detail, invalidate_detail
+from app.utils.totals import get_total, invalidate_totals, total_pages
+
+
+def test_ttl_cache():
+    """测试过期与容量淘汰"""
+    print("🔍 测试TTL缓存...")
+
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("c") == 3
+    print("✅ 超出容量时淘汰最早的条目")
+
+    cache.set("short", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short", "expired") == "expired"
+    print("✅ 过期条目不再返回")
+
+    cache = TTLCache(ttl=60)
+    cache.set(("ciyu", "all"), 1)
+    cache.set(("ciyu", "owner:teacher1"), 2)
+    cache.set(("chengyu", "all"), 3)
+    assert cache.delete_where(lambda key: key[0] == "ciyu") == 2
+    assert len(cache) == 1
+    print("✅ 按条件批量删除")
+
+
+def test_lru_eviction_and_stats():
+    """测试LRU淘汰顺序与命中统计"""
+    print("\n🔍 测试LRU缓存...")
+
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.peek("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+    print(f"✅ 最近访问的条目被保留: {stats}")
+
+
+def test_namespace_versioning():
+    """测试命名空间按分组整体失效与单键失效"""
+    print("\n🔍 测试缓存命名空间...")
+
+    backend = MemoryCacheBackend()
+    pages = CacheNamespace(backend, "list", ttl=60)
+    pages.set("ciyu", "p1", b"[1]")
+    pages.set("chengyu", "p1", b"[2]")
+    pages.invalidate("ciyu")
+    assert pages.get("ciyu", "p1") is None
+    assert pages.get("chengyu", "p1") == b"[2]"
+    print("✅ 版本号自增后旧分组缓存失效，其他分组不受影响")
+
+    cache_detail("chengyu", 1, b'{"id": 1}', last_modified=1700000000)
+    assert get_cached_detail("chengyu", 1) == (b'{"id": 1}', 1700000000)
+    cache_detail("chengyu", 2, b'{"id": 2}')
+    assert get_cached_detail("chengyu", 2) == (b'{"id": 2}', None)
+    invalidate_detail("chengyu", 1)
+    assert get_cached_detail("chengyu", 1) is None
+    print("✅ 详情缓存按键失效")
+
+
+def test_namespace_hold():
+    """测试失效后在复制延迟窗口内不回填"""
+    print("\n🔍 测试失效保持窗口...")
+
+    details = CacheNamespace(MemoryCacheBackend(), "detail", ttl=60, hold_seconds=0.05, versioned=False)
+    details.set("chengyu", "1", b'{"id": 1}')
+    details.invalidate_key("chengyu", "1")
+    details.set("chengyu", "1", b'{"id": 1, "stale": true}')
+    assert details.get("chengyu", "1") is None
+
+    time.sleep(0.06)
+    details.set("chengyu", "1", b'{"id": 1}')
+    assert details.get("chengyu", "1") == b'{"id": 1}'
+    print("✅ 窗口内拒绝回填，窗口过后恢复缓存")
+
+
+def test_memory_backend_publish():
+    """测试进程内后端直接把消息分发给订阅者"""
+    received = []
+    backend = MemoryCacheBackend()
+    backend.subscribe(received.append)
+    backend.publish({"event": "write", "user": "teacher1"})
+    assert received == [{"event": "write", "user": "teacher1"}]
+
+
+def test_redis_backend():
+    """测试 Redis 后端的编码、计数器和消息订阅（使用 fakeredis）"""
+    fakeredis = pytest.importorskip("fakeredis")
+    print("\n🔍 测试Redis缓存后端...")
+
+    server = fakeredis.FakeServer()
+    worker_a = RedisCacheBackend("redis://", client=fakeredis.FakeRedis(server=server))
+    worker_b = RedisCacheBackend("redis://", client=fakeredis.FakeRedis(server=server))
+
+    counts = CacheNamespace(worker_a, "count", ttl=60)
+    counts.set("ciyu", "all", 42)
+    assert CacheNamespace(worker_b, "count", ttl=60).get("ciyu", "all") == 42
+    worker_a.set("body", b"i:not-an-int", 60)
+    assert worker_b.get("body") == b"i:not-an-int"
+    print("✅ 多个 worker 共享缓存，整数与字节值编码正确")
+
+    CacheNamespace(worker_b, "count", ttl=60).invalidate("ciyu")
+    assert counts.get("ciyu", "all") is None
+    print("✅ 一个 worker 失效后其他 worker 同时失效")
+
+    received = []
+    worker_b.subscribe(received.append)
+    worker_b.start()
+    try:
+        worker_a.publish({"event": "write", "user": "teacher1"})
+        deadline = time.monotonic() + 2
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert received == [{"event": "write", "user": "teacher1"}]
+        print("✅ 写入消息广播到其他 worker")
+    finally:
+        worker_b.close()
+
+
+def test_cached_totals():
+    """测试计数缓存及失效"""
+    print("\n🔍 测试列表计数缓存...")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Ciyu.__table__])
+    session = sessionmaker(bind=engine)()
+    invalidate_totals("ciyu")
+    try:
+        session.add_all([Ciyu(word=f"词语{i}") for i in range(5)])
+        session.commit()
+
+        query = session.query(Ciyu)
+        assert get_total(query, "ciyu", "all") == 5
+        assert get_total(query, "ciyu", "all", include_total=False) is None
+
+        session.add(Ciyu(word="新词"))
+        session.commit()
+        assert get_total(query, "ciyu", "all") == 5
+        print("✅ 计数命中缓存")
+
+        invalidate_totals("ciyu")
+        assert get_total(query, "ciyu", "all") == 6
+        print("✅ 失效后重新计数")
+
+        # SQLite 没有执行计划估算，回退到精确计数
+        assert get_total(query, "ciyu", "all", mode="estimated") == 6
+        assert total_pages(6, 4) == 2
+        assert total_pages(None, 4) is None
+        print("✅ 估算模式回退正常")
+    finally:
+        session.close()
+        invalidate_totals("ciyu")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试缓存...")
+    test_ttl_cache()
+    test_lru_eviction_and_stats()
+    test_namespace_versioning()
+    test_namespace_hold()
+    test_memory_backend_publish()
+    test_redis_backend()
+    test_cached_totals()
@@ -0,0 +1,121 @@
+"""
+测试汉字倒排索引：求交集、增量维护与分页
+"""
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Ciyu
+from app.services.char_index import (
+    CharacterIndex, fetch_candidates_page, iter_matches, parse_query_characters
+)
+from app.utils.pagination import decode_cursor
+
+
+def make_index(check_seconds=0):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Ciyu.__table__])
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        session.add_all([Ciyu(word=word, created_by=owner) for word, owner in (
+            ("马上", None), ("牛马", "teacher2"), ("马车", None), ("牛车", None), ("马牛不相及", None),
+        )])
+        session.commit()
+    return CharacterIndex(Session, check_seconds=check_seconds), Session
+
+
+def matching(index, chars, before_id=None):
+    return list(iter_matches(index.postings("ciyu", chars), before_id))
+
+
+def test_intersection_and_updates():
+    """测试多字求交集，以及按写入事件增量更新"""
+    print("🔍 测试汉字倒排索引...")
+    index, Session = make_index()
+    assert matching(index, ["马"]) == [5, 3, 2, 1]
+    assert matching(index, ["马", "牛"]) == [5, 2]
+    assert matching(index, ["马", "牛"], before_id=5) == [2]
+    assert matching(index, ["马", "龙"]) == []
+
+    with Session() as session:
+        session.add(Ciyu(word="龙马精神"))
+        session.query(Ciyu).filter(Ciyu.id == 2).update({"word": "牛羊"})
+        session.commit()
+        session.query(Ciyu).filter(Ciyu.id == 5).delete()
+        session.commit()
+    index.handle_write_event({"event": "write", "resource": "ciyu", "ids": [2, 5, 6]})
+    assert matching(index, ["马"]) == [6, 3, 1]
+    assert matching(index, ["羊"]) == [2]
+    assert index.stats()["rebuilds"] == 1
+
+    # 修改范围未知时重建
+    index.handle_write_event({"event": "write", "resource": "ciyu", "id": None, "ids": None})
+    assert matching(index, ["牛"]) == [4, 2]
+    assert index.stats()["rebuilds"] == 2
+    print("✅ 求交集与增量更新正确")
+
+
+def test_check_without_events():
+    """测试收不到写入事件时（如其他 worker 或 SQL 脚本写入），超过核对间隔后索引随数据库更新"""
+    print("\n🔍 测试无写入事件时的核对...")
+    index, Session = make_index(check_seconds=0.05)
+    assert matching(index, ["马"]) == [5, 3, 2, 1]
+
+    with Session() as session:
+        session.add(Ciyu(word="龙马精神"))
+        session.query(Ciyu).filter(Ciyu.id == 2).update({"word": "牛羊"})
+        session.commit()
+    # 核对间隔内仍使用旧索引
+    assert matching(index, ["马"]) == [5, 3, 2, 1]
+    time.sleep(0.1)
+    assert matching(index, ["马"]) == [6, 5, 3, 1]
+    assert matching(index, ["羊"]) == [2]
+    assert index.stats()["rebuilds"] == 1
+
+    # 删除无法由最后修改时间发现，条目数不一致时重建
+    with Session() as session:
+        session.query(Ciyu).filter(Ciyu.id == 5).delete()
+        session.commit()
+    time.sleep(0.1)
+    assert matching(index, ["马"]) == [6, 3, 1]
+    assert index.stats()["rebuilds"] == 2
+
+    # 没有变化时只执行一条聚合查询
+    time.sleep(0.1)
+    matching(index, ["马"])
+    assert index.stats()["rebuilds"] == 2
+    print("✅ 超过核对间隔后索引已更新")
+
+
+def test_page_with_visibility():
+    """测试权限过滤后仍然取满一页"""
+    index, Session = make_index()
+    with Session() as session:
+        query = session.query(Ciyu).with_entities(Ciyu.id, Ciyu.word).filter(Ciyu.created_by == None)
+        rows, next_cursor = fetch_candidates_page(query, "ciyu", iter_matches(index.postings("ciyu", ["马"])), 2)
+        assert [row.id for row in rows] == [5, 3]
+        rows, next_cursor = fetch_candidates_page(
+            query, "ciyu", iter_matches(index.postings("ciyu", ["马"]), decode_cursor(next_cursor)), 2
+        )
+        assert [row.id for row in rows] == [1] and next_cursor is None
+
+    assert parse_query_characters("马 牛,马a") == ["马", "牛"]
+    try:
+        parse_query_characters("abc")
+        assert False, "应当抛出 ValueError"
+    except ValueError as e:
+        print(f"✅ 拒绝无效参数: {e}")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试汉字倒排索引...")
+    test_intersection_and_updates()
+    test_check_without_events()
+    test_page_with_visibility()
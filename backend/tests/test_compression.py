@@ -0,0 +1,89 @@
+"""
+测试响应压缩中间件
+"""
+import sys
+import os
+import gzip
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+PAYLOAD = ("一心一意：形容做事专心，意志专一。" * 200).encode("utf-8")
+
+
+def create_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big():
+        return Response(content=PAYLOAD, media_type="application/json", headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return Response(content=b'{"id": 1}', media_type="application/json")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((PAYLOAD for _ in range(3)), media_type="application/x-ndjson")
+
+    @app.get("/image")
+    def image():
+        return Response(content=b"\x89PNG" * 500, media_type="image/png")
+
+    return app
+
+
+def test_choose_encoding():
+    """测试 Accept-Encoding 协商"""
+    assert choose_encoding("") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*;q=0.5") in ("br", "gzip")
+
+
+def test_compress_responses():
+    """测试压缩阈值、内容类型和 ETag 处理"""
+    print("🔍 测试响应压缩...")
+    client = TestClient(create_app())
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = client.get("/big", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == PAYLOAD
+    assert int(response.headers["content-length"]) < len(PAYLOAD) // 5
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    print(f"✅ 压缩 {len(PAYLOAD)} -> {response.headers['content-length']} 字节")
+
+    response = client.get("/small", headers=headers)
+    assert "content-encoding" not in response.headers
+    response = client.get("/image", headers=headers)
+    assert "content-encoding" not in response.headers
+    response = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers and response.headers["etag"] == '"abc"'
+    print("✅ 小响应、二进制内容和不支持压缩的客户端原样返回")
+
+
+def test_compress_stream():
+    """测试流式响应逐块压缩"""
+    client = TestClient(create_app())
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == PAYLOAD * 3
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试响应压缩...")
+    test_choose_encoding()
+    test_compress_responses()
+    test_compress_stream()
@@ -0,0 +1,77 @@
+"""
+测试流式导出
+"""
+import sys
+import os
+import csv
+import io
+import json
+
+import pytest
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Ciyu
+from app.services.export import check_format, stream_export
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Ciyu.__table__])
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add_all([
+            Ciyu(word=f"词语{i}", synonyms=[f"近义{i}"], created_by="teacher1" if i % 2 else None)
+            for i in range(25)
+        ])
+        session.commit()
+    return factory
+
+
+def export(session_factory, fmt, only_public=False):
+    def build_query(db):
+        query = db.query(Ciyu)
+        return query.filter(Ciyu.created_by.is_(None)) if only_public else query
+
+    return list(stream_export(session_factory, build_query, "ciyu", fmt, batch_size=10))
+
+
+def test_export_ndjson(session_factory):
+    """测试 NDJSON 分批输出与查询过滤"""
+    chunks = export(session_factory, "ndjson")
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [row["id"] for row in rows] == list(range(1, 26))
+    assert rows[0]["synonyms"] == ["近义0"] and "pinyin_plain" not in rows[0]
+    assert "is_public" not in rows[0]
+
+    rows = b"".join(export(session_factory, "ndjson", only_public=True)).splitlines()
+    assert len(rows) == 13
+    print(f"✅ 分 {len(chunks)} 批输出，过滤条件生效")
+
+
+def test_export_csv(session_factory):
+    """测试 CSV 表头、BOM 与 JSON 列"""
+    text = b"".join(export(session_factory, "csv")).decode("utf-8")
+    assert text.startswith("\ufeffid,word,")
+    rows = list(csv.DictReader(io.StringIO(text.lstrip("\ufeff"))))
+    assert len(rows) == 25 and json.loads(rows[1]["synonyms"]) == ["近义1"]
+
+
+def test_export_parquet(session_factory):
+    """测试 Parquet 按批写入行组"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    parquet = pq.ParquetFile(io.BytesIO(b"".join(export(session_factory, "parquet"))))
+    assert parquet.metadata.num_rows == 25 and parquet.metadata.num_row_groups == 3
+    assert parquet.read().column("word")[0].as_py() == "词语0"
+
+
+def test_check_format():
+    with pytest.raises(ValueError):
+        check_format("xml")
@@ -0,0 +1,71 @@
+"""
+测试汉字查询：JSON 信息列按 sections 延迟加载
+"""
+import sys
+import os
+
+import orjson
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Hanzi
+from app.schemas.hanzi import HanziLookupResponse, HanziResponse
+from app.services.hanzi import hanzi_query, lookup_hanzi, parse_lookup, parse_sections
+from app.utils.serialization import encode_json
+
+
+def test_parse_sections():
+    """测试 sections 与查找参数解析"""
+    assert parse_sections(None) == []
+    assert parse_sections("evolution, basic,basic") == ["evolution", "basic"]
+    assert len(parse_sections("all")) == 7
+    assert parse_lookup("你 好,你", "22909") == (["你", "好"], [22909])
+    for call in (lambda: parse_sections("pinyin"), lambda: parse_lookup(None, "abc"), lambda: parse_lookup("", "")):
+        try:
+            call()
+            assert False, "应当抛出 ValueError"
+        except ValueError as e:
+            print(f"✅ 拒绝无效参数: {e}")
+
+
+def test_deferred_sections():
+    """测试只查询请求的 JSON 列，查找结果按请求顺序排列"""
+    print("🔍 测试汉字延迟加载...")
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Hanzi.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add_all([Hanzi(character=char, unicode_decimal=ord(char), basic_info={"char": char},
+                               evolution_data=["甲骨文"]) for char in "你好"])
+        session.commit()
+
+        sql = str(hanzi_query(session, ["basic"]).statement)
+        assert "basic_info" in sql
+        assert "evolution_data" not in sql and "yisi_info" not in sql
+
+        result = lookup_hanzi(session, ["好", "天"], [ord("你"), ord("好")], ["basic"])
+        assert [item["character"] for item in result["items"]] == ["好", "你"]
+        assert result["missing"] == ["天"]
+        assert result["items"][0]["basic_info"] == {"char": "好"}
+        assert "evolution_data" not in result["items"][0]
+        print("✅ 只加载请求的信息列")
+
+        # 接口直接返回 orjson 响应体，摘要投影和全部信息列都需符合文档中声明的响应模型
+        for sections in ([], parse_sections("all")):
+            body = orjson.loads(encode_json(lookup_hanzi(session, ["你"], [], sections)))
+            HanziLookupResponse.model_validate(body)
+            assert set(body["items"][0]) <= set(HanziResponse.model_fields)
+        print("✅ 响应体符合响应模型")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试汉字查询...")
+    test_parse_sections()
+    test_deferred_sections()
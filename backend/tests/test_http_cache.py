@@ -0,0 +1,74 @@
+"""
+测试 HTTP 条件请求（ETag / Last-Modified / 304）
+"""
+import sys
+import os
+from datetime import datetime, timezone
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.requests import Request
+
+from app.utils.http_cache import (
+    DETAIL_CACHE_CONTROL, conditional_response, format_http_date, make_etag, to_timestamp
+)
+
+BODY = b'{"id": 1, "chengyu": "\xe4\xb8\x80\xe5\xbf\x83\xe4\xb8\x80\xe6\x84\x8f"}'
+LAST_MODIFIED = to_timestamp(datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc))
+
+
+def make_request(**headers):
+    """构造带指定请求头的 GET 请求"""
+    raw_headers = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+def test_etag():
+    """测试 If-None-Match 命中返回 304"""
+    print("🔍 测试ETag...")
+
+    response = conditional_response(make_request(), BODY, DETAIL_CACHE_CONTROL, LAST_MODIFIED)
+    etag = response.headers["etag"]
+    assert response.status_code == 200 and response.body == BODY
+    assert etag == make_etag(BODY)
+    assert response.headers["last-modified"] == "Wed, 01 May 2024 08:30:00 GMT"
+    assert response.headers["cache-control"] == DETAIL_CACHE_CONTROL
+
+    response = conditional_response(make_request(if_none_match=etag), BODY, DETAIL_CACHE_CONTROL)
+    assert response.status_code == 304 and response.body == b""
+    assert response.headers["etag"] == etag
+    print("✅ 内容未变时返回 304")
+
+    response = conditional_response(make_request(if_none_match=f'"other", W/{etag}'), BODY, DETAIL_CACHE_CONTROL)
+    assert response.status_code == 304
+    response = conditional_response(make_request(if_none_match='"other"'), BODY, DETAIL_CACHE_CONTROL)
+    assert response.status_code == 200
+    print("✅ 多个 ETag 与弱 ETag 按弱比较处理")
+
+
+def test_last_modified():
+    """测试 If-Modified-Since，以及 ETag 优先于修改时间"""
+    print("\n🔍 测试Last-Modified...")
+
+    same = format_http_date(LAST_MODIFIED)
+    earlier = format_http_date(LAST_MODIFIED - 60)
+    response = conditional_response(make_request(if_modified_since=same), BODY, DETAIL_CACHE_CONTROL, LAST_MODIFIED)
+    assert response.status_code == 304
+    response = conditional_response(make_request(if_modified_since=earlier), BODY, DETAIL_CACHE_CONTROL, LAST_MODIFIED)
+    assert response.status_code == 200
+    response = conditional_response(make_request(if_modified_since="not a date"), BODY, DETAIL_CACHE_CONTROL, LAST_MODIFIED)
+    assert response.status_code == 200
+    print("✅ 按修改时间判断")
+
+    response = conditional_response(
+        make_request(if_none_match='"other"', if_modified_since=same), BODY, DETAIL_CACHE_CONTROL, LAST_MODIFIED
+    )
+    assert response.status_code == 200
+    print("✅ 同时携带时只按 ETag 判断")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试HTTP条件请求...")
+    test_etag()
+    test_last_modified()
@@ -0,0 +1,200 @@
+"""
+测试数据库迁移：空库和已有表结构的库都能升级到最新版本且与模型一致，
+升级过程中的数据修正（重复边、is_public 回填），以及启动不执行 SQL、就绪检查核对迁移版本
+"""
+import sys
+import os
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core import health
+from app.core.database import Base, engine as app_engine
+from app.main import app
+from app.models import Chengyu
+from app.services.visibility import apply_visibility
+import app.models as models  # noqa: F401  注册全部模型
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def alembic_config(url: str) -> Config:
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def upgrade(url: str, revision: str = "head") -> None:
+    command.upgrade(alembic_config(url), revision)
+
+
+def current_revision(engine) -> str:
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def schema_diff(engine) -> list:
+    with engine.connect() as connection:
+        return compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+
+def test_upgrade_fresh_database():
+    """测试空库升级到最新版本后与模型一致，重复执行不做任何修改，降级后可再次升级"""
+    print("🔍 测试空库迁移...")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'fresh.sqlite')}"
+        upgrade(url)
+        engine = create_engine(url)
+        assert current_revision(engine) == health.head_revision()
+        assert schema_diff(engine) == []
+
+        upgrade(url)
+        assert current_revision(engine) == health.head_revision()
+        assert schema_diff(engine) == []
+
+        command.downgrade(alembic_config(url), "0001")
+        assert "created_by" not in {column["name"] for column in inspect(engine).get_columns("hanyuguoxue_ciyu")}
+        upgrade(url)
+        assert schema_diff(engine) == []
+        engine.dispose()
+    print("✅ 空库迁移正确")
+
+
+def test_upgrade_existing_database():
+    """测试旧版本在启动时已建好表和字段的库（没有 alembic_version）也能直接升级"""
+    print("🔍 测试已有表结构的库迁移...")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'existing.sqlite')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        upgrade(url)
+        assert current_revision(engine) == health.head_revision()
+        assert schema_diff(engine) == []
+        engine.dispose()
+    print("✅ 已有表结构的库迁移正确")
+
+
+def test_data_migrations():
+    """测试添加唯一约束前删除重复的边，新增 is_public 时按创建者回填且不修改 updated_at"""
+    print("🔍 测试迁移中的数据修正...")
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'data.sqlite')}"
+        upgrade(url, "0004")
+        engine = create_engine(url)
+        # created_by 单列索引会被 0006 的复合索引取代，中间版本不创建
+        indexes = {index["name"] for index in inspect(engine).get_indexes("hanyuguoxue_chengyu")}
+        assert "ix_hanyuguoxue_chengyu_created_by" not in indexes
+        updated_at = datetime(2024, 1, 1)
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO users_knma (username, hashed_password, role) VALUES ('root', '-', 'admin')"
+            ))
+            for i, owner in enumerate((None, "system", "root", "teacher1")):
+                connection.execute(
+                    text("INSERT INTO hanyuguoxue_chengyu (chengyu, created_by, updated_at) VALUES (:c, :o, :u)"),
+                    {"c": f"成语{i}", "o": owner, "u": updated_at},
+                )
+            for min_id, max_id in ((1, 2), (1, 2), (1, 2), (2, 3)):
+                connection.execute(
+                    text("INSERT INTO chengyu_relation (min_id, max_id, relation_type) VALUES (:a, :b, 'SYNONYM')"),
+                    {"a": min_id, "b": max_id},
+                )
+
+        upgrade(url)
+        with engine.connect() as connection:
+            edges = connection.execute(text("SELECT id, min_id, max_id FROM chengyu_relation ORDER BY id")).all()
+            assert [tuple(edge) for edge in edges] == [(1, 1, 2), (4, 2, 3)]
+            rows = connection.execute(text(
+                "SELECT created_by, is_public, updated_at FROM hanyuguoxue_chengyu ORDER BY id"
+            )).all()
+            assert [(owner, bool(public)) for owner, public, _ in rows] == [
+                (None, True), ("system", True), ("root", True), ("teacher1", False)
+            ]
+            assert {str(row.updated_at) for row in rows} == {str(updated_at)}
+
+        indexes = {index["name"] for index in inspect(engine).get_indexes("hanyuguoxue_chengyu")}
+        assert {"ix_hanyuguoxue_chengyu_public_id", "ix_hanyuguoxue_chengyu_owner_id"} <= indexes
+        assert "ix_hanyuguoxue_chengyu_created_by" not in indexes
+
+        # 迁移之后绕过接口写入（爬虫、SQL 脚本）的系统条目使用 is_public 默认值 0，老师仍可见
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO hanyuguoxue_chengyu (chengyu, created_by) VALUES ('系统成语', 'system'), ('空成语', '')"
+            ))
+        session = sessionmaker(bind=engine)()
+        teacher = SimpleNamespace(username="teacher2", role="teacher")
+        visible = {row.chengyu for row in apply_visibility(session.query(Chengyu.chengyu), Chengyu, teacher)}
+        assert {"系统成语", "空成语"} <= visible and "成语3" not in visible
+        session.close()
+        engine.dispose()
+    print("✅ 数据修正正确")
+
+
+def test_startup_without_sql_and_readiness():
+    """测试启动事件不执行任何 SQL；就绪检查在迁移不是最新时返回 503，升级后返回 200"""
+    print("🔍 测试启动和就绪检查...")
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(app_engine, "before_cursor_execute", record)
+    try:
+        with TestClient(app) as client:
+            assert statements == []
+            assert client.get("/health").status_code == 200
+
+            health.reset_readiness()
+            response = client.get("/health/ready")
+            assert response.status_code == 503
+            assert response.json()["database"] is True and response.json()["revision"] is None
+    finally:
+        event.remove(app_engine, "before_cursor_execute", record)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'ready.sqlite')}"
+        upgrade(url)
+        migrated = create_engine(url)
+        health.engine, original = migrated, health.engine
+        try:
+            health.reset_readiness()
+            with TestClient(app) as client:
+                response = client.get("/health/ready")
+                assert response.status_code == 200
+                assert response.json()["revision"] == response.json()["head"]
+                # 用户表为空时仍就绪，但提示需创建用户
+                assert response.json()["users"] == 0 and "create_users" in response.json()["warning"]
+
+                with migrated.begin() as connection:
+                    connection.execute(text(
+                        "INSERT INTO users_knma (username, hashed_password, role) VALUES ('admin', '-', 'admin')"
+                    ))
+                health.reset_readiness()
+                response = client.get("/health/ready")
+                assert response.json()["users"] == 1 and "warning" not in response.json()
+        finally:
+            health.engine = original
+            health.reset_readiness()
+            migrated.dispose()
+    print("✅ 启动和就绪检查正确")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试数据库迁移...")
+    test_upgrade_fresh_database()
+    test_upgrade_existing_database()
+    test_data_migrations()
+    test_startup_without_sql_and_readiness()
+    print("🎉 所有测试通过!")
@@ -0,0 +1,74 @@
+"""
+测试分页工具（偏移分页与游标分页）
+使用内存SQLite数据库，不依赖MySQL
+"""
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Chengyu
+from app.utils.pagination import encode_cursor, decode_cursor, resolve_after_id, paginate_keyset
+
+
+def test_cursor_roundtrip():
+    """测试游标编码与解码"""
+    print("🔍 测试游标编码...")
+
+    cursor = encode_cursor(12345)
+    assert decode_cursor(cursor) == 12345
+    assert resolve_after_id(cursor, None) == 12345
+    assert resolve_after_id(None, 7) == 7
+    assert resolve_after_id(None, None) is None
+    print(f"✅ 游标: {cursor}")
+
+    for bad in ["not-a-cursor", encode_cursor(1)[:-2] + "!!", "eyJpZCI6ICJ4In0"]:
+        try:
+            decode_cursor(bad)
+            assert False, f"应该解析失败: {bad}"
+        except ValueError as e:
+            print(f"✅ 无效游标被拒绝: {bad} ({e})")
+
+
+def test_keyset_pages_match_offset_pages():
+    """测试游标分页与偏移分页返回相同的数据"""
+    print("\n🔍 测试游标分页...")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Chengyu.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add_all([Chengyu(chengyu=f"成语{i:02d}") for i in range(1, 26)])
+        session.commit()
+
+        size = 10
+        query = session.query(Chengyu)
+        offset_ids = [c.id for c in query.order_by(Chengyu.id.desc()).all()]
+
+        keyset_ids = []
+        after_id = None
+        pages = 0
+        while True:
+            rows, next_cursor = paginate_keyset(query, Chengyu.id, size, after_id)
+            keyset_ids.extend(row.id for row in rows)
+            pages += 1
+            if next_cursor is None:
+                break
+            after_id = decode_cursor(next_cursor)
+
+        assert keyset_ids == offset_ids
+        assert pages == 3
+        print(f"✅ {pages} 页游标分页结果与偏移分页一致")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试分页工具...")
+    test_cursor_roundtrip()
+    test_keyset_pages_match_offset_pages()
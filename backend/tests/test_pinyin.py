@@ -0,0 +1,73 @@
+"""
+测试拼音规范化与拼音检索
+"""
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Chengyu
+from app.services.pinyin_index import backfill_pinyin_index
+from app.services.search import apply_pinyin_filter
+from app.utils.pinyin import normalize_pinyin, pinyin_initials, pinyin_index_values
+
+
+def test_normalize_pinyin():
+    """测试去声调、紧凑化和首字母"""
+    print("🔍 测试拼音规范化...")
+
+    assert normalize_pinyin("yī mǎ dāng xiān") == "yimadangxian"
+    assert normalize_pinyin("Yi Ma dang-xian") == "yimadangxian"
+    assert normalize_pinyin("nü3 er2") == "nver"
+    assert pinyin_initials("yī mǎ dāng xiān") == "ymdx"
+    assert pinyin_index_values(None) == {"pinyin_plain": None, "pinyin_initials": None}
+    print("✅ 拼音规范化正确")
+
+
+def test_pinyin_search_and_backfill():
+    """测试模型自动维护拼音索引列、批量回填和前缀检索"""
+    print("\n🔍 测试拼音检索...")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Chengyu.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add_all([
+            Chengyu(chengyu="一马当先", pinyin="yī mǎ dāng xiān"),
+            Chengyu(chengyu="一鸣惊人", pinyin="yī míng jīng rén"),
+            Chengyu(chengyu="马到成功", pinyin="mǎ dào chéng gōng"),
+        ])
+        session.commit()
+        first = session.query(Chengyu).filter(Chengyu.chengyu == "一马当先").one()
+        assert (first.pinyin_plain, first.pinyin_initials) == ("yimadangxian", "ymdx")
+        print("✅ 创建时自动写入拼音索引列")
+
+        def matches(term):
+            query = apply_pinyin_filter(session.query(Chengyu), "chengyu", term)
+            return sorted(item.chengyu for item in query.all())
+
+        assert matches("yi ma dang xian") == ["一马当先"]
+        assert matches("yimadang") == ["一马当先"]
+        assert matches("ym") == ["一马当先", "一鸣惊人"]
+        assert matches("mǎ dào") == ["马到成功"]
+        print("✅ 拼音/首字母前缀检索正确")
+
+        session.execute(Chengyu.__table__.update().values(pinyin_plain=None, pinyin_initials=None))
+        session.commit()
+        assert backfill_pinyin_index(session, Chengyu, batch_size=2) == 3
+        assert backfill_pinyin_index(session, Chengyu, batch_size=2) == 0
+        assert matches("mdcg") == ["马到成功"]
+        print("✅ 批量回填后可以检索")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试拼音检索...")
+    test_normalize_pinyin()
+    test_pinyin_search_and_backfill()
@@ -0,0 +1,99 @@
+"""
+测试列表字段投影（view / fields）
+"""
+import sys
+import os
+
+import orjson
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Chengyu, Ciyu
+from app.schemas.chengyu import ChengyuResponse
+from app.schemas.ciyu import CiyuResponse
+from app.services.projection import (
+    PROJECTIONS, SUMMARY_TEXT_LENGTH, model_to_item, project_columns, resolve_fields, row_to_item
+)
+from app.utils.serialization import encode_json
+
+
+def test_resolve_fields():
+    """测试视图默认字段与 fields 参数校验"""
+    print("🔍 测试字段解析...")
+
+    assert "synonyms" in resolve_fields("ciyu")
+    assert "synonyms" not in resolve_fields("ciyu", "summary")
+    assert resolve_fields("ciyu", fields="word, synonyms,word") == ["id", "word", "synonyms"]
+    for view, fields in (("tiny", None), ("full", "word,error")):
+        try:
+            resolve_fields("ciyu", view, fields)
+            assert False, "应当抛出 ValueError"
+        except ValueError as e:
+            print(f"✅ 拒绝无效参数: {e}")
+
+
+def test_project_rows():
+    """测试只查询所需列，摘要视图截断长文本"""
+    print("\n🔍 测试列投影...")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Ciyu.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add(Ciyu(word="学习", definition="学" * (SUMMARY_TEXT_LENGTH + 20), synonyms=["学", "习"]))
+        session.add(Ciyu(word="短", definition="短释义"))
+        session.commit()
+
+        fields = resolve_fields("ciyu", "summary")
+        columns = project_columns("ciyu", fields, truncate=True)
+        query = session.query(Ciyu).with_entities(*columns).order_by(Ciyu.id)
+        assert "synonyms" not in str(query.statement)
+
+        items = [row_to_item("ciyu", row, fields, truncate=True) for row in query.all()]
+        assert list(items[0]) == fields
+        assert items[0]["definition"] == "学" * SUMMARY_TEXT_LENGTH + "…"
+        assert items[1]["definition"] == "短释义"
+        print("✅ 长文本截断，短文本保持原样")
+
+        fields = resolve_fields("ciyu", fields="word,synonyms")
+        row = session.query(Ciyu).with_entities(*project_columns("ciyu", fields)).order_by(Ciyu.id).first()
+        assert row_to_item("ciyu", row, fields) == {"id": 1, "word": "学习", "synonyms": ["学", "习"]}
+        print("✅ JSON 列按原类型返回")
+    finally:
+        session.close()
+
+
+def test_full_items_match_response_schema():
+    """测试详情和写接口直接返回的 orjson 响应体与 OpenAPI 中声明的响应模型一致"""
+    print("\n🔍 测试响应体与响应模型一致...")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Chengyu.__table__, Ciyu.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add(Chengyu(chengyu="一心一意", pinyin="yī xīn yī yì", synonyms=["全心全意"], created_by="teacher1"))
+        session.add(Ciyu(word="学习", is_common=True, antonyms=["荒废"]))
+        session.commit()
+
+        for resource, model, schema in (("chengyu", Chengyu, ChengyuResponse), ("ciyu", Ciyu, CiyuResponse)):
+            assert set(PROJECTIONS[resource][1]) == set(schema.model_fields), resource
+            fields = resolve_fields(resource)
+            row = session.query(model).with_entities(*project_columns(resource, fields)).first()
+            for item in (row_to_item(resource, row, fields), model_to_item(resource, session.query(model).first())):
+                body = orjson.loads(encode_json(item))
+                assert schema.model_validate(body).model_dump(mode="json") == body
+        print("✅ 响应体字段与响应模型一致")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试字段投影...")
+    test_resolve_fields()
+    test_project_rows()
+    test_full_items_match_response_schema()
@@ -0,0 +1,97 @@
+"""
+测试读写分离路由
+用两个SQLite文件分别模拟主库和只读副本
+"""
+import sys
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, ReadWriteRouter
+from app.models import Chengyu
+
+
+def test_read_your_writes():
+    """测试读请求默认走副本，写入后短时间内改走主库"""
+    print("🔍 测试读写分离路由...")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        factories = {}
+        for name in ("primary", "replica"):
+            engine = create_engine(f"sqlite:///{os.path.join(tmpdir, name + '.db')}")
+            Base.metadata.create_all(engine, tables=[Chengyu.__table__])
+            factories[name] = sessionmaker(bind=engine)
+
+        router = ReadWriteRouter(factories["primary"], factories["replica"], window_seconds=0.2)
+
+        # 模拟尚未复制到副本的写入
+        primary = factories["primary"]()
+        primary.add(Chengyu(chengyu="一马当先", created_by="teacher1"))
+        primary.commit()
+        primary.close()
+        router.mark_write("teacher1")
+
+        def visible_count(username):
+            session = router.read_session(username)
+            try:
+                return session.query(Chengyu).count()
+            finally:
+                session.close()
+
+        assert visible_count("teacher1") == 1
+        print("✅ 写入者立即读到自己的数据（主库）")
+
+        assert visible_count("teacher2") == 0
+        assert visible_count(None) == 0
+        print("✅ 其他用户和匿名请求读副本")
+
+        time.sleep(0.25)
+        assert not router.recently_wrote("teacher1")
+        assert visible_count("teacher1") == 0
+        print("✅ 复制延迟窗口过后写入者也回到副本")
+
+
+def test_without_replica():
+    """测试未配置副本时始终使用主库"""
+    print("\n🔍 测试未配置只读副本...")
+
+    engine = create_engine("sqlite://")
+    factory = sessionmaker(bind=engine)
+    router = ReadWriteRouter(factory, factory, window_seconds=5)
+    session = router.read_session("teacher1")
+    assert session.get_bind() is engine
+    session.close()
+    print("✅ 未配置副本时读请求走主库")
+
+
+def test_record_write_survives_cache_failure():
+    """测试写入已提交后缓存发布失败不向接口抛出，该用户的读请求仍改走主库"""
+    print("\n🔍 测试写入后缓存发布失败...")
+    from app.core.cache import cache_backend
+    from app.main import read_router, record_write
+
+    def broken_publish(message):
+        raise ConnectionError("redis unavailable")
+
+    original = cache_backend.publish
+    cache_backend.publish = broken_publish
+    try:
+        record_write("chengyu", SimpleNamespace(username="teacher9"), 1)
+    finally:
+        cache_backend.publish = original
+    assert read_router.recently_wrote("teacher9")
+    print("✅ 发布失败只记录日志")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试读写分离...")
+    test_read_your_writes()
+    test_without_replica()
+    test_record_write_survives_cache_failure()
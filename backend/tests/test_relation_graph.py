@@ -0,0 +1,73 @@
+"""
+测试成语/词语关系图：CSR 邻接、多跳扩展与增量刷新
+"""
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.relation import CiyuRelation, RelationType
+from app.services.relation_graph import RelationGraph
+
+SYNONYM, ANTONYM = RelationType.SYNONYM, RelationType.ANTONYM
+
+
+def make_graph():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[CiyuRelation.__table__])
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        session.add_all([CiyuRelation(min_id=a, max_id=b, relation_type=t) for a, b, t in (
+            (1, 2, SYNONYM), (2, 3, SYNONYM), (3, 4, SYNONYM), (1, 3, SYNONYM), (1, 5, ANTONYM), (2, 1, SYNONYM),
+        )])
+        session.commit()
+    return RelationGraph(Session), Session
+
+
+def test_neighbours_and_expand():
+    """测试邻居按类型分组、重复边去重，以及按跳数扩展"""
+    print("🔍 测试关系图...")
+    graph, _ = make_graph()
+    assert graph.neighbours("ciyu", 1) == {"synonym": [2, 3], "antonym": [5]}
+    assert graph.neighbours("ciyu", 99) == {"synonym": [], "antonym": []}
+    assert graph.expand("ciyu", 1, hops=1) == [(2, 1), (3, 1)]
+    assert graph.expand("ciyu", 1, hops=3) == [(2, 1), (3, 1), (4, 2)]
+    assert graph.expand("ciyu", 4, hops=3, limit=2) == [(3, 1), (1, 2)]
+    for relation_type, hops in (("similar", 1), ("synonym", 4)):
+        try:
+            graph.expand("ciyu", 1, relation_type, hops)
+            assert False, "应当抛出 ValueError"
+        except ValueError as e:
+            print(f"✅ 拒绝无效参数: {e}")
+
+
+def test_incremental_refresh():
+    """测试关系变化后只刷新相关条目，包括被删除边的另一端"""
+    graph, Session = make_graph()
+    graph.neighbours("ciyu", 1)
+    with Session() as session:
+        session.query(CiyuRelation).filter(CiyuRelation.min_id == 3, CiyuRelation.max_id == 4).delete()
+        session.add(CiyuRelation(min_id=2, max_id=6, relation_type=SYNONYM))
+        session.commit()
+
+    graph.handle_relation_event({"event": "relations", "resource": "ciyu", "ids": [3, 2]})
+    assert graph.neighbours("ciyu", 4)["synonym"] == []
+    assert graph.neighbours("ciyu", 6)["synonym"] == [2]
+    assert graph.neighbours("ciyu", 2)["synonym"] == [1, 3, 6]
+    assert graph.stats()["rebuilds"] == 1
+
+    graph.handle_relation_event({"event": "relations", "resource": "ciyu", "ids": None})
+    assert graph.expand("ciyu", 6, hops=2) == [(2, 1), (1, 2), (3, 2)]
+    assert graph.stats()["rebuilds"] == 2
+    print("✅ 增量刷新正确")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试关系图...")
+    test_neighbours_and_expand()
+    test_incremental_refresh()
@@ -0,0 +1,90 @@
+"""
+测试关系表同步：词条解析、增删边、断点续跑与增量模式
+"""
+import sys
+import os
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import Ciyu, CiyuRelation, SyncState
+from app.services.relation_sync import SyncInProgressError, state_name, sync_relations
+
+
+def make_sessions():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Ciyu.__table__, CiyuRelation.__table__, SyncState.__table__])
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        session.add_all([
+            Ciyu(word="高兴", synonyms=["快乐", "开心", "不存在"], antonyms=["难过"]),
+            Ciyu(word="快乐", synonyms=["高兴"]),
+            Ciyu(word="开心"),
+            Ciyu(word="难过", antonyms=["开心"]),
+        ])
+        session.commit()
+    return Session
+
+
+def edges(Session):
+    with Session() as session:
+        return sorted(
+            (row.min_id, row.max_id, row.relation_type.value) for row in session.query(CiyuRelation)
+        )
+
+
+def test_full_and_incremental_sync():
+    """测试 full 同步建边、重复列出只建一条边，以及增量同步删边"""
+    print("🔍 测试关系同步...")
+    Session = make_sessions()
+    events = []
+    report = sync_relations(Session, "ciyu", "full", batch_size=2, publish=events.append)
+    assert edges(Session) == [(1, 2, "synonym"), (1, 3, "synonym"), (1, 4, "antonym"), (3, 4, "antonym")]
+    assert (report["processed"], report["inserted"], report["unresolved"]) == (4, 4, 1)
+    assert events and all(event["event"] == "relations" for event in events)
+
+    # 高兴不再列出快乐，但快乐仍列出高兴，边保留；不再列出开心，边删除
+    # SQLite 中 server_default 的时间与参数绑定的时间格式不同，这里统一写入 Python 时间
+    with Session() as session:
+        session.query(Ciyu).update({"updated_at": datetime(2024, 1, 1)})
+        session.query(Ciyu).filter(Ciyu.id == 1).update({"synonyms": ["快乐"], "updated_at": datetime(2024, 3, 1)})
+        session.query(SyncState).update({"synced_at": datetime(2024, 2, 1)})
+        session.commit()
+    report = sync_relations(Session, "ciyu", "incremental")
+    assert report["processed"] == 1 and report["deleted"] == 1
+    assert edges(Session) == [(1, 2, "synonym"), (1, 4, "antonym"), (3, 4, "antonym")]
+    print("✅ 同步结果正确")
+
+
+def test_resume_and_lock():
+    """测试失败后从中断处继续、运行中的任务不能重复启动"""
+    Session = make_sessions()
+    with Session() as session:
+        session.add(SyncState(name=state_name("ciyu"), status="failed", mode="full", last_id=2,
+                              stats={"processed": 2, "inserted": 0, "deleted": 0, "unresolved": 0, "pruned": 0}))
+        session.commit()
+    report = sync_relations(Session, "ciyu", "incremental")
+    assert report["mode"] == "full" and report["processed"] == 4
+    # 只处理了 ID 3、4，难过与开心的反义关系
+    assert edges(Session) == [(3, 4, "antonym")]
+
+    with Session() as session:
+        session.query(SyncState).update({"status": "running"})
+        session.commit()
+    try:
+        sync_relations(Session, "ciyu", "full")
+        assert False, "应当抛出 SyncInProgressError"
+    except SyncInProgressError as e:
+        print(f"✅ {e}")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试关系同步...")
+    test_full_and_incremental_sync()
+    test_resume_and_lock()
@@ -0,0 +1,92 @@
+"""
+测试检索服务
+MySQL 全文检索只验证生成的SQL，排序逻辑在内存SQLite上验证
+"""
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Chengyu, Hanzi
+from app.services.search import (
+    clean_search_term, fulltext_match, search_entries, search_hanzi, parse_search_types, use_fulltext
+)
+
+
+def test_fulltext_sql():
+    """测试 MATCH ... AGAINST 覆盖全文索引的全部列"""
+    print("🔍 测试全文检索SQL...")
+
+    assert clean_search_term(' 一马+当先 "*" ') == "一马 当先"
+    statement = select(Chengyu.id).where(fulltext_match("chengyu", "马当"))
+    sql = str(statement.compile(dialect=mysql.dialect()))
+    assert "MATCH (hanyuguoxue_chengyu.chengyu, hanyuguoxue_chengyu.pinyin, " \
+           "hanyuguoxue_chengyu.explanation, hanyuguoxue_chengyu.example)" in sql
+    assert "IN BOOLEAN MODE" in sql
+
+    # 只有含汉字的检索词走全文索引，拼音和首字母在 MySQL 上同样匹配规范化拼音列
+    assert use_fulltext("mysql", "马当") and not use_fulltext("mysql", "马")
+    assert not use_fulltext("mysql", "yimadang") and not use_fulltext("mysql", "ymdx")
+    assert not use_fulltext("sqlite", "马当")
+    print(f"✅ {sql.splitlines()[-1].strip()}")
+
+
+def test_search_ranking_fallback():
+    """测试非MySQL数据库下的检索与排序"""
+    print("\n🔍 测试检索排序...")
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Chengyu.__table__, Hanzi.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        session.add_all([
+            Chengyu(chengyu="马到成功", explanation="战马一到就取得胜利"),
+            Chengyu(chengyu="一马当先", explanation="作战时策马冲在最前面"),
+            Chengyu(chengyu="指鹿为马", explanation="比喻故意颠倒黑白"),
+            Chengyu(chengyu="马", explanation="测试完全匹配"),
+            Chengyu(chengyu="一心一意", pinyin="yī xīn yī yì", explanation="专心"),
+            Hanzi(character="马", unicode_decimal=ord("马")),
+        ])
+        session.commit()
+
+        results = search_entries(session.query(Chengyu), "chengyu", "马", limit=10)
+        headwords = [item["headword"] for item in results]
+        assert headwords[0] == "马"
+        assert headwords[1] == "马到成功"
+        assert set(headwords) == {"马", "马到成功", "一马当先", "指鹿为马"}
+        print(f"✅ 排序: {headwords}")
+
+        results = search_entries(session.query(Chengyu), "chengyu", "最前面")
+        assert [item["headword"] for item in results] == ["一马当先"]
+        print("✅ 可以匹配释义内容")
+
+        # 回退路径同样匹配规范化拼音列：无声调拼音和首字母
+        for term in ("yixin", "xin yi", "yxyy"):
+            results = search_entries(session.query(Chengyu), "chengyu", term)
+            assert [item["headword"] for item in results] == ["一心一意"], term
+        print("✅ 可以匹配无声调拼音和首字母")
+
+        hanzi = search_hanzi(session, "马马虎")
+        assert [item["character"] for item in hanzi] == ["马"]
+        print(f"✅ 汉字检索: {hanzi}")
+
+        assert parse_search_types("ciyu, hanzi") == ["ciyu", "hanzi"]
+        try:
+            parse_search_types("video")
+            assert False, "应该拒绝未知类型"
+        except ValueError as e:
+            print(f"✅ {e}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试检索服务...")
+    test_fulltext_sql()
+    test_search_ranking_fallback()
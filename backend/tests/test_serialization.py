@@ -0,0 +1,34 @@
+"""
+测试 orjson 序列化与默认 JSONResponse 结果一致
+"""
+import sys
+import os
+import json
+from datetime import datetime, timezone
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.utils.serialization import ORJSONResponse, encode_json
+
+
+def test_encode_json():
+    """测试中文、时间和 JSON 列的编码"""
+    data = {
+        "chengyu": "画蛇添足",
+        "synonyms": ["多此一举"],
+        "created_at": datetime(2024, 5, 1, 8, 30, 15, 123456),
+        "updated_at": datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc),
+        "is_common": None,
+    }
+    body = encode_json(data)
+    assert "画蛇添足".encode("utf-8") in body
+    assert json.loads(body) == jsonable_encoder(data)
+    assert ORJSONResponse(data).body == body
+    print(f"✅ 编码结果与 jsonable_encoder 一致: {body.decode('utf-8')}")
+
+
+if __name__ == "__main__":
+    test_encode_json()
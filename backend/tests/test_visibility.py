@@ -0,0 +1,104 @@
+"""
+测试老师可见范围：is_public 回填、过滤结果，以及 EXPLAIN 查询计划中的索引使用
+"""
+import sys
+import os
+from types import SimpleNamespace
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Chengyu, Ciyu, User
+from app.services.users import create_users
+from app.services.visibility import apply_visibility, backfill_public_flags, is_public_owner
+
+TEACHER = SimpleNamespace(username="teacher1", role="teacher")
+ADMIN = SimpleNamespace(username="admin", role="admin")
+
+
+def make_session(owners):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Chengyu.__table__, Ciyu.__table__, User.__table__])
+    session = sessionmaker(bind=engine)()
+    session.add(User(username="root", hashed_password="-", role="admin"))
+    session.execute(Chengyu.__table__.insert(), [
+        {"chengyu": f"成语{i}", "created_by": owner, "is_public": False} for i, owner in enumerate(owners)
+    ])
+    session.commit()
+    return session
+
+
+def plan(session, query) -> str:
+    statement = query.statement.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_backfill_and_filter():
+    """测试按创建者回填 is_public，老师只看到公共条目和自己的"""
+    print("🔍 测试可见范围...")
+    owners = (None, "", "system", "admin", "root", "teacher1", "teacher2", "teacher3")
+    session = make_session(owners * 10)
+    # 未回填（如爬虫直接写入）时创建者为空或为 PUBLIC_OWNERS 的条目仍然可见，管理员账号的条目需回填
+    assert apply_visibility(session.query(Chengyu), Chengyu, TEACHER).count() == 50
+    assert backfill_public_flags(session, Chengyu) == 50
+    assert backfill_public_flags(session, Chengyu) == 0
+
+    visible = apply_visibility(session.query(Chengyu.created_by), Chengyu, TEACHER).all()
+    assert len(visible) == 60
+    assert {owner for owner, in visible} == {None, "", "system", "admin", "root", "teacher1"}
+    assert apply_visibility(session.query(Chengyu), Chengyu, ADMIN).count() == 80
+
+    assert is_public_owner("admin2", is_admin=True) and is_public_owner(None, is_admin=False)
+    assert not is_public_owner("teacher1", is_admin=False)
+    print("✅ 可见范围正确")
+
+
+def test_new_admin_entries_become_public():
+    """测试新建管理员后，该用户名此前创建的条目变为公共的"""
+    print("🔍 测试新建管理员...")
+    session = make_session(["admin2", "admin2", "teacher1"])
+    backfill_public_flags(session, Chengyu)
+    assert apply_visibility(session.query(Chengyu), Chengyu, TEACHER).count() == 1
+
+    create_users(session, [{"username": "admin2", "password": "secret", "role": "admin"}])
+    assert apply_visibility(session.query(Chengyu), Chengyu, TEACHER).count() == 3
+    print("✅ 新建管理员的条目已公开")
+
+
+def test_explain_uses_indexes():
+    """测试计数走两个复合索引，分页的两个分支都能沿 (…, id) 索引有序读取，不需要额外排序"""
+    # 公共条目约占 5%，100 位老师各自的条目约占 1%，索引比全表扫描更有选择性
+    session = make_session([None if i % 20 == 0 else f"teacher{i % 100}" for i in range(20000)])
+    backfill_public_flags(session, Chengyu)
+    # 回填后再收集统计信息，查询优化器才知道 is_public 的分布
+    session.execute(text("ANALYZE"))
+
+    count_plan = plan(session, apply_visibility(session.query(func.count(Chengyu.id)), Chengyu, TEACHER))
+    print(f"计数: {count_plan}")
+    assert "ix_hanyuguoxue_chengyu_public_id" in count_plan
+    assert "ix_hanyuguoxue_chengyu_owner_id" in count_plan
+
+    for condition, index_name in (
+        (Chengyu.is_public == True, "ix_hanyuguoxue_chengyu_public_id"),
+        (Chengyu.created_by == "teacher1", "ix_hanyuguoxue_chengyu_owner_id"),
+    ):
+        query = session.query(Chengyu.id).filter(condition, Chengyu.id < 1000).order_by(Chengyu.id.desc()).limit(20)
+        branch_plan = plan(session, query)
+        print(f"分页: {branch_plan}")
+        assert index_name in branch_plan and "TEMP B-TREE" not in branch_plan
+
+    page = apply_visibility(session.query(Chengyu.id), Chengyu, TEACHER).order_by(Chengyu.id.desc()).limit(20)
+    assert "TEMP B-TREE" not in plan(session, page)
+    print("✅ 查询计划使用了可见范围索引")
+
+
+if __name__ == "__main__":
+    print("🚀 开始测试可见范围...")
+    test_backfill_and_filter()
+    test_new_admin_entries_become_public()
+    test_explain_uses_indexes()